@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+光标滤波与预测的抖动-滞后对比
+
+    python -m benchmarks.cursor_filters recordings/*.npz --latency 0.06
+    python -m benchmarks.cursor_filters --synthetic --fps 30 --min-cutoff 0.5 --beta 20
+
+对录制中手掌中心（关键点 9）的轨迹逐帧运行各个滤波器。每帧的输出在 采集时间 + latency 时才作用到光标，
+指标都按光标生效的时刻计算:
+    抖动  手静止（停下 0.2 s 以后）时输出偏离参考轨迹的均方根，像素
+    滞后  手移动时输出与参考轨迹最吻合的时间平移，即有效延迟，含 latency，毫秒
+    误差  手移动时输出与参考轨迹的均方根距离，像素
+卡尔曼预测按 latency 外推，滞后一栏与不预测的 One Euro 之差即预测换回的延迟。
+录制没有真值，参考轨迹取原始轨迹的零相位（前后对称）平滑；--synthetic 生成带噪声、帧间隔抖动和丢帧的合成轨迹，
+参考轨迹即真值。
+"""
+
+import argparse
+import os
+import sys
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.defaults import DEFAULT_PROCESS_NOISE
+from recognition.cursor_filter import OneEuroFilter
+from recognition.cursor_predictor import KalmanCursorPredictor
+from recognition.landmark_recorder import load_recording
+
+PALM_CENTER = 9
+SCREEN = np.array([1920.0, 1080.0])
+STILL_SPEED = 0.05
+MOVING_SPEED = 0.3
+# 停下后这段时间内输出仍在收敛，算滞后不算抖动
+SETTLE_TIME = 0.2
+MIN_LAG = -0.1
+MAX_LAG = 0.3
+
+
+def run_raw(points, timestamps):
+    return points.copy()
+
+
+def run_window_ema(points, timestamps, factor: float = 0.3, window: int = 5):
+    """原 GestureProcessor.smooth_coordinates: 5 帧滑动平均再按固定系数 EMA"""
+    result = np.empty_like(points)
+    history = deque([tuple(points[0])] * window, maxlen=window)
+    last = points[0].copy()
+    for index, point in enumerate(points):
+        history.append(tuple(point))
+        average = np.mean(history, axis=0)
+        last = last * (1 - factor) + average * factor
+        result[index] = last
+    return result
+
+
+def run_ema(points, timestamps, alpha: float = 0.7):
+    """原 ImprovedMouseController 的固定系数 EMA"""
+    result = np.empty_like(points)
+    last = points[0].copy()
+    for index, point in enumerate(points):
+        last = last * (1 - alpha) + point * alpha
+        result[index] = last
+    return result
+
+
+def run_weighted(points, timestamps, weights=(0.3, 0.25, 0.2, 0.15, 0.07, 0.03)):
+    """原 MainWindow._apply_advanced_smoothing 的 6 帧加权平均"""
+    result = np.empty_like(points)
+    history = deque(maxlen=len(weights))
+    for index, point in enumerate(points):
+        history.append(point)
+        if len(history) < 3:
+            result[index] = point
+            continue
+        used = np.array(weights[:len(history)])
+        result[index] = (np.array(history) * (used / used.sum())[:, None]).sum(axis=0)
+    return result
+
+
+def run_one_euro(points, timestamps, min_cutoff: float = 0.5, beta: float = 20.0):
+    one_euro = OneEuroFilter(min_cutoff=min_cutoff, beta=beta)
+    return np.array([one_euro.filter(x, y, timestamp) for (x, y), timestamp in zip(points.tolist(), timestamps.tolist())])
+
+
+def run_predicted(points, timestamps, model: str = "velocity", process_noise: float = DEFAULT_PROCESS_NOISE, horizon: float = 0.0,
+                  min_cutoff: float = 0.5, beta: float = 20.0):
+    """One Euro 平滑后再用卡尔曼外推 horizon 秒，与 MainWindow 中的顺序一致"""
+    smoothed = run_one_euro(points, timestamps, min_cutoff, beta)
+    predictor = KalmanCursorPredictor(model=model, process_noise=process_noise)
+    return np.array([predictor.filter(x, y, timestamp, horizon)
+                     for (x, y), timestamp in zip(smoothed.tolist(), timestamps.tolist())])
+
+
+def zero_phase_reference(points, timestamps, window: float = 0.1):
+    """前后各 window 秒的三角窗加权平均，没有相位滞后"""
+    reference = np.empty_like(points)
+    for index, timestamp in enumerate(timestamps):
+        near = np.abs(timestamps - timestamp) <= window
+        weights = 1.0 - np.abs(timestamps[near] - timestamp) / (window * 1.01)
+        reference[index] = (points[near] * weights[:, None]).sum(axis=0) / weights.sum()
+    return reference
+
+
+def speeds(reference, timestamps):
+    return np.linalg.norm(np.gradient(reference, timestamps, axis=0), axis=1)
+
+
+def measure(output, reference, timestamps, latency: float = 0.0) -> dict:
+    """output[i] 在 timestamps[i] + latency 时生效，与参考轨迹在该时刻的位置比较"""
+    speed = speeds(reference, timestamps)
+    last_motion = np.maximum.accumulate(np.where(speed >= STILL_SPEED, timestamps, -np.inf))
+    still = (speed < STILL_SPEED) & (timestamps - last_motion >= SETTLE_TIME)
+    shown = timestamps + latency
+    # 生效时刻手也必须还静止
+    still &= np.interp(shown, timestamps, still.astype(np.float64)) > 0.99
+    moving = speed > MOVING_SPEED
+    current = np.stack([np.interp(shown, timestamps, reference[:, axis]) for axis in (0, 1)], axis=1)
+    pixels = (output - current) * SCREEN
+    jitter = float(np.sqrt((pixels[still] ** 2).sum(axis=1).mean())) if still.any() else float('nan')
+    lag = error = float('nan')
+    if moving.any():
+        error = float(np.sqrt((pixels[moving] ** 2).sum(axis=1).mean()))
+        best = None
+        for shift in np.arange(MIN_LAG, MAX_LAG, 0.002):
+            shifted = np.stack([np.interp(shown[moving] - shift, timestamps, reference[:, axis]) for axis in (0, 1)], axis=1)
+            cost = ((output[moving] - shifted) * SCREEN) ** 2
+            cost = cost.sum(axis=1).mean()
+            if best is None or cost < best[0]:
+                best = (cost, shift)
+        lag = best[1] * 1000
+    return {'jitter_px': jitter, 'lag_ms': lag, 'moving_error_px': error, 'still_frames': int(still.sum()),
+            'moving_frames': int(moving.sum())}
+
+
+def synthetic_session(fps: float = 30.0, duration: float = 30.0, noise: float = 0.002, seed: int = 0):
+    """静止与最小加加速度移动交替的轨迹，帧间隔 ±20% 抖动并随机丢 5% 的帧"""
+    rng = np.random.default_rng(seed)
+    intervals = rng.uniform(0.8, 1.2, int(duration * fps * 1.2)) / fps
+    timestamps = np.cumsum(intervals)
+    timestamps = timestamps[timestamps < duration]
+    timestamps = timestamps[rng.random(len(timestamps)) > 0.05]
+    truth = np.empty((len(timestamps), 2))
+    position = np.array([0.5, 0.5])
+    segment_start = 0.0
+    while segment_start < duration:
+        hold = rng.uniform(0.5, 1.5)
+        move = rng.uniform(0.2, 0.6)
+        target = rng.uniform(0.15, 0.85, 2)
+        holding = (timestamps >= segment_start) & (timestamps < segment_start + hold)
+        truth[holding] = position
+        moving = (timestamps >= segment_start + hold) & (timestamps < segment_start + hold + move)
+        phase = (timestamps[moving] - segment_start - hold) / move
+        blend = 10 * phase ** 3 - 15 * phase ** 4 + 6 * phase ** 5
+        truth[moving] = position + blend[:, None] * (target - position)
+        position = target
+        segment_start += hold + move
+    return truth + rng.normal(0.0, noise, truth.shape), timestamps, truth
+
+
+def recording_tracks(path: str):
+    """录制中连续有手的片段，每段返回 (点, 时间戳)"""
+    recording = load_recording(path)
+    valid = ~np.isnan(recording['landmarks']).any(axis=(1, 2))
+    points = recording['landmarks'][:, PALM_CENTER, :2].astype(np.float64)
+    timestamps = recording['timestamps'].astype(np.float64)
+    breaks = np.flatnonzero(np.diff(valid.astype(np.int8)) != 0) + 1
+    for chunk in np.split(np.arange(len(valid)), breaks):
+        if len(chunk) >= 10 and valid[chunk[0]]:
+            yield points[chunk], timestamps[chunk]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较光标滤波器的抖动与滞后")
+    parser.add_argument("recordings", nargs="*", help="LandmarkRecorder 保存的 .npz 文件")
+    parser.add_argument("--synthetic", action="store_true", help="使用合成轨迹（有真值）")
+    parser.add_argument("--fps", type=float, default=30.0, help="合成轨迹的帧率")
+    parser.add_argument("--noise", type=float, default=0.002, help="合成轨迹的关键点噪声（归一化坐标标准差）")
+    parser.add_argument("--min-cutoff", type=float, default=0.5)
+    parser.add_argument("--beta", type=float, default=20.0)
+    parser.add_argument("--latency", type=float, default=0.05, help="采集到光标生效的延迟（秒），也是卡尔曼外推时长")
+    parser.add_argument("--process-noise", type=float, default=DEFAULT_PROCESS_NOISE, help="卡尔曼过程噪声谱密度")
+    args = parser.parse_args()
+
+    tracks = []
+    if args.synthetic or not args.recordings:
+        points, timestamps, truth = synthetic_session(args.fps, noise=args.noise)
+        tracks.append((points, timestamps, truth))
+        print(f"合成轨迹: {len(points)} 帧, {args.fps:.0f} fps, 噪声 {args.noise}")
+    for path in args.recordings:
+        for points, timestamps in recording_tracks(path):
+            tracks.append((points, timestamps, zero_phase_reference(points, timestamps)))
+        print(f"{path}: 累计 {len(tracks)} 段轨迹")
+    if not tracks:
+        print("没有可用的轨迹")
+        return
+
+    filters = [
+        ("原始", run_raw),
+        ("滑动平均+EMA 0.3", run_window_ema),
+        ("EMA 0.7", run_ema),
+        ("6 帧加权平均", run_weighted),
+        (f"One Euro ({args.min_cutoff}, {args.beta})",
+         lambda points, timestamps: run_one_euro(points, timestamps, args.min_cutoff, args.beta)),
+        ("One Euro + 卡尔曼匀速",
+         lambda points, timestamps: run_predicted(points, timestamps, "velocity", args.process_noise, args.latency,
+                                                  args.min_cutoff, args.beta)),
+        ("One Euro + 卡尔曼匀加速",
+         lambda points, timestamps: run_predicted(points, timestamps, "acceleration", args.process_noise * 100,
+                                                  args.latency, args.min_cutoff, args.beta)),
+    ]
+    print(f"光标生效延迟 {args.latency * 1000:.0f} ms")
+    print(f"\n{'滤波器':<24}{'抖动 px':>10}{'滞后 ms':>10}{'移动误差 px':>14}")
+    for name, run in filters:
+        results = [measure(run(points, timestamps), reference, timestamps, args.latency) for points, timestamps, reference in tracks]
+        still = sum(result['still_frames'] for result in results)
+        moving = sum(result['moving_frames'] for result in results)
+        jitter = np.sqrt(np.nansum([result['jitter_px'] ** 2 * result['still_frames'] for result in results]) / max(still, 1))
+        error = np.sqrt(np.nansum([result['moving_error_px'] ** 2 * result['moving_frames'] for result in results]) / max(moving, 1))
+        lag = np.nansum([result['lag_ms'] * result['moving_frames'] for result in results]) / max(moving, 1)
+        print(f"{name:<24}{jitter:>10.2f}{lag:>10.1f}{error:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+手部检测后端对比测试
+在同一段视频（或摄像头）上依次运行 inline / tasks / process 后端，比较帧率、单帧耗时和检出率
+
+    python -m benchmarks.detector_backends --source hand.mp4 --frames 300
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.hand_detector import HandDetector
+
+
+def run_backend(backend: str, source, frames: int, model_path: str, wait_ms: float,
+                roi_tracking: bool = False, keyframe_interval: int = 1) -> dict:
+    detector = HandDetector()
+    detector.inference_backend = backend
+    detector.roi_tracking = roi_tracking
+    detector.keyframe_interval = keyframe_interval
+    detector.hand_model_path = model_path
+    detector.live_stream_wait = wait_ms / 1000
+    if not detector._init_backend():
+        return {'backend': backend, 'error': "初始化失败"}
+
+    cap = cv2.VideoCapture(source)
+    processed = 0
+    detected = 0
+    total_time = 0.0
+    try:
+        while processed < frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            start = time.perf_counter()
+            shared_frame = None
+            if detector.process_pool is not None:
+                shared_frame = detector.process_pool.acquire_frame(frame.shape)
+            frame_rgb = detector.prepare_frame(frame, dst=shared_frame)
+            if detector.detect(frame_rgb) is not None:
+                detected += 1
+            total_time += time.perf_counter() - start
+            processed += 1
+        stats = detector.get_debug_stats()
+    finally:
+        cap.release()
+        detector.cleanup_detector()
+        detector.cleanup_process_pool()
+
+    return {
+        'backend': detector.active_backend,
+        'frames': processed,
+        'fps': processed / total_time if total_time else 0.0,
+        'avg_frame_ms': total_time / max(1, processed) * 1000,
+        'detection_rate': detected / max(1, processed),
+        'live_stream': stats['live_stream'],
+        'roi': stats['roi'],
+        'keyframes': stats['keyframes'],
+        'inference': stats['inference']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="手部检测后端对比测试")
+    parser.add_argument("--source", default="0", help="视频文件路径或摄像头编号")
+    parser.add_argument("--frames", type=int, default=300, help="每个后端处理的帧数")
+    parser.add_argument("--backends", default="inline,tasks,process", help="逗号分隔的后端列表")
+    parser.add_argument("--model", default="models/hand_landmarker.task", help="Tasks API 模型路径")
+    parser.add_argument("--wait-ms", type=float, default=0.0,
+                        help="tasks 后端等待本帧结果的最长时间，0 为完全异步")
+    parser.add_argument("--roi", action="store_true", help="inline 后端启用手部区域裁剪跟踪")
+    parser.add_argument("--keyframe-interval", type=int, default=1, help="每 N 帧推理一次，其余帧光流传播")
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    for backend in args.backends.split(","):
+        result = run_backend(backend.strip(), source, args.frames, args.model, args.wait_ms, args.roi,
+                             args.keyframe_interval)
+        if 'error' in result:
+            print(f"{result['backend']}: {result['error']}")
+            continue
+        print(f"{backend} (实际: {result['backend']}): {result['frames']} 帧, {result['fps']:.1f} fps, "
+              f"{result['avg_frame_ms']:.2f} ms/帧, 检出率 {result['detection_rate']:.1%}")
+        if result['live_stream']:
+            live_stream = result['live_stream']
+            print(f"  本帧结果 {live_stream['matched']}, 沿用旧结果 {live_stream['stale']}, "
+                  f"被跳过 {live_stream['skipped']}, 平均延迟 {live_stream['avg_latency_ms']:.1f} ms")
+        if result['roi']['roi_frames']:
+            roi = result['roi']
+            print(f"  裁剪 {roi['roi_frames']} 帧, 平均边长 {roi['avg_crop_size']:.0f} px, "
+                  f"回退率 {roi['fallback_rate']:.1%}, 推理像素占比 {roi['input_pixel_ratio']:.1%}")
+        if result['keyframes']:
+            keyframes = result['keyframes']
+            print(f"  关键帧 {keyframes['keyframes']}, 传播 {keyframes['propagated_frames']}, "
+                  f"平均漂移 {keyframes['avg_drift_px']:.1f} px, 最大漂移 {keyframes['max_drift_px']:.1f} px")
+        if result['inference']:
+            inference = result['inference']
+            print(f"  推理 {inference['avg_inference_ms']:.1f} ms + 进程间通信 {inference['avg_ipc_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+无显示器的端到端输入基准
+
+    python -m benchmarks.input_pipeline --synthetic --backend-delay 0.002
+    python -m benchmarks.input_pipeline recordings/session_20250101_120000.npz --no-pace
+
+按采集时间戳逐帧重放: 手掌中心经 One Euro 滤波映射成屏幕坐标交给 MouseController.move_to，
+手势交给 MouseController.handle_gesture，输出端为 RecordingBackend，不注入任何事件。
+分别以同步、异步注入各跑一遍:
+    调用耗时  识别线程每帧花在滤波与下发鼠标指令上的时间，毫秒
+    注入延迟  指令入队到后端执行完成，毫秒（InputDispatcher 统计）
+    事件数    后端实际收到的各类事件
+--backend-delay 模拟每次注入的耗时（pynput 经 X 服务器往返约 0.1~2 ms），用于观察同步注入对识别线程的阻塞。
+录制的手势由 GestureRecognizer 离线识别；合成轨迹在每次停稳后发一次点击。
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.cursor_filters import PALM_CENTER, synthetic_session
+from control.input_backends import RecordingBackend
+from control.mouse_controller import MouseController
+from recognition.cursor_filter import OneEuroFilter
+from recognition.landmark_recorder import load_recording
+
+SCREEN = (1920, 1080)
+# 合成轨迹停稳这么久以后发一次点击
+CLICK_AFTER_STILL = 0.3
+
+
+def synthetic_frames(fps: float, duration: float, noise: float):
+    points, timestamps, truth = synthetic_session(fps, duration, noise)
+    steps = np.linalg.norm(np.diff(truth, axis=0), axis=1)
+    still = np.concatenate([[True], steps < 1e-9])
+    gestures = []
+    still_since, clicked = timestamps[0], False
+    for index, timestamp in enumerate(timestamps):
+        if not still[index]:
+            still_since, clicked = timestamp, False
+        if still[index] and not clicked and timestamp - still_since >= CLICK_AFTER_STILL:
+            gestures.append("鼠标点击")
+            clicked = True
+        else:
+            gestures.append("鼠标移动")
+    return points, timestamps, gestures
+
+
+def recording_frames(path: str):
+    from recognition.gesture_recognizer import GestureRecognizer
+    recording = load_recording(path)
+    result = GestureRecognizer().recognize_batch(recording['landmarks'], recording['timestamps'])
+    points = recording['landmarks'][:, PALM_CENTER, :2].astype(np.float64)
+    return points, recording['timestamps'].astype(np.float64), result['gestures']
+
+
+def run(points, timestamps, gestures, asynchronous: bool, backend_delay: float, pace: bool) -> dict:
+    backend = RecordingBackend(delay=backend_delay)
+    controller = MouseController(*SCREEN, backend=backend)
+    controller.set_async_input(asynchronous)
+    cursor_filter = OneEuroFilter()
+    caller_times = []
+    start = time.perf_counter()
+    for point, timestamp, gesture in zip(points, timestamps, gestures):
+        if pace:
+            delay = start + timestamp - timestamps[0] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        frame_start = time.perf_counter()
+        if not np.isnan(point).any():
+            x, y = cursor_filter.filter(point[0], point[1], timestamp)
+            screen_x = max(0, min(SCREEN[0], int(x * SCREEN[0])))
+            screen_y = max(0, min(SCREEN[1], int(y * SCREEN[1])))
+            controller.move_to((screen_x, screen_y))
+        if gesture and gesture != "无":
+            controller.handle_gesture(gesture)
+        caller_times.append(time.perf_counter() - frame_start)
+    controller.shutdown()
+    caller_times = np.array(caller_times) * 1000
+    return {
+        'caller_avg_ms': float(caller_times.mean()),
+        'caller_p99_ms': float(np.percentile(caller_times, 99)),
+        'caller_max_ms': float(caller_times.max()),
+        'dispatch': controller.get_dispatch_stats(),
+        'backend': backend.get_stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无显示器的端到端输入基准")
+    parser.add_argument("recordings", nargs="*", help="LandmarkRecorder 保存的 .npz 文件")
+    parser.add_argument("--synthetic", action="store_true", help="使用合成轨迹")
+    parser.add_argument("--fps", type=float, default=30.0, help="合成轨迹的帧率")
+    parser.add_argument("--duration", type=float, default=10.0, help="合成轨迹时长（秒）")
+    parser.add_argument("--noise", type=float, default=0.002, help="合成轨迹的关键点噪声")
+    parser.add_argument("--backend-delay", type=float, default=0.001, help="每次注入的模拟耗时（秒）")
+    parser.add_argument("--no-pace", action="store_true", help="不按时间戳限速，尽快重放")
+    args = parser.parse_args()
+
+    sessions = []
+    if args.synthetic or not args.recordings:
+        sessions.append(("合成轨迹", synthetic_frames(args.fps, args.duration, args.noise)))
+    for path in args.recordings:
+        sessions.append((os.path.basename(path), recording_frames(path)))
+
+    for name, (points, timestamps, gestures) in sessions:
+        print(f"\n{name}: {len(points)} 帧, 模拟注入耗时 {args.backend_delay * 1000:.1f} ms")
+        print(f"{'注入':<6}{'调用 平均/p99/最大 ms':>24}{'移动 入队/合并':>16}{'移动延迟 平均/最大 ms':>24}  事件")
+        for asynchronous in (False, True):
+            result = run(points, timestamps, gestures, asynchronous, args.backend_delay, not args.no_pace)
+            move = result['dispatch']['commands']['move']
+            events = ", ".join(f"{kind} {count}" for kind, count in sorted(result['backend']['by_kind'].items()))
+            print(f"{'异步' if asynchronous else '同步':<6}"
+                  f"{result['caller_avg_ms']:>10.3f} / {result['caller_p99_ms']:.3f} / {result['caller_max_ms']:.3f}"
+                  f"{move['enqueued']:>10} / {move['coalesced']:<5}"
+                  f"{move['avg_latency_ms']:>12.2f} / {move['max_latency_ms']:.2f}      {events}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+离线重放关键点录制，比较阈值修改前后的手势时间线，以及去抖点击与边沿触发点击的提交延迟
+
+    python -m benchmarks.replay_recording recordings/session_20250101_120000.npz --click-contact 0.06
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from statistics import mean, median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.gesture_recognizer import GestureRecognizer
+from recognition.landmark_recorder import load_recording
+
+THRESHOLD_ARGS = {
+    'click_contact': 'click_contact_threshold',
+    'fist': 'fist_threshold',
+    'wheel_up': 'wheel_up_threshold',
+    'wheel_down': 'wheel_down_threshold',
+}
+
+
+CLICK_GESTURES = ("鼠标点击", "鼠标右键")
+
+
+def replay(recording: dict, edge_clicks: bool = True, temporal: bool = False, **thresholds) -> dict:
+    recognizer = GestureRecognizer()
+    recognizer.edge_clicks = edge_clicks
+    recognizer.temporal_gestures = temporal
+    recognizer.update_thresholds(**{THRESHOLD_ARGS[key]: value for key, value in thresholds.items()
+                                    if key in THRESHOLD_ARGS and value is not None})
+    if thresholds.get('wrist_movement') is not None:
+        recognizer.update_wrist_movement_threshold(thresholds['wrist_movement'])
+    start = time.perf_counter()
+    result = recognizer.recognize_batch(recording['landmarks'], recording['timestamps'])
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def summarize(name: str, result: dict):
+    frames = len(result['gestures'])
+    duration = result['timestamps'][-1] - result['timestamps'][0] if frames > 1 else 0.0
+    print(f"{name}: {frames} 帧 (录制时长 {duration:.1f} s), 重放 {result['elapsed'] * 1000:.1f} ms, "
+          f"{frames / max(result['elapsed'], 1e-9):.0f} 帧/秒")
+    segments = Counter(segment['gesture'] for segment in result['segments'] if segment['gesture'] != "无")
+    for gesture, count in segments.most_common():
+        print(f"  {gesture}: {count} 段")
+
+
+def click_commit_frames(result: dict, max_frames: int = 15, gap: int = 3) -> dict:
+    """每次捏合（原始判定进入点击的第一帧，之前 gap 帧内不是该点击）到输出该点击之间的帧数"""
+    raw, gestures = result['raw'], result['gestures']
+    latencies = []
+    pinches = 0
+    for index, gesture in enumerate(raw):
+        if gesture not in CLICK_GESTURES or gesture in raw[max(0, index - gap):index]:
+            continue
+        pinches += 1
+        for offset, output in enumerate(gestures[index:index + max_frames]):
+            if output == gesture:
+                latencies.append(offset)
+                break
+    return {'pinches': pinches, 'latencies': latencies}
+
+
+def summarize_clicks(name: str, result: dict):
+    clicks = click_commit_frames(result)
+    latencies = clicks['latencies']
+    if not clicks['pinches']:
+        print(f"{name}: 录制中没有捏合")
+        return
+    line = f"{name}: 捏合 {clicks['pinches']} 次, 提交 {len(latencies)} 次"
+    if latencies:
+        line += f", 提交帧数 平均 {mean(latencies):.2f} / 中位数 {median(latencies):.1f} / 最大 {max(latencies)}"
+    print(line)
+
+
+def summarize_events(result: dict):
+    latencies = {}
+    for event in result['events']:
+        latencies.setdefault(event['gesture'], []).append(event['latency'] * 1000)
+    if not latencies:
+        print("  没有时序手势事件")
+    for gesture, values in latencies.items():
+        print(f"  {gesture}: {len(values)} 次, 判定延迟 平均 {mean(values):.0f} ms / 最大 {max(values):.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线重放关键点录制")
+    parser.add_argument("recording", help="LandmarkRecorder 保存的 .npz 文件")
+    parser.add_argument("--click-contact", type=float)
+    parser.add_argument("--fist", type=float)
+    parser.add_argument("--wheel-up", type=float)
+    parser.add_argument("--wheel-down", type=float)
+    parser.add_argument("--wrist-movement", type=float)
+    parser.add_argument("--debounced-clicks", action="store_true", help="阈值比较时点击也走去抖投票")
+    parser.add_argument("--temporal", action="store_true", help="同时识别双指捏合、拖拽和滑动并统计判定延迟")
+    args = parser.parse_args()
+
+    recording = load_recording(args.recording)
+    edge_clicks = not args.debounced_clicks
+    baseline = replay(recording, edge_clicks=edge_clicks, temporal=args.temporal)
+    summarize("默认阈值", baseline)
+    if args.temporal:
+        summarize_events(baseline)
+    summarize_clicks("  去抖点击", baseline if not edge_clicks else replay(recording, edge_clicks=False))
+    summarize_clicks("  边沿触发点击", baseline if edge_clicks else replay(recording, edge_clicks=True))
+
+    candidate_thresholds = {
+        'click_contact': args.click_contact,
+        'fist': args.fist,
+        'wheel_up': args.wheel_up,
+        'wheel_down': args.wheel_down,
+        'wrist_movement': args.wrist_movement,
+    }
+    if all(value is None for value in candidate_thresholds.values()):
+        return
+    candidate = replay(recording, edge_clicks=edge_clicks, **candidate_thresholds)
+    summarize("修改后阈值", candidate)
+    changed = [index for index, (before, after) in enumerate(zip(baseline['gestures'], candidate['gestures']))
+               if before != after]
+    print(f"手势不同的帧: {len(changed)} ({len(changed) / max(1, len(baseline['gestures'])):.1%})")
+    transitions = Counter((baseline['gestures'][index], candidate['gestures'][index]) for index in changed)
+    for (before, after), count in transitions.most_common(10):
+        print(f"  {before} → {after}: {count} 帧")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+从带标注的关键点录制离线训练、评估模板分类器
+
+每个录制文件是一种手势，标注取录制时填写的 label，也可以写成 文件=标注 覆盖:
+
+    python -m benchmarks.template_classifier recordings/*.npz --output models/gesture_templates.npz
+    python -m benchmarks.template_classifier fist.npz=握拳 click.npz=鼠标点击 open.npz=无 --max-distance auto
+
+每个文件按时间顺序取最后 --holdout 比例的帧做测试集（相邻帧几乎相同，随机划分会高估准确率），
+保存的模型用全部帧重新训练。
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.gesture_recognizer import GestureRecognizer
+from recognition.landmark_recorder import load_recording
+from recognition.template_classifier import TemplateClassifier
+
+
+def load_labelled(paths):
+    for item in paths:
+        path, _, label = item.partition("=")
+        recording = load_recording(path)
+        label = label or str(recording.get('label', ''))
+        if not label:
+            print(f"跳过没有标注的录制: {path}")
+            continue
+        landmarks = recording['landmarks']
+        landmarks = landmarks[~np.isnan(landmarks).any(axis=(1, 2))]
+        yield path, label, landmarks
+
+
+def split(samples, holdout: float):
+    train_x, train_y, test_x, test_y = [], [], [], []
+    for _, label, landmarks in samples:
+        cut = int(len(landmarks) * (1.0 - holdout))
+        train_x.append(landmarks[:cut])
+        train_y += [label] * cut
+        test_x.append(landmarks[cut:])
+        test_y += [label] * (len(landmarks) - cut)
+    return np.concatenate(train_x), np.array(train_y, dtype=object), np.concatenate(test_x), np.array(test_y, dtype=object)
+
+
+def print_confusion(result: dict):
+    names = result['labels']
+    width = max(len(name) for name in names) + 2
+    print(" " * width + "".join(f"{name:>{width}}" for name in names))
+    for name, row in zip(names, result['confusion']):
+        print(f"{name:>{width}}" + "".join(f"{count:>{width}}" for count in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线训练、评估模板手势分类器")
+    parser.add_argument("recordings", nargs="+", help="录制文件，可写成 文件=标注")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--max-per-class", type=int, default=500, help="每类最多保留的模板数")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--max-distance", default=None, help="拒识距离，auto 为同类最近距离 99 分位的 1.5 倍")
+    parser.add_argument("--output", default=None, help="保存模型的路径")
+    args = parser.parse_args()
+
+    samples = list(load_labelled(args.recordings))
+    if not samples:
+        print("没有可用的标注录制")
+        return
+    for path, label, landmarks in samples:
+        print(f"{label}: {len(landmarks)} 帧 ({path})")
+    train_x, train_y, test_x, test_y = split(samples, args.holdout)
+
+    classifier = TemplateClassifier(k=args.k).fit(train_x, train_y, args.max_per_class)
+    if args.max_distance == "auto":
+        classifier.max_distance = float(np.percentile(classifier.nearest_same_class_distances(), 99) * 1.5)
+    elif args.max_distance is not None:
+        classifier.max_distance = float(args.max_distance)
+    print(f"\n模板 {len(classifier)} 个, k={classifier.k}, 拒识距离 {classifier.max_distance}")
+
+    if len(test_x):
+        result = classifier.evaluate(test_x, test_y)
+        print(f"模板分类 测试集准确率: {result['accuracy']:.1%} ({len(test_x)} 帧)")
+        print_confusion(result)
+        rules = GestureRecognizer().classify_batch(test_x)
+        known = np.isin(test_y, list(GestureRecognizer().rule_set.labels) + ["鼠标移动"])
+        if known.any():
+            print(f"阈值规则 同一测试集准确率: {(rules[known] == test_y[known]).mean():.1%} ({known.sum()} 帧)")
+
+        start = time.perf_counter()
+        for landmarks in test_x:
+            classifier.predict_one(landmarks)
+        per_frame = (time.perf_counter() - start) / len(test_x)
+        start = time.perf_counter()
+        classifier.predict(test_x)
+        batch = (time.perf_counter() - start) / len(test_x)
+        print(f"逐帧查找 {per_frame * 1e6:.1f} µs/帧, 批量 {batch * 1e6:.2f} µs/帧")
+
+    if args.output:
+        all_x = np.concatenate([landmarks for _, _, landmarks in samples])
+        all_y = np.array([label for _, label, landmarks in samples for _ in range(len(landmarks))], dtype=object)
+        final = TemplateClassifier(k=args.k, max_distance=classifier.max_distance).fit(all_x, all_y, args.max_per_class)
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        final.save(args.output)
+        print(f"\n已保存 {len(final)} 个模板到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+设置与识别模块共用的默认参数
+
+只放常量，不导入任何其它模块，recognition/ 与 benchmarks/ 可直接引用而不会牵连 mediapipe 或 Tk。
+"""
+
+# 卡尔曼光标预测器（recognition/cursor_predictor.py）
+DEFAULT_PROCESS_NOISE = 10.0
+DEFAULT_MEASUREMENT_NOISE = 0.003
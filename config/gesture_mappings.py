@@ -1,9 +1,7 @@
 # -*- coding: utf-8 -*-
 from enum import Enum
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional
 import time
-from pynput.mouse import Button, Controller as MouseController
-from pynput.keyboard import Key, Controller as KeyboardController
 
 
 class GestureAction(Enum):
@@ -20,9 +18,9 @@ class GestureAction(Enum):
 
 
 class GestureMapping:
-    def __init__(self):
-        self.mouse = MouseController()
-        self.keyboard = KeyboardController()
+    def __init__(self, backend=None):
+        # 输出后端在第一次执行操作时才创建，导入本模块不连接显示器
+        self._backend = backend
         self.default_mappings = {
             "鼠标移动": {
                 "action": GestureAction.MOUSE_MOVE,
@@ -61,7 +59,7 @@ class GestureMapping:
             },
             "回到桌面": {
                 "action": GestureAction.KEYBOARD_SHORTCUT,
-                "params": {"keys": [Key.cmd, 'd']},
+                "params": {"keys": ["cmd", 'd']},
                 "description": "Win+D回到桌面"
             },
             
@@ -91,6 +89,13 @@ class GestureMapping:
         self.last_control_disable_time = 0
         self.control_resume_delay = 0.5
         
+    @property
+    def backend(self):
+        if self._backend is None:
+            from control.input_backends import create_input_backend
+            self._backend = create_input_backend("pynput")
+        return self._backend
+    
     def execute_gesture_action(self, gesture_name: str, additional_data: Any = None) -> bool:
         if gesture_name not in self.active_mappings:
             return False
@@ -116,9 +121,9 @@ class GestureMapping:
             if action == GestureAction.MOUSE_MOVE:
                 return self._execute_mouse_move(additional_data, params)
             elif action == GestureAction.MOUSE_LEFT_CLICK:
-                return self._execute_mouse_click(Button.left, params)
+                return self._execute_mouse_click("left", params)
             elif action == GestureAction.MOUSE_RIGHT_CLICK:
-                return self._execute_mouse_click(Button.right, params)
+                return self._execute_mouse_click("right", params)
             elif action == GestureAction.MOUSE_DOUBLE_CLICK:
                 return self._execute_mouse_double_click(params)
             elif action == GestureAction.MOUSE_SCROLL_UP:
@@ -145,13 +150,13 @@ class GestureMapping:
             if self.control_enabled==True:
                 self.control_enabled = False
                 self.last_control_disable_time = time.time()
-                self.mouse.release(Button.left)
+                self.backend.release("left")
                 print("鼠标控制已停止")
                 return True
             else:
                 self.control_enabled = True
                 self.last_control_disable_time = time.time()
-                self.mouse.release(Button.left)
+                self.backend.release("left")
                 return True
         except Exception as e:
             print(f"停止控制执行出错: {e}")
@@ -179,7 +184,7 @@ class GestureMapping:
             screen_x = max(0, min(screen_width, screen_x))
             screen_y = max(0, min(screen_height, screen_y))
             
-            self.mouse.position = (screen_x, screen_y)
+            self.backend.move((screen_x, screen_y))
             
             print(f"点9映射移动: ({point5_x:.3f}, {point5_y:.3f}) → 屏幕({screen_x}, {screen_y})")
             return True
@@ -188,10 +193,10 @@ class GestureMapping:
             print(f"鼠标移动执行出错: {e}")
             return False
     
-    def _execute_mouse_click(self, button: Button, params: dict) -> bool:
+    def _execute_mouse_click(self, button: str, params: dict) -> bool:
         try:
-            self.mouse.click(button, 1)
-            print(f"执行鼠标{'左' if button == Button.left else '右'}键点击")
+            self.backend.click(button, 1)
+            print(f"执行鼠标{'左' if button == 'left' else '右'}键点击")
             return True
         except Exception as e:
             print(f"鼠标点击执行出错: {e}")
@@ -199,7 +204,7 @@ class GestureMapping:
     
     def _execute_mouse_double_click(self, params: dict) -> bool:
         try:
-            self.mouse.click(Button.left, 2)
+            self.backend.click("left", 2)
             print("执行鼠标双击")
             return True
         except Exception as e:
@@ -209,7 +214,7 @@ class GestureMapping:
     def _execute_mouse_scroll(self, direction: int, params: dict) -> bool:
         try:
             amount = params.get("amount", 3)
-            self.mouse.scroll(0, direction * amount)
+            self.backend.scroll(0, direction * amount)
             direction_str = "上" if direction > 0 else "下"
             print(f"执行鼠标滚轮{direction_str}滚动: {direction * amount}")
             return True
@@ -222,7 +227,7 @@ class GestureMapping:
             if hand_center and self.control_enabled:
                 self._execute_mouse_move(hand_center, {"scale": 1.0, "smoothing": 1.0})
             
-            self.mouse.press(Button.left)
+            self.backend.press("left")
             print("开始鼠标拖拽")
             return True
         except Exception as e:
@@ -231,7 +236,7 @@ class GestureMapping:
     
     def _execute_mouse_drag_end(self, params: dict) -> bool:
         try:
-            self.mouse.release(Button.left)
+            self.backend.release("left")
             print("结束鼠标拖拽")
             return True
         except Exception as e:
@@ -244,9 +249,9 @@ class GestureMapping:
             if not keys:
                 return False
             for key in keys:
-                self.keyboard.press(key)
+                self.backend.key_press(key)
             for key in reversed(keys):
-                self.keyboard.release(key)
+                self.backend.key_release(key)
                 
             print(f"执行键盘快捷键: {keys}")
             return True
@@ -299,4 +304,11 @@ class GestureMapping:
     def is_control_enabled(self) -> bool:
         return self.control_enabled
 
-gesture_mapper = GestureMapping()
\ No newline at end of file
+_gesture_mapper: Optional[GestureMapping] = None
+
+
+def get_gesture_mapper() -> GestureMapping:
+    global _gesture_mapper
+    if _gesture_mapper is None:
+        _gesture_mapper = GestureMapping()
+    return _gesture_mapper
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 import tkinter as tk
 from typing import Dict, Any, Optional
+from .defaults import DEFAULT_MEASUREMENT_NOISE, DEFAULT_PROCESS_NOISE
 
 class Settings:
     
@@ -22,7 +23,34 @@ class Settings:
             'smoothing_factor': 0.3,
             'scroll_sensitivity': 1.0,
             'camera_index': 0,
-            'resolution_preset': '1080p (FHD)'
+            'resolution_preset': '1080p (FHD)',
+            'threaded_capture': True,
+            'mirror_landmarks': True,
+            'pipeline_mode': False,
+            'inference_backend': 'inline',
+            'inference_workers': 1,
+            'hand_model_path': 'models/hand_landmarker.task',
+            'roi_tracking': False,
+            'keyframe_interval': 1,
+            'adaptive_keyframes': False,
+            'motion_gate': False,
+            'edge_clicks': True,
+            'gesture_rules_file': '',
+            'temporal_gestures': False,
+            'gesture_classifier': 'rules',
+            'template_model_path': 'models/gesture_templates.npz',
+            'cursor_min_cutoff': 0.5,
+            'cursor_beta': 20.0,
+            'cursor_prediction': False,
+            'cursor_prediction_model': 'velocity',
+            'cursor_prediction_horizon': 0.0,
+            'cursor_process_noise': DEFAULT_PROCESS_NOISE,
+            'cursor_measurement_noise': DEFAULT_MEASUREMENT_NOISE,
+            'cursor_output_thread': False,
+            'cursor_output_rate': 144,
+            'cursor_output_mode': 'interpolate',
+            'async_input': True,
+            'input_backend': 'pynput'
         }
         
         self.detection_confidence: Optional[tk.DoubleVar] = None
@@ -38,6 +66,33 @@ class Settings:
         self.scroll_sensitivity: Optional[tk.DoubleVar] = None
         self.camera_index: Optional[tk.IntVar] = None  # 摄像头索引
         self.resolution_preset: Optional[tk.StringVar] = None  # 分辨率预设
+        self.threaded_capture: Optional[tk.BooleanVar] = None  # 后台线程采集最新帧
+        self.mirror_landmarks: Optional[tk.BooleanVar] = None  # 镜像关键点而非整帧翻转
+        self.pipeline_mode: Optional[tk.BooleanVar] = None  # 多线程流水线识别
+        self.inference_backend: Optional[tk.StringVar] = None  # 推理后端: inline / tasks / process
+        self.inference_workers: Optional[tk.IntVar] = None  # 推理进程数
+        self.hand_model_path: Optional[tk.StringVar] = None  # Tasks API 本地模型路径
+        self.roi_tracking: Optional[tk.BooleanVar] = None  # 手部区域裁剪跟踪
+        self.keyframe_interval: Optional[tk.IntVar] = None  # 每 N 帧推理一次，其余帧光流传播
+        self.adaptive_keyframes: Optional[tk.BooleanVar] = None  # 按推理耗时自动选择关键帧间隔
+        self.motion_gate: Optional[tk.BooleanVar] = None  # 无手无运动时降低推理频率
+        self.edge_clicks: Optional[tk.BooleanVar] = None  # 点击在捏合越过阈值的那一帧立即触发
+        self.gesture_rules_file: Optional[tk.StringVar] = None  # 自定义手势规则 JSON，留空使用 config/gesture_rules.json
+        self.temporal_gestures: Optional[tk.BooleanVar] = None  # 识别双指捏合、捏合拖拽和滑动
+        self.gesture_classifier: Optional[tk.StringVar] = None  # 静态手势分类器: rules（阈值规则）或 template（模板最近邻）
+        self.template_model_path: Optional[tk.StringVar] = None  # 离线训练的模板模型
+        self.cursor_min_cutoff: Optional[tk.DoubleVar] = None  # 光标 One Euro 滤波最小截止频率 (Hz)
+        self.cursor_beta: Optional[tk.DoubleVar] = None  # 光标 One Euro 滤波速度系数
+        self.cursor_prediction: Optional[tk.BooleanVar] = None  # 按实测延迟外推光标位置
+        self.cursor_prediction_model: Optional[tk.StringVar] = None  # velocity / acceleration
+        self.cursor_prediction_horizon: Optional[tk.DoubleVar] = None  # 外推时长 (s)，0 为实测延迟
+        self.cursor_process_noise: Optional[tk.DoubleVar] = None  # 卡尔曼过程噪声谱密度
+        self.cursor_measurement_noise: Optional[tk.DoubleVar] = None  # 卡尔曼测量噪声标准差
+        self.cursor_output_thread: Optional[tk.BooleanVar] = None  # 独立线程按 cursor_output_rate 输出光标
+        self.cursor_output_rate: Optional[tk.IntVar] = None  # Hz
+        self.cursor_output_mode: Optional[tk.StringVar] = None  # interpolate / extrapolate
+        self.async_input: Optional[tk.BooleanVar] = None  # 鼠标指令由注入线程异步执行
+        self.input_backend: Optional[tk.StringVar] = None  # pynput / uinput / recording
     
     def initialize_tk_vars(self, root: tk.Tk):
         if self._tk_vars_initialized:
@@ -57,6 +112,33 @@ class Settings:
         self.scroll_sensitivity = tk.DoubleVar(value=self._cached_values['scroll_sensitivity'])
         self.camera_index = tk.IntVar(value=self._cached_values['camera_index'])
         self.resolution_preset = tk.StringVar(value=self._cached_values['resolution_preset'])
+        self.threaded_capture = tk.BooleanVar(value=self._cached_values['threaded_capture'])
+        self.mirror_landmarks = tk.BooleanVar(value=self._cached_values['mirror_landmarks'])
+        self.pipeline_mode = tk.BooleanVar(value=self._cached_values['pipeline_mode'])
+        self.inference_backend = tk.StringVar(value=self._cached_values['inference_backend'])
+        self.inference_workers = tk.IntVar(value=self._cached_values['inference_workers'])
+        self.hand_model_path = tk.StringVar(value=self._cached_values['hand_model_path'])
+        self.roi_tracking = tk.BooleanVar(value=self._cached_values['roi_tracking'])
+        self.keyframe_interval = tk.IntVar(value=self._cached_values['keyframe_interval'])
+        self.adaptive_keyframes = tk.BooleanVar(value=self._cached_values['adaptive_keyframes'])
+        self.motion_gate = tk.BooleanVar(value=self._cached_values['motion_gate'])
+        self.edge_clicks = tk.BooleanVar(value=self._cached_values['edge_clicks'])
+        self.gesture_rules_file = tk.StringVar(value=self._cached_values['gesture_rules_file'])
+        self.temporal_gestures = tk.BooleanVar(value=self._cached_values['temporal_gestures'])
+        self.gesture_classifier = tk.StringVar(value=self._cached_values['gesture_classifier'])
+        self.template_model_path = tk.StringVar(value=self._cached_values['template_model_path'])
+        self.cursor_min_cutoff = tk.DoubleVar(value=self._cached_values['cursor_min_cutoff'])
+        self.cursor_beta = tk.DoubleVar(value=self._cached_values['cursor_beta'])
+        self.cursor_prediction = tk.BooleanVar(value=self._cached_values['cursor_prediction'])
+        self.cursor_prediction_model = tk.StringVar(value=self._cached_values['cursor_prediction_model'])
+        self.cursor_prediction_horizon = tk.DoubleVar(value=self._cached_values['cursor_prediction_horizon'])
+        self.cursor_process_noise = tk.DoubleVar(value=self._cached_values['cursor_process_noise'])
+        self.cursor_measurement_noise = tk.DoubleVar(value=self._cached_values['cursor_measurement_noise'])
+        self.cursor_output_thread = tk.BooleanVar(value=self._cached_values['cursor_output_thread'])
+        self.cursor_output_rate = tk.IntVar(value=self._cached_values['cursor_output_rate'])
+        self.cursor_output_mode = tk.StringVar(value=self._cached_values['cursor_output_mode'])
+        self.async_input = tk.BooleanVar(value=self._cached_values['async_input'])
+        self.input_backend = tk.StringVar(value=self._cached_values['input_backend'])
         
         self._tk_vars_initialized = True
     
@@ -75,7 +157,34 @@ class Settings:
                 'smoothing_factor': self.smoothing_factor.get(),
                 'scroll_sensitivity': self.scroll_sensitivity.get(),
                 'camera_index': self.camera_index.get(),
-                'resolution_preset': self.resolution_preset.get()
+                'resolution_preset': self.resolution_preset.get(),
+                'threaded_capture': self.threaded_capture.get(),
+                'mirror_landmarks': self.mirror_landmarks.get(),
+                'pipeline_mode': self.pipeline_mode.get(),
+                'inference_backend': self.inference_backend.get(),
+                'inference_workers': self.inference_workers.get(),
+                'hand_model_path': self.hand_model_path.get(),
+                'roi_tracking': self.roi_tracking.get(),
+                'keyframe_interval': self.keyframe_interval.get(),
+                'adaptive_keyframes': self.adaptive_keyframes.get(),
+                'motion_gate': self.motion_gate.get(),
+                'edge_clicks': self.edge_clicks.get(),
+                'gesture_rules_file': self.gesture_rules_file.get(),
+                'temporal_gestures': self.temporal_gestures.get(),
+                'gesture_classifier': self.gesture_classifier.get(),
+                'template_model_path': self.template_model_path.get(),
+                'cursor_min_cutoff': self.cursor_min_cutoff.get(),
+                'cursor_beta': self.cursor_beta.get(),
+                'cursor_prediction': self.cursor_prediction.get(),
+                'cursor_prediction_model': self.cursor_prediction_model.get(),
+                'cursor_prediction_horizon': self.cursor_prediction_horizon.get(),
+                'cursor_process_noise': self.cursor_process_noise.get(),
+                'cursor_measurement_noise': self.cursor_measurement_noise.get(),
+                'cursor_output_thread': self.cursor_output_thread.get(),
+                'cursor_output_rate': self.cursor_output_rate.get(),
+                'cursor_output_mode': self.cursor_output_mode.get(),
+                'async_input': self.async_input.get(),
+                'input_backend': self.input_backend.get()
             }
         else:
             return self._cached_values.copy()
@@ -98,7 +207,34 @@ class Settings:
                 'smoothing_factor': self.smoothing_factor,
                 'scroll_sensitivity': self.scroll_sensitivity,
                 'camera_index': self.camera_index,
-                'resolution_preset': self.resolution_preset
+                'resolution_preset': self.resolution_preset,
+                'threaded_capture': self.threaded_capture,
+                'mirror_landmarks': self.mirror_landmarks,
+                'pipeline_mode': self.pipeline_mode,
+                'inference_backend': self.inference_backend,
+                'inference_workers': self.inference_workers,
+                'hand_model_path': self.hand_model_path,
+                'roi_tracking': self.roi_tracking,
+                'keyframe_interval': self.keyframe_interval,
+                'adaptive_keyframes': self.adaptive_keyframes,
+                'motion_gate': self.motion_gate,
+                'edge_clicks': self.edge_clicks,
+                'gesture_rules_file': self.gesture_rules_file,
+                'temporal_gestures': self.temporal_gestures,
+                'gesture_classifier': self.gesture_classifier,
+                'template_model_path': self.template_model_path,
+                'cursor_min_cutoff': self.cursor_min_cutoff,
+                'cursor_beta': self.cursor_beta,
+                'cursor_prediction': self.cursor_prediction,
+                'cursor_prediction_model': self.cursor_prediction_model,
+                'cursor_prediction_horizon': self.cursor_prediction_horizon,
+                'cursor_process_noise': self.cursor_process_noise,
+                'cursor_measurement_noise': self.cursor_measurement_noise,
+                'cursor_output_thread': self.cursor_output_thread,
+                'cursor_output_rate': self.cursor_output_rate,
+                'cursor_output_mode': self.cursor_output_mode,
+                'async_input': self.async_input,
+                'input_backend': self.input_backend
             }
             
             for key, var in mappings.items():
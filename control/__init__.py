@@ -1,4 +1,7 @@
 from .mouse_controller import MouseController
 from .keyboard_listener import KeyboardListener
+from .cursor_output import CursorOutputThread
+from .input_backends import InputBackend, RecordingBackend, create_input_backend
 
-__all__ = ['MouseController', 'KeyboardListener']
\ No newline at end of file
+__all__ = ['MouseController', 'KeyboardListener', 'CursorOutputThread',
+           'InputBackend', 'RecordingBackend', 'create_input_backend']
\ No newline at end of file
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+高频光标输出线程
+识别线程每次检测（15~30 Hz）只提交一个目标屏幕坐标，本线程按 rate（120~240 Hz）定时写光标位置，
+两次检测之间的位置由插值或外推得到，光标的流畅度不再受摄像头帧率限制:
+    interpolate  从新样本到达时光标所在处，在一个样本间隔内匀速走到新目标，不会越过目标，平均多约半个样本间隔的延迟
+    extrapolate  按最近两个样本的速度从最新目标继续外推，最多外推 max_extrapolation 秒，不增加延迟但急停时会略微越过
+坐标取整后与上次写入相同时不调用 set_position；超过 idle_timeout 没有新样本时线程挂起等待，不空转。
+两次写入之间默认只 sleep，接受系统定时器约 1 ms 的抖动；spin 为 True 时最后约 1 ms 忙等，周期更准，但会占住 GIL 与识别线程争抢。
+"""
+
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+MODES = ("interpolate", "extrapolate")
+
+
+class CursorOutputThread:
+    def __init__(self, set_position: Callable[[Tuple[int, int]], None], rate: float = 144.0,
+                 mode: str = "interpolate", max_extrapolation: float = 0.05, idle_timeout: float = 0.5,
+                 spin: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"未知光标输出模式: {mode}")
+        self.set_position = set_position
+        self.rate = max(1.0, float(rate))
+        self.mode = mode
+        self.max_extrapolation = max_extrapolation
+        self.idle_timeout = idle_timeout
+        self.spin = spin
+        self.is_running = False
+        self.thread: Optional[threading.Thread] = None
+        self._condition = threading.Condition()
+        self._reset_motion()
+        self._reset_stats()
+
+    def _reset_motion(self):
+        # 最新样本: (到达时间, 采集时间戳, x, y)，以及前一个样本
+        self._latest: Optional[tuple] = None
+        self._previous: Optional[tuple] = None
+        # 插值段的起点，即新样本到达时光标的位置
+        self._segment_start: Optional[Tuple[float, float]] = None
+        self._sample_interval = 1.0 / 30
+        self._last_written: Optional[Tuple[int, int]] = None
+
+    def _reset_stats(self):
+        self.samples = 0
+        self.ticks = 0
+        self.updates = 0
+        self.late_ticks = 0
+        self.active_time = 0.0
+        self.total_write_time = 0.0
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, name="cursor-output", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.is_running = False
+        with self._condition:
+            self._condition.notify_all()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def submit(self, x: float, y: float, timestamp: Optional[float] = None):
+        """识别线程提交一个目标屏幕坐标，timestamp 为该位置的采集时间戳"""
+        now = time.perf_counter()
+        with self._condition:
+            if self._latest is not None:
+                interval = now - self._latest[0]
+                if interval < self.idle_timeout:
+                    self._sample_interval += 0.2 * (interval - self._sample_interval)
+                self._segment_start = self._position_at(now)
+            self._previous = self._latest
+            self._latest = (now, now if timestamp is None else timestamp, float(x), float(y))
+            if self._segment_start is None:
+                self._segment_start = (float(x), float(y))
+            self.samples += 1
+            self._condition.notify()
+
+    def reset(self):
+        """丢弃当前运动（关闭鼠标控制、手丢失时），下一个样本直接定位"""
+        with self._condition:
+            self._reset_motion()
+
+    def _position_at(self, now: float) -> Optional[Tuple[float, float]]:
+        latest = self._latest
+        if latest is None:
+            return None
+        arrival, timestamp, x, y = latest
+        if self.mode == "interpolate":
+            start_x, start_y = self._segment_start
+            progress = min(1.0, (now - arrival) / max(self._sample_interval, 1e-3))
+            return start_x + (x - start_x) * progress, start_y + (y - start_y) * progress
+        previous = self._previous
+        if previous is None:
+            return x, y
+        dt = timestamp - previous[1]
+        if dt <= 0 or dt > self.idle_timeout:
+            return x, y
+        ahead = min(now - arrival, self.max_extrapolation)
+        return x + (x - previous[2]) / dt * ahead, y + (y - previous[3]) / dt * ahead
+
+    def _run(self):
+        period = 1.0 / self.rate
+        next_tick = time.perf_counter()
+        while self.is_running:
+            with self._condition:
+                now = time.perf_counter()
+                if self._latest is None or now - self._latest[0] > self.idle_timeout:
+                    self._condition.wait(timeout=0.1)
+                    next_tick = time.perf_counter()
+                    continue
+                position = self._position_at(now)
+            tick_start = now
+            pixel = (int(round(position[0])), int(round(position[1])))
+            if pixel != self._last_written:
+                start = time.perf_counter()
+                try:
+                    self.set_position(pixel)
+                except Exception as e:
+                    print(f"光标输出出错: {e}")
+                self.total_write_time += time.perf_counter() - start
+                self._last_written = pixel
+                self.updates += 1
+            self.ticks += 1
+            next_tick += period
+            now = time.perf_counter()
+            if now > next_tick:
+                # 写光标或调度耽误了超过一个周期，从当前时刻重新对齐，不补发
+                self.late_ticks += 1
+                next_tick = now
+            else:
+                self._sleep_until(next_tick, self.spin)
+            self.active_time += time.perf_counter() - tick_start
+
+    @staticmethod
+    def _sleep_until(deadline: float, spin: bool = False):
+        """sleep 到截止时刻；spin 为 True 时 sleep 到截止前约 1 ms，剩下的忙等"""
+        remaining = deadline - time.perf_counter()
+        if not spin:
+            if remaining > 0:
+                time.sleep(remaining)
+            return
+        if remaining > 0.002:
+            time.sleep(remaining - 0.001)
+        while time.perf_counter() < deadline:
+            pass
+
+    def get_stats(self) -> dict:
+        active = max(self.active_time, 1e-9)
+        return {
+            'mode': self.mode,
+            'target_rate_hz': self.rate,
+            'tick_rate_hz': self.ticks / active if self.active_time else 0.0,
+            'output_rate_hz': self.updates / active if self.active_time else 0.0,
+            'sample_rate_hz': 1.0 / self._sample_interval,
+            'samples': self.samples,
+            'updates': self.updates,
+            'late_ticks': self.late_ticks,
+            'avg_write_ms': self.total_write_time / self.updates * 1000 if self.updates else 0.0
+        }
@@ -3,11 +3,13 @@
 import time
 from typing import Tuple, Optional
 from collections import deque
-from pynput.mouse import Button, Controller as MouseControllerImpl
+
+from recognition.cursor_filter import OneEuroFilter
+from .input_backends import InputBackend, create_input_backend
 
 class ImprovedMouseController:
-    def __init__(self, screen_width: int = 1920, screen_height: int = 1080):
-        self.mouse = MouseControllerImpl()
+    def __init__(self, screen_width: int = 1920, screen_height: int = 1080, backend: Optional[InputBackend] = None):
+        self.mouse = backend or create_input_backend("pynput", (screen_width, screen_height))
         self.screen_width = screen_width
         self.screen_height = screen_height
         
@@ -21,19 +23,20 @@ class ImprovedMouseController:
         self.control_enabled = True
         self.debug_mode = False
         
-        self.filter_alpha = 0.7
+        self.position_filter = OneEuroFilter()
         self.filtered_position = (0.5, 0.5)
         
         self.position_history = deque(maxlen=3)
         self.velocity_history = deque(maxlen=3)
     
-    def handle_mouse_movement(self, hand_center: Tuple[float, float]):
+    def handle_mouse_movement(self, hand_center: Tuple[float, float], timestamp: float = None):
         try:
             if hand_center is None or not self.control_enabled:
                 return
             current_x, current_y = hand_center
-            filtered_x = self.filtered_position[0] * (1 - self.filter_alpha) + current_x * self.filter_alpha
-            filtered_y = self.filtered_position[1] * (1 - self.filter_alpha) + current_y * self.filter_alpha
+            filtered_x, filtered_y = self.position_filter.filter(
+                current_x, current_y, time.perf_counter() if timestamp is None else timestamp
+            )
             self.filtered_position = (filtered_x, filtered_y)
             delta_x = abs(filtered_x - self.last_hand_position[0])
             delta_y = abs(filtered_y - self.last_hand_position[1])
@@ -50,7 +53,7 @@ class ImprovedMouseController:
             current_mouse_x, current_mouse_y = self.mouse.position
             new_x = max(0, min(self.screen_width, current_mouse_x + int(smooth_delta_x)))
             new_y = max(0, min(self.screen_height, current_mouse_y + int(smooth_delta_y)))
-            self.mouse.position = (new_x, new_y)
+            self.mouse.move((new_x, new_y))
             self.last_hand_position = (filtered_x, filtered_y)
             self.position_history.append((filtered_x, filtered_y))
             
@@ -90,6 +93,7 @@ class ImprovedMouseController:
     def reset_position(self):
         self.last_hand_position = (0.5, 0.5)
         self.filtered_position = (0.5, 0.5)
+        self.position_filter.reset()
         self.position_history.clear()
         self.velocity_history.clear()
         if self.debug_mode:
@@ -113,12 +117,12 @@ class AdaptiveMouseController:
             dead_zone=self.initial_dead_zone
         )
     
-    def handle_mouse_movement(self, hand_center: Tuple[float, float]):
+    def handle_mouse_movement(self, hand_center: Tuple[float, float], timestamp: float = None):
         try:
             if hand_center is not None:
                 self.movement_history.append(hand_center)
                 self._adapt_parameters()
-            self.base_controller.handle_mouse_movement(hand_center)
+            self.base_controller.handle_mouse_movement(hand_center, timestamp)
             
         except Exception as e:
             if self.base_controller.debug_mode:
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+鼠标键盘输出后端
+上层只用与后端无关的名字: 按键 "left" / "right" / "middle"，键盘键为单个字符或 pynput Key 的名字（"cmd"、"ctrl"、"enter" 等）。
+    pynput     通过 pynput 注入，需要图形会话
+    uinput     Linux 下经 python-evdev 创建 uinput 虚拟设备直接写内核输入事件，不经过 X/Wayland，需要 /dev/uinput 写权限
+    recording  不注入，只在内存中按时间戳记录每条指令，用于没有显示器的环境下跑基准
+pynput 和 evdev 都在创建后端时才导入，导入本模块不需要显示器。
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+INPUT_BACKENDS = ("pynput", "uinput", "recording")
+BUTTONS = ("left", "right", "middle")
+
+
+class InputBackend:
+    """后端接口，与 pynput 的 mouse.Controller 保持同样的调用方式，InputDispatcher 可直接使用"""
+    name = "base"
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    @position.setter
+    def position(self, position: Tuple[int, int]):
+        self.move(position)
+
+    def move(self, position: Tuple[int, int]):
+        raise NotImplementedError
+
+    def click(self, button: str, count: int = 1):
+        for _ in range(count):
+            self.press(button)
+            self.release(button)
+
+    def press(self, button: str):
+        raise NotImplementedError
+
+    def release(self, button: str):
+        raise NotImplementedError
+
+    def scroll(self, dx: int, dy: int):
+        raise NotImplementedError
+
+    def key_press(self, key: str):
+        raise NotImplementedError
+
+    def key_release(self, key: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PynputBackend(InputBackend):
+    name = "pynput"
+
+    def __init__(self):
+        from pynput import keyboard, mouse
+        self._mouse = mouse.Controller()
+        self._keyboard = keyboard.Controller()
+        self._buttons = {name: getattr(mouse.Button, name) for name in BUTTONS}
+        self._key_type = keyboard.Key
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self._mouse.position
+
+    @position.setter
+    def position(self, position: Tuple[int, int]):
+        self._mouse.position = position
+
+    def move(self, position: Tuple[int, int]):
+        self._mouse.position = position
+
+    def click(self, button: str, count: int = 1):
+        self._mouse.click(self._buttons[button], count)
+
+    def press(self, button: str):
+        self._mouse.press(self._buttons[button])
+
+    def release(self, button: str):
+        self._mouse.release(self._buttons[button])
+
+    def scroll(self, dx: int, dy: int):
+        self._mouse.scroll(dx, dy)
+
+    def _key(self, key: str):
+        return key if len(key) == 1 else getattr(self._key_type, key)
+
+    def key_press(self, key: str):
+        self._keyboard.press(self._key(key))
+
+    def key_release(self, key: str):
+        self._keyboard.release(self._key(key))
+
+
+class UinputBackend(InputBackend):
+    name = "uinput"
+    # pynput 风格键名 → evdev 键码名
+    KEY_ALIASES = {
+        'cmd': 'KEY_LEFTMETA', 'ctrl': 'KEY_LEFTCTRL', 'alt': 'KEY_LEFTALT', 'shift': 'KEY_LEFTSHIFT',
+        'enter': 'KEY_ENTER', 'esc': 'KEY_ESC', 'space': 'KEY_SPACE', 'tab': 'KEY_TAB',
+        'backspace': 'KEY_BACKSPACE', 'delete': 'KEY_DELETE'
+    }
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080)):
+        from evdev import AbsInfo, UInput, ecodes
+        self._ecodes = ecodes
+        self._buttons = {'left': ecodes.BTN_LEFT, 'right': ecodes.BTN_RIGHT, 'middle': ecodes.BTN_MIDDLE}
+        width, height = screen_size
+        # 绝对坐标指针与键盘分成两个设备，避免被识别成触摸屏或手写板
+        self._pointer = UInput({
+            ecodes.EV_KEY: list(self._buttons.values()),
+            ecodes.EV_ABS: [
+                (ecodes.ABS_X, AbsInfo(value=0, min=0, max=width - 1, fuzz=0, flat=0, resolution=0)),
+                (ecodes.ABS_Y, AbsInfo(value=0, min=0, max=height - 1, fuzz=0, flat=0, resolution=0)),
+            ],
+            ecodes.EV_REL: [ecodes.REL_WHEEL, ecodes.REL_HWHEEL],
+        }, name="fingermouse-pointer")
+        key_codes = sorted({code for name, code in ecodes.ecodes.items()
+                            if name.startswith('KEY_') and 0 < code < ecodes.KEY_MAX})
+        self._keyboard = UInput({ecodes.EV_KEY: key_codes}, name="fingermouse-keyboard")
+        self.screen_size = screen_size
+        # uinput 读不到系统光标位置，返回最后一次写入的位置
+        self._position = (0, 0)
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self._position
+
+    @position.setter
+    def position(self, position: Tuple[int, int]):
+        self.move(position)
+
+    def move(self, position: Tuple[int, int]):
+        x, y = int(position[0]), int(position[1])
+        self._pointer.write(self._ecodes.EV_ABS, self._ecodes.ABS_X, x)
+        self._pointer.write(self._ecodes.EV_ABS, self._ecodes.ABS_Y, y)
+        self._pointer.syn()
+        self._position = (x, y)
+
+    def press(self, button: str):
+        self._pointer.write(self._ecodes.EV_KEY, self._buttons[button], 1)
+        self._pointer.syn()
+
+    def release(self, button: str):
+        self._pointer.write(self._ecodes.EV_KEY, self._buttons[button], 0)
+        self._pointer.syn()
+
+    def scroll(self, dx: int, dy: int):
+        if dy:
+            self._pointer.write(self._ecodes.EV_REL, self._ecodes.REL_WHEEL, int(dy))
+        if dx:
+            self._pointer.write(self._ecodes.EV_REL, self._ecodes.REL_HWHEEL, int(dx))
+        self._pointer.syn()
+
+    def _key(self, key: str) -> int:
+        name = self.KEY_ALIASES.get(key, 'KEY_' + key.upper())
+        if name not in self._ecodes.ecodes:
+            raise ValueError(f"uinput 不支持的键: {key}")
+        return self._ecodes.ecodes[name]
+
+    def key_press(self, key: str):
+        self._keyboard.write(self._ecodes.EV_KEY, self._key(key), 1)
+        self._keyboard.syn()
+
+    def key_release(self, key: str):
+        self._keyboard.write(self._ecodes.EV_KEY, self._key(key), 0)
+        self._keyboard.syn()
+
+    def close(self):
+        self._pointer.close()
+        self._keyboard.close()
+
+
+class RecordingBackend(InputBackend):
+    """每条指令记录为 {'timestamp', 'kind', 'args'}，timestamp 为 perf_counter；delay 模拟每次注入的耗时"""
+    name = "recording"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._position = (0, 0)
+        self._pressed = set()
+
+    def _record(self, kind: str, *args):
+        if self.delay > 0:
+            time.sleep(self.delay)
+        with self._lock:
+            self.events.append({'timestamp': time.perf_counter(), 'kind': kind, 'args': args})
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self._position
+
+    @position.setter
+    def position(self, position: Tuple[int, int]):
+        self.move(position)
+
+    def move(self, position: Tuple[int, int]):
+        self._position = (int(position[0]), int(position[1]))
+        self._record("move", self._position)
+
+    def click(self, button: str, count: int = 1):
+        self._record("click", button, count)
+
+    def press(self, button: str):
+        self._pressed.add(button)
+        self._record("press", button)
+
+    def release(self, button: str):
+        self._pressed.discard(button)
+        self._record("release", button)
+
+    def scroll(self, dx: int, dy: int):
+        self._record("scroll", dx, dy)
+
+    def key_press(self, key: str):
+        self._record("key_press", key)
+
+    def key_release(self, key: str):
+        self._record("key_release", key)
+
+    @property
+    def pressed_buttons(self) -> set:
+        return set(self._pressed)
+
+    def events_of(self, kind: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [event for event in self.events if event['kind'] == kind]
+
+    def clear(self):
+        with self._lock:
+            self.events = []
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for event in self.events:
+                counts[event['kind']] = counts.get(event['kind'], 0) + 1
+        return {'events': sum(counts.values()), 'by_kind': counts, 'pressed': sorted(self._pressed)}
+
+
+def create_input_backend(name: str = "pynput", screen_size: Tuple[int, int] = (1920, 1080)) -> InputBackend:
+    """按名字创建后端；uinput 不可用时回退到 pynput，pynput 也不可用（没有显示器）时回退到 recording"""
+    if name == "recording":
+        return RecordingBackend()
+    if name == "uinput":
+        try:
+            return UinputBackend(screen_size)
+        except Exception as e:
+            print(f"uinput 后端不可用 ({e})，回退到 pynput")
+    elif name != "pynput":
+        print(f"未知输入后端: {name}，使用 pynput")
+    try:
+        return PynputBackend()
+    except Exception as e:
+        print(f"pynput 后端不可用 ({e})，鼠标键盘指令只记录不注入")
+        return RecordingBackend()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+异步输入注入
+识别线程只把鼠标指令放进队列，由单独的线程调用输出后端，X 服务器等的往返不会阻塞下一帧。
+入队时合并:
+    move    队尾也是 move 时直接替换坐标，只保留最新位置
+    scroll  队尾也是 scroll 时累加滚动量
+    click / press / release 不合并，按入队顺序执行；move、scroll 只与紧邻的同类指令合并，
+    不会越过按键指令，"移动→点击→移动" 的先后关系保持不变
+按指令类型统计入队、合并、执行次数和注入延迟（入队到执行完成）。
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+COMMAND_TYPES = ("move", "click", "press", "release", "scroll")
+
+
+class _CommandStats:
+    __slots__ = ('enqueued', 'coalesced', 'executed', 'failed', 'total_latency', 'max_latency', 'total_exec')
+
+    def __init__(self):
+        self.enqueued = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_exec = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'enqueued': self.enqueued,
+            'coalesced': self.coalesced,
+            'executed': self.executed,
+            'failed': self.failed,
+            'avg_latency_ms': self.total_latency / self.executed * 1000 if self.executed else 0.0,
+            'max_latency_ms': self.max_latency * 1000,
+            'avg_exec_ms': self.total_exec / self.executed * 1000 if self.executed else 0.0
+        }
+
+
+class InputDispatcher:
+    def __init__(self, mouse: Any, asynchronous: bool = True):
+        """mouse 为 input_backends 中的输出后端，或其他带 position 属性与 click/press/release/scroll 方法的控制器"""
+        self.mouse = mouse
+        # False 时在调用线程直接执行，统计照常
+        self.asynchronous = asynchronous
+        self.is_running = False
+        self.thread: Optional[threading.Thread] = None
+        self._condition = threading.Condition()
+        # 每条指令为 [类型, 入队时间, 参数...]，move / scroll 合并时原地修改队尾
+        self._queue: deque = deque()
+        self.max_queue_depth = 0
+        self.stats = {name: _CommandStats() for name in COMMAND_TYPES}
+
+    def start(self):
+        if not self.asynchronous or self.is_running:
+            return
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, name="input-dispatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """停止线程，已入队的指令（包括松开按键）先执行完"""
+        with self._condition:
+            self.is_running = False
+            self._condition.notify_all()
+        thread = self.thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        if thread is not None and thread.is_alive():
+            # 线程还在执行指令，看到停止标志后会自己把队列执行完；这里再执行会与它同时使用后端
+            print(f"输入线程未在 {timeout:.1f}s 内退出，剩余 {len(self._queue)} 条指令由其执行")
+            return
+        self.thread = None
+        self._drain()
+
+    def move(self, x: int, y: int):
+        self._submit("move", (x, y))
+
+    def click(self, button: Any, count: int = 1):
+        self._submit("click", button, count)
+
+    def press(self, button: Any):
+        self._submit("press", button)
+
+    def release(self, button: Any):
+        self._submit("release", button)
+
+    def scroll(self, dx: int, dy: int):
+        self._submit("scroll", dx, dy)
+
+    def _submit(self, kind: str, *args):
+        now = time.perf_counter()
+        self.stats[kind].enqueued += 1
+        with self._condition:
+            if self.is_running:
+                tail = self._queue[-1] if self._queue else None
+                if tail is not None and tail[0] == kind == "move":
+                    # 保留较早的入队时间，注入延迟即光标位置过期的时长
+                    tail[2] = args[0]
+                    self.stats[kind].coalesced += 1
+                elif tail is not None and tail[0] == kind == "scroll":
+                    tail[2] += args[0]
+                    tail[3] += args[1]
+                    self.stats[kind].coalesced += 1
+                else:
+                    self._queue.append([kind, now, *args])
+                    self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+                    self._condition.notify()
+                return
+        self._execute([kind, now, *args])
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self.is_running and not self._queue:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                command = self._queue.popleft()
+            self._execute(command)
+
+    def _drain(self):
+        while True:
+            with self._condition:
+                if not self._queue:
+                    return
+                command = self._queue.popleft()
+            self._execute(command)
+
+    def _execute(self, command: list):
+        kind, enqueued_at = command[0], command[1]
+        start = time.perf_counter()
+        try:
+            if kind == "move":
+                self.mouse.position = command[2]
+            elif kind == "click":
+                self.mouse.click(command[2], command[3])
+            elif kind == "press":
+                self.mouse.press(command[2])
+            elif kind == "release":
+                self.mouse.release(command[2])
+            elif kind == "scroll":
+                self.mouse.scroll(command[2], command[3])
+        except Exception as e:
+            self.stats[kind].failed += 1
+            print(f"鼠标指令 {kind} 执行出错: {e}")
+        end = time.perf_counter()
+        stats = self.stats[kind]
+        stats.executed += 1
+        stats.total_exec += end - start
+        latency = end - enqueued_at
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def get_stats(self) -> dict:
+        return {
+            'asynchronous': self.is_running,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'commands': {name: stats.to_dict() for name, stats in self.stats.items()}
+        }
@@ -1,17 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from pynput.keyboard import Listener, Key
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
 class KeyboardListener:
     def __init__(self, toggle_callback: Callable[[], None]):
         self.toggle_callback = toggle_callback
-        self.listener: Optional[Listener] = None
+        self.listener: Optional[Any] = None
         self.ctrl_pressed = False
         self.alt_pressed = False
     
     def start(self):
         try:
+            # 在启动时才导入 pynput，没有图形会话时只是监听器启动失败
+            from pynput.keyboard import Listener
             self.listener = Listener(on_press=self._on_press, on_release=self._on_release)
             self.listener.start()
             print("键盘监听器已启动")
@@ -32,9 +33,9 @@ class KeyboardListener:
                 if self.ctrl_pressed and self.alt_pressed:
                     if self.toggle_callback:
                         self.toggle_callback()
-            if key in [Key.ctrl_l, Key.ctrl_r]:
+            if getattr(key, 'name', None) in ('ctrl_l', 'ctrl_r'):
                 self.ctrl_pressed = True
-            elif key in [Key.alt_l, Key.alt_r]:
+            elif getattr(key, 'name', None) in ('alt_l', 'alt_r'):
                 self.alt_pressed = True
                 
         except Exception as e:
@@ -42,9 +43,9 @@ class KeyboardListener:
     
     def _on_release(self, key):
         try:
-            if key in [Key.ctrl_l, Key.ctrl_r]:
+            if getattr(key, 'name', None) in ('ctrl_l', 'ctrl_r'):
                 self.ctrl_pressed = False
-            elif key in [Key.alt_l, Key.alt_r]:
+            elif getattr(key, 'name', None) in ('alt_l', 'alt_r'):
                 self.alt_pressed = False
                 
         except Exception as e:
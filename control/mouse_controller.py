@@ -2,14 +2,15 @@
 # -*- coding: utf-8 -*-
 import time
 from typing import Tuple, Optional
-from pynput.mouse import Button, Controller as MouseControllerImpl
-from pynput.keyboard import Key, Controller as KeyboardControllerImpl
-from config.gesture_mappings import gesture_mapper, GestureAction
+from .input_backends import InputBackend, create_input_backend
+from .input_dispatcher import InputDispatcher
 
 class MouseController:
-    def __init__(self, screen_width: int = 1920, screen_height: int = 1080):
-        self.mouse = MouseControllerImpl()
-        self.keyboard = KeyboardControllerImpl()
+    def __init__(self, screen_width: int = 1920, screen_height: int = 1080, backend: Optional[InputBackend] = None):
+        self.backend = backend or create_input_backend("pynput", (screen_width, screen_height))
+        # 所有鼠标指令经队列交给注入线程执行，不阻塞识别线程
+        self.dispatcher = InputDispatcher(self.backend)
+        self.dispatcher.start()
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.control_enabled = True
@@ -52,6 +53,12 @@ class MouseController:
                 self._handle_scroll_up_unified()
             elif gesture == "握拳":
                 self._handle_fist_unified()
+            elif gesture == "双指捏合":
+                self._handle_double_pinch()
+            elif gesture == "拖拽开始":
+                self._handle_drag_start()
+            elif gesture == "拖拽结束":
+                self.release_all_buttons()
             elif gesture == "鼠标移动":
                 if self.debug_mode:
                     print("[DEBUG] 鼠标移动手势接收")
@@ -73,7 +80,7 @@ class MouseController:
                     remaining = self.click_cooldown - (current_time - self.last_click_time)
                     print(f"[DEBUG] 点击冷却中，剩余时间: {remaining:.3f}s")
                 return
-            self.mouse.click(Button.left, 1)
+            self.dispatcher.click("left", 1)
             self.last_click_time = current_time
             print("鼠标左键点击执行")
         except Exception as e:
@@ -84,7 +91,7 @@ class MouseController:
             current_time = time.time()
             if current_time - self.last_click_time < self.click_cooldown:
                 return
-            self.mouse.click(Button.right, 1)
+            self.dispatcher.click("right", 1)
             self.last_click_time = current_time
             
             print("鼠标右键点击执行")
@@ -100,7 +107,7 @@ class MouseController:
                     remaining = self.scroll_cooldown - (current_time - self.last_scroll_time)
                     print(f"[DEBUG] 滚动冷却中，剩余时间: {remaining:.3f}s")
                 return
-            self.mouse.scroll(0, -self.scroll_amount)
+            self.dispatcher.scroll(0, -self.scroll_amount)
             self.last_scroll_time = current_time
             
             print(f"下滚轮执行: {-self.scroll_amount}")
@@ -113,7 +120,7 @@ class MouseController:
             current_time = time.time()
             if current_time - self.last_scroll_time < self.scroll_cooldown:
                 return
-            self.mouse.scroll(0, self.scroll_amount)
+            self.dispatcher.scroll(0, self.scroll_amount)
             self.last_scroll_time = current_time
             
             print(f"上滚轮执行: {self.scroll_amount}")
@@ -121,6 +128,59 @@ class MouseController:
         except Exception as e:
             print(f"上滚轮处理出错: {e}")
     
+    def _handle_double_pinch(self):
+        """第一次捏合已经点击过一次，这里补一次点击，与之组成系统双击"""
+        try:
+            self.dispatcher.click("left", 1)
+            self.last_click_time = time.time()
+            print("鼠标双击执行")
+        except Exception as e:
+            print(f"鼠标双击处理出错: {e}")
+    
+    def _handle_drag_start(self):
+        try:
+            if not self.mouse_pressed:
+                self.dispatcher.press("left")
+                self.mouse_pressed = True
+                print("开始鼠标拖拽")
+        except Exception as e:
+            print(f"开始拖拽处理出错: {e}")
+    
+    def move_to(self, position: Tuple[int, int]):
+        self.dispatcher.move(*position)
+    
+    def set_async_input(self, enabled: bool):
+        """切换异步注入；关闭时先执行完队列中的指令"""
+        if enabled == self.dispatcher.is_running:
+            return
+        if enabled:
+            self.dispatcher.asynchronous = True
+            self.dispatcher.start()
+        else:
+            self.dispatcher.asynchronous = False
+            self.dispatcher.stop()
+    
+    def set_backend(self, backend: InputBackend):
+        """切换输出后端：先松开按键并执行完旧后端队列中的指令"""
+        asynchronous = self.dispatcher.asynchronous
+        self.release_all_buttons()
+        self.dispatcher.stop()
+        self.backend.close()
+        self.backend = backend
+        self.dispatcher = InputDispatcher(backend, asynchronous=asynchronous)
+        self.dispatcher.start()
+        print(f"输入后端: {backend.name}")
+    
+    def shutdown(self):
+        self.release_all_buttons()
+        self.dispatcher.stop()
+        self.backend.close()
+    
+    def get_dispatch_stats(self) -> dict:
+        stats = self.dispatcher.get_stats()
+        stats['backend'] = self.backend.name
+        return stats
+    
     def enable_control(self):
         self.control_enabled = True
         self.last_control_disable_time = 0
@@ -153,14 +213,15 @@ class MouseController:
     def update_screen_size(self, width: int, height: int):
         self.screen_width = width
         self.screen_height = height
-        print(f"屏幕尺寸已更新为: {width} x {height}")
+        if self.debug_mode:
+            print(f"屏幕尺寸已更新为: {width} x {height}")
     
     def release_all_buttons(self):
         """释放所有按下的鼠标按钮"""
         try:
             # 释放左键
             if self.mouse_pressed:
-                self.mouse.release(Button.left)
+                self.dispatcher.release("left")
                 self.mouse_pressed = False
                 print("释放鼠标左键")
             
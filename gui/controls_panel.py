@@ -1,66 +1,10 @@
-import cv2
-import platform
-from typing import List, Tuple
+import threading
 import tkinter as tk
 from tkinter import ttk
 from typing import Callable, Any
 from config import ConfigManager
 from utils.camera_scanner import CameraScanner
 
-class CameraScanner:    
-    def __init__(self):
-        self.system = platform.system().lower()
-    
-    def get_resolution_presets(self) -> List[str]:
-        return [
-            "自定义",
-            "480p (640x480)",
-            "720p (1280x720)", 
-            "1080p (1920x1080)",
-            "1440p (2560x1440)",
-            "4K (3840x2160)"
-        ]
-    
-    def get_resolution_by_name(self, name: str) -> Tuple[int, int]:
-        resolutions = {
-            "自定义": (800, 600),
-            "480p (640x480)": (640, 480),
-            "720p (1280x720)": (1280, 720),
-            "1080p (1920x1080)": (1920, 1080),
-            "1440p (2560x1440)": (2560, 1440),
-            "4K (3840x2160)": (3840, 2160)
-        }
-        return resolutions.get(name, (800, 600))
-    
-    def scan_cameras(self) -> List[Tuple[int, str]]:
-        available_cameras = []
-        if self.system == "windows":
-            for i in range(10):
-                cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
-                if cap.isOpened():
-                    ret, frame = cap.read()
-                    if ret:
-                        available_cameras.append((i, f"摄像头 {i}"))
-                    cap.release()
-        elif self.system == "darwin":
-            for i in range(5):
-                cap = cv2.VideoCapture(i)
-                if cap.isOpened():
-                    ret, frame = cap.read()
-                    if ret:
-                        available_cameras.append((i, f"内置摄像头" if i == 0 else f"外部摄像头 {i}"))
-                    cap.release()
-        else:
-            for i in range(10):
-                cap = cv2.VideoCapture(i)
-                if cap.isOpened():
-                    ret, frame = cap.read()
-                    if ret:
-                        available_cameras.append((i, f"/dev/video{i}"))
-                    cap.release()
-        
-        return available_cameras if available_cameras else []
-
 class ControlsPanel:    
     def __init__(self, parent: tk.Widget, config_manager: ConfigManager,
                  start_callback: Callable, stop_callback: Callable,
@@ -77,12 +21,15 @@ class ControlsPanel:
         }
         self.camera_scanner = CameraScanner()
         self.available_cameras = []
+        # 缓存验证期间会逐个打开摄像头，能力探测推迟到验证结束，避免同一设备被同时打开（V4L2 返回 EBUSY）
+        self._revalidating = False
         self.control_widgets = {}
         control_frame = ttk.LabelFrame(parent, text="控制面板", padding="10")
         control_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
         self._build_parameter_controls(control_frame)
         self._build_control_buttons(control_frame)
         self._build_status_display(control_frame)
+        self._load_cached_cameras()
     
     def _build_parameter_controls(self, parent: tk.Widget):
         param_frame = ttk.LabelFrame(parent, text="参数设置", padding="5")
@@ -118,6 +65,79 @@ class ControlsPanel:
         scroll_slider = ttk.Scale(param_frame, from_=0.5, to=2.0, variable=settings.scroll_sensitivity)
         scroll_slider.grid(row=5, column=1, padx=5, pady=2, sticky=tk.EW)
         ttk.Label(param_frame, textvariable=settings.scroll_sensitivity).grid(row=5, column=2, padx=5)
+        ttk.Checkbutton(
+            param_frame, text="多线程流水线识别", variable=settings.pipeline_mode
+        ).grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="推理后端:").grid(row=7, column=0, sticky=tk.W, pady=2)
+        ttk.Combobox(
+            param_frame,
+            textvariable=settings.inference_backend,
+            values=["inline", "tasks", "process"],
+            state="readonly",
+            width=10
+        ).grid(row=7, column=1, padx=5, pady=2, sticky=tk.W)
+        ttk.Checkbutton(
+            param_frame, text="手部区域裁剪跟踪", variable=settings.roi_tracking
+        ).grid(row=8, column=0, columnspan=3, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="关键帧间隔:").grid(row=9, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(
+            param_frame, from_=1, to=8, textvariable=settings.keyframe_interval, width=5
+        ).grid(row=9, column=1, padx=5, pady=2, sticky=tk.W)
+        ttk.Checkbutton(
+            param_frame, text="自适应", variable=settings.adaptive_keyframes
+        ).grid(row=9, column=2, sticky=tk.W, pady=2)
+        ttk.Checkbutton(
+            param_frame, text="无动作时降低检测频率", variable=settings.motion_gate
+        ).grid(row=10, column=0, columnspan=3, sticky=tk.W, pady=2)
+        ttk.Checkbutton(
+            param_frame, text="捏合即点击（边沿触发）", variable=settings.edge_clicks
+        ).grid(row=11, column=0, columnspan=3, sticky=tk.W, pady=2)
+        ttk.Checkbutton(
+            param_frame, text="双击、拖拽与滑动手势", variable=settings.temporal_gestures
+        ).grid(row=12, column=0, columnspan=3, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="手势分类器:").grid(row=13, column=0, sticky=tk.W, pady=2)
+        ttk.Combobox(
+            param_frame,
+            textvariable=settings.gesture_classifier,
+            values=["rules", "template"],
+            state="readonly",
+            width=10
+        ).grid(row=13, column=1, padx=5, pady=2, sticky=tk.W)
+        ttk.Label(param_frame, text="光标最小截止频率:").grid(row=14, column=0, sticky=tk.W, pady=2)
+        min_cutoff_slider = ttk.Scale(
+            param_frame, from_=0.1, to=3.0, variable=settings.cursor_min_cutoff,
+            command=lambda v: self.callbacks['update']()
+        )
+        min_cutoff_slider.grid(row=14, column=1, padx=5, pady=2, sticky=tk.EW)
+        ttk.Label(param_frame, textvariable=settings.cursor_min_cutoff).grid(row=14, column=2, padx=5)
+        ttk.Label(param_frame, text="光标速度系数:").grid(row=15, column=0, sticky=tk.W, pady=2)
+        beta_slider = ttk.Scale(
+            param_frame, from_=0.0, to=60.0, variable=settings.cursor_beta,
+            command=lambda v: self.callbacks['update']()
+        )
+        beta_slider.grid(row=15, column=1, padx=5, pady=2, sticky=tk.EW)
+        ttk.Label(param_frame, textvariable=settings.cursor_beta).grid(row=15, column=2, padx=5)
+        ttk.Checkbutton(
+            param_frame, text="光标预测（补偿识别延迟）", variable=settings.cursor_prediction
+        ).grid(row=16, column=0, columnspan=3, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="光标输出频率:").grid(row=17, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(
+            param_frame, from_=60, to=360, increment=12, textvariable=settings.cursor_output_rate, width=5
+        ).grid(row=17, column=1, padx=5, pady=2, sticky=tk.W)
+        ttk.Checkbutton(
+            param_frame, text="启用", variable=settings.cursor_output_thread
+        ).grid(row=17, column=2, sticky=tk.W, pady=2)
+        ttk.Checkbutton(
+            param_frame, text="异步注入鼠标指令", variable=settings.async_input
+        ).grid(row=18, column=0, columnspan=3, sticky=tk.W, pady=2)
+        ttk.Label(param_frame, text="输入后端:").grid(row=19, column=0, sticky=tk.W, pady=2)
+        ttk.Combobox(
+            param_frame,
+            textvariable=settings.input_backend,
+            values=["pynput", "uinput", "recording"],
+            state="readonly",
+            width=10
+        ).grid(row=19, column=1, padx=5, pady=2, sticky=tk.W)
         screen_frame = ttk.LabelFrame(parent, text="屏幕设置", padding="5")
         screen_frame.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(screen_frame, text="目标分辨率:").grid(row=0, column=0, sticky=tk.W, pady=2)
@@ -171,6 +191,12 @@ class ControlsPanel:
         ttk.Label(camera_frame, text="帧率:").grid(row=3, column=0, sticky=tk.W, pady=2)
         fps_entry = ttk.Entry(camera_frame, textvariable=settings.camera_fps, width=10)
         fps_entry.grid(row=3, column=1, padx=5, pady=2)
+        ttk.Checkbutton(
+            camera_frame, text="后台线程采集(降低延迟)", variable=settings.threaded_capture
+        ).grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=2)
+        ttk.Checkbutton(
+            camera_frame, text="镜像关键点(跳过整帧翻转)", variable=settings.mirror_landmarks
+        ).grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=2)
     
     def _build_control_buttons(self, parent: tk.Widget):
         button_frame = ttk.Frame(parent)
@@ -247,10 +273,78 @@ class ControlsPanel:
     def _scan_cameras(self):
         self.scan_btn.config(state=tk.DISABLED, text="扫描中...")
         self.camera_status.config(text="正在扫描...")
-        import threading
         scan_thread = threading.Thread(target=self._perform_scan, daemon=True)
         scan_thread.start()
         
+    def _load_cached_cameras(self):
+        self.available_cameras = self.camera_scanner.get_cached_cameras()
+        if not self.available_cameras:
+            return
+        self._revalidating = True
+        self._show_camera_list(keep_selection=True)
+        self.camera_status.config(text=f"缓存 {len(self.available_cameras)} 个摄像头，验证中...")
+        revalidate_thread = threading.Thread(target=self._perform_revalidate, daemon=True)
+        revalidate_thread.start()
+    
+    def _perform_revalidate(self):
+        try:
+            cameras = self.camera_scanner.revalidate_cached()
+            self.parent.after(0, lambda: self._on_revalidated(cameras))
+        except Exception as e:
+            self.parent.after(0, lambda: self._on_revalidate_error(str(e)))
+    
+    def _on_revalidate_error(self, error_msg):
+        self._revalidating = False
+        self._scan_error(error_msg)
+    
+    def _on_revalidated(self, cameras):
+        self._revalidating = False
+        if self.scan_btn.instate(['disabled']):
+            # 完整扫描进行中，以扫描结果为准
+            return
+        self.available_cameras = cameras
+        if cameras:
+            self._show_camera_list(keep_selection=True)
+            self.camera_status.config(text=f"找到 {len(cameras)} 个摄像头")
+        else:
+            self._update_camera_list()
+    
+    def _show_camera_list(self, keep_selection: bool = False):
+        camera_descriptions = [desc for _, desc in self.available_cameras]
+        self.camera_combo['values'] = camera_descriptions
+        selection = 0
+        if keep_selection:
+            current_index = self.config_manager.settings.camera_index.get()
+            ports = [port for port, _ in self.available_cameras]
+            if current_index in ports:
+                selection = ports.index(current_index)
+        self.camera_combo.current(selection)
+        self.config_manager.settings.camera_index.set(self.available_cameras[selection][0])
+        self._refresh_camera_capabilities(self.available_cameras[selection][0])
+    
+    def _refresh_camera_capabilities(self, camera_index: int):
+        if self._revalidating:
+            # 验证结束后 _on_revalidated 会为当前选中的摄像头重新探测
+            return
+        def on_probed(capabilities):
+            self.parent.after(0, lambda: self._update_cam_resolutions(camera_index, capabilities))
+        self.camera_scanner.capability_probe.probe_async(camera_index, on_probed)
+    
+    def _update_cam_resolutions(self, camera_index: int, capabilities: dict):
+        if self.config_manager.settings.camera_index.get() != camera_index:
+            return
+        resolutions = capabilities.get('supported_resolutions') if capabilities else None
+        if not resolutions:
+            return
+        values = [f"{width}x{height}" for width, height in resolutions]
+        self.cam_resolution_combo['values'] = values
+        if self.cam_resolution_combo.get() not in values:
+            settings = self.config_manager.settings
+            current = f"{settings.camera_width.get()}x{settings.camera_height.get()}"
+            fallback = [f"{w}x{h}" for w, h in resolutions if w <= 1920] or values
+            self.cam_resolution_combo.set(current if current in values else fallback[-1])
+            self._on_cam_resolution_change()
+    
     def _perform_scan(self):
         try:
             self.available_cameras = self.camera_scanner.scan_cameras()
@@ -260,13 +354,7 @@ class ControlsPanel:
         
     def _update_camera_list(self):
         if self.available_cameras:
-            camera_descriptions = [desc for _, desc in self.available_cameras]
-            self.camera_combo['values'] = camera_descriptions
-            if camera_descriptions:
-                self.camera_combo.set(camera_descriptions[0])
-                self.camera_combo.current(0)
-                self.config_manager.settings.camera_index.set(self.available_cameras[0][0])
-                
+            self._show_camera_list()
             self.camera_status.config(text=f"找到 {len(self.available_cameras)} 个摄像头")
         else:
             self.camera_combo['values'] = ["未找到摄像头"]
@@ -285,6 +373,7 @@ class ControlsPanel:
             camera_index = self.available_cameras[selection][0]
             self.config_manager.settings.camera_index.set(camera_index)
             print(f"选择摄像头: {self.available_cameras[selection][1]}")
+            self._refresh_camera_capabilities(camera_index)
         
     def _on_cam_resolution_change(self, event=None):
         resolution_str = self.cam_resolution_combo.get()
@@ -1,17 +1,21 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 import threading
 import time
-import math
-from typing import Tuple, Optional
-from collections import deque
+from typing import Optional
 
 from config import ConfigManager
 from utils.logger import setup_logger
 from recognition.hand_detector import HandDetector
+from recognition.click_trigger import CLICK_CHANNELS
+from recognition.cursor_filter import OneEuroFilter
+from recognition.cursor_predictor import KalmanCursorPredictor
+from recognition.pipeline import RecognitionPipeline
 from control.mouse_controller import MouseController
+from control.input_backends import create_input_backend
+from control.cursor_output import CursorOutputThread
 from control.keyboard_listener import KeyboardListener
 from .controls_panel import ControlsPanel
 from .preview_panel import PreviewPanel
@@ -31,21 +35,35 @@ class MainWindow:
         self.gesture_change_time = 0
         self.gesture_stable_time = 0.1
         self.last_gesture_execution = {}
+        # 拖拽按住左键期间，以及拖拽结束后去抖仍输出点击的几帧，不执行点击
+        self.suppress_drag_clicks = False
         self.config_manager = ConfigManager()
         self.config_manager.initialize_with_root(root)
         self.hand_detector = HandDetector()
         self.mouse_controller = MouseController()
+        # 绝对坐标映射前的光标滤波，按采集时间戳计算平滑系数
+        self.cursor_filter = OneEuroFilter()
+        # 开启光标预测时按 采集→指令 延迟外推滤波后的位置
+        self.cursor_predictor: Optional[KalmanCursorPredictor] = None
+        # 开启后光标由独立线程按固定频率写入，识别线程只提交目标位置
+        self.cursor_output: Optional[CursorOutputThread] = None
         self.keyboard_listener = KeyboardListener(self._toggle_recognition)
         self.is_running = False
         self.mouse_control_enabled = False
         self.is_paused = False
         self.recognize_thread: Optional[threading.Thread] = None
+        self.pipeline: Optional[RecognitionPipeline] = None
         self.current_gesture = "无"
         self.config_manager.load_config()
         self._build_gui()
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.keyboard_listener.start()
         self._update_resolution_display()
+        # 识别线程只读 MouseController 的屏幕尺寸，设置变化时在 Tk 线程同步过去
+        self._screen_size_pending = False
+        self.config_manager.settings.screen_width.trace_add('write', self._schedule_screen_size_sync)
+        self.config_manager.settings.screen_height.trace_add('write', self._schedule_screen_size_sync)
+        self._apply_screen_size()
         self.logger.info("Main Window Initialized.")
     def _build_gui(self):
         self._create_menu()
@@ -74,6 +92,10 @@ class MainWindow:
         file_menu.add_command(label="保存配置", command=self._save_config)
         file_menu.add_command(label="加载配置", command=self._load_config_dialog)
         file_menu.add_separator()
+        file_menu.add_command(label="开始录制关键点", command=self._toggle_recording)
+        self.file_menu = file_menu
+        self.record_menu_index = file_menu.index(tk.END)
+        file_menu.add_separator()
         file_menu.add_command(label="退出", command=self._on_close)
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="设置", menu=settings_menu)
@@ -81,6 +103,7 @@ class MainWindow:
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="帮助", menu=help_menu)
         help_menu.add_command(label="使用说明", command=self._show_help)
+        help_menu.add_command(label="性能统计", command=self._show_debug_stats)
         help_menu.add_command(label="关于", command=self._show_about)
     def _show_gesture_thresholds_dialog(self):
         dialog = tk.Toplevel(self.root)
@@ -202,11 +225,29 @@ class MainWindow:
                 screen_width = self.config_manager.settings.screen_width.get()
                 screen_height = self.config_manager.settings.screen_height.get()
                 self.mouse_controller.update_screen_size(screen_width, screen_height)
-                self.recognize_thread = threading.Thread(
-                    target=self._recognition_loop, 
-                    daemon=True
-                )
-                self.recognize_thread.start()
+                backend_name = self.config_manager.settings.input_backend.get()
+                if backend_name != self.mouse_controller.backend.name:
+                    self.mouse_controller.set_backend(
+                        create_input_backend(backend_name, (screen_width, screen_height))
+                    )
+                self.mouse_controller.set_async_input(self.config_manager.settings.async_input.get())
+                self._update_cursor_filter()
+                self.cursor_filter.reset()
+                self._init_cursor_predictor()
+                self._init_cursor_output()
+                if self.config_manager.settings.pipeline_mode.get():
+                    self.pipeline = RecognitionPipeline.from_components(
+                        self.hand_detector,
+                        act=self._pipeline_act,
+                        render=self._pipeline_render
+                    )
+                    self.pipeline.start()
+                else:
+                    self.recognize_thread = threading.Thread(
+                        target=self._recognition_loop, 
+                        daemon=True
+                    )
+                    self.recognize_thread.start()
                 self.logger.info("手势识别已启动")
             else:
                 messagebox.showerror("错误", "无法初始化手部检测器")
@@ -217,6 +258,9 @@ class MainWindow:
     def _stop_recognition(self):
         self.is_running = False
         self.is_paused = False
+        self._stop_pipeline()
+        self._join_recognition_thread()
+        self._stop_cursor_output()
         self.controls_panel.update_control_states(running=False)
         self._update_status("已停止", "red")
         self.hand_detector.cleanup()
@@ -231,6 +275,8 @@ class MainWindow:
     
     def _toggle_pause(self):
         self.is_paused = not self.is_paused
+        if self.pipeline:
+            self.pipeline.set_paused(self.is_paused)
         if self.is_paused:
             self._update_status("已暂停", "orange")
             self.logger.info("识别已暂停")
@@ -244,103 +290,12 @@ class MainWindow:
             self.logger.info("鼠标控制已开启")
             self.controls_panel.update_mouse_status(True)
         else:
+            if self.cursor_output:
+                self.cursor_output.reset()
             self.mouse_controller.release_all_buttons()
             self.logger.info("鼠标控制已关闭")
             self.controls_panel.update_mouse_status(False)
     
-    def _create_advanced_filter(self):
-        return {
-            'positions': deque(maxlen=6),
-            'weights': [0.3, 0.25, 0.2, 0.15, 0.07, 0.03]
-        }
-    
-    def _create_velocity_filter(self):
-        return {
-            'velocities': deque(maxlen=8),
-            'accelerations': deque(maxlen=6)
-        }
-    
-    def _assess_stability(self, x: float, y: float) -> bool:
-        self.stability_window.append((x, y, time.perf_counter()))
-        
-        if len(self.stability_window) < self.min_stable_frames:
-            return False
-        recent_positions = list(self.stability_window)[-self.min_stable_frames:]
-        displacements = []
-        
-        for i in range(1, len(recent_positions)):
-            dx = recent_positions[i][0] - recent_positions[i-1][0]
-            dy = recent_positions[i][1] - recent_positions[i-1][1]
-            displacement = math.sqrt(dx*dx + dy*dy)
-            displacements.append(displacement)
-        avg_displacement = sum(displacements) / len(displacements)
-        return avg_displacement < self.jitter_threshold
-    def _predict_position(self, current_x: float, current_y: float, timestamp: float) -> Tuple[float, float]:
-        self.position_history.append((current_x, current_y, timestamp))
-        if len(self.position_history) > self.history_size:
-            self.position_history.pop(0)
-        
-        if len(self.position_history) >= 3:
-            if len(self.position_history) >= 6:
-                positions = list(self.position_history)[-6:]
-                velocities = []
-                for i in range(1, len(positions)):
-                    dx = positions[i][0] - positions[i-1][0]
-                    dy = positions[i][1] - positions[i-1][1]
-                    velocities.append((dx, dy))
-                accelerations = []
-                for i in range(1, len(velocities)):
-                    ddx = velocities[i][0] - velocities[i-1][0]
-                    ddy = velocities[i][1] - velocities[i-1][1]
-                    accelerations.append((ddx, ddy))
-                last_pos = positions[-1]
-                last_vel = velocities[-1]
-                last_acc = accelerations[-1] if accelerations else (0, 0)
-                
-                predicted_x = last_pos[0] + last_vel[0] + last_acc[0] * self.prediction_coefficient * 0.7
-                predicted_y = last_pos[1] + last_vel[1] + last_acc[1] * self.prediction_coefficient * 0.7
-            else:
-                # three points
-                p1, p2, p3 = list(self.position_history)[-3:]
-                dx1 = p2[0] - p1[0]
-                dy1 = p2[1] - p1[1]
-                dx2 = p3[0] - p2[0]
-                dy2 = p3[1] - p2[1]
-                ddx = dx2 - dx1
-                ddy = dy2 - dy1
-                predicted_x = p3[0] + dx2 + ddx * self.prediction_coefficient * 0.8
-                predicted_y = p3[1] + dy2 + ddy * self.prediction_coefficient * 0.8
-        else:
-            predicted_x, predicted_y = current_x, current_y
-        
-        return predicted_x, predicted_y
-    
-    def _apply_advanced_smoothing(self, x: float, y: float, timestamp: float) -> Tuple[float, float]:
-        self.smoothing_filter['positions'].append((x, y, timestamp))
-        if len(self.smoothing_filter['positions']) >= 3:
-            weighted_x = 0
-            weighted_y = 0
-            positions = list(self.smoothing_filter['positions'])
-            weights_to_use = self.smoothing_filter['weights'][:len(positions)]
-            weight_sum = sum(weights_to_use)
-            
-            for i, (pos_x, pos_y, _) in enumerate(positions):
-                if i < len(weights_to_use):
-                    weight = weights_to_use[i] / weight_sum
-                    weighted_x += pos_x * weight
-                    weighted_y += pos_y * weight
-            return weighted_x, weighted_y
-        else:
-            return x, y
-    def _apply_conservative_smoothing(self, x: float, y: float) -> Tuple[float, float]:
-        if self.last_result_cache:
-            last_x, last_y = self.last_result_cache
-            max_change = 0.02  # max change allowed 2%
-            dx = max(-max_change, min(max_change, x - last_x))
-            dy = max(-max_change, min(max_change, y - last_y))
-            return last_x + dx, last_y + dy
-        else:
-            return x, y
     def _recognition_loop(self):
         target_fps = 60
         frame_interval = 1.0 / target_fps
@@ -355,19 +310,60 @@ class MainWindow:
                 if elapsed < frame_interval:
                     time.sleep(frame_interval - elapsed)
                 last_frame_time = time.time()
-                frame, gesture, hand_landmarks = self.hand_detector.process_frame()
+                frame, gesture, hand_landmarks = self.hand_detector.process_frame(wait=frame_interval)
                 if frame is not None:
-                    self.preview_panel.update_preview(frame, hand_landmarks)
+                    self.preview_panel.update_preview(frame, hand_landmarks, self.hand_detector.mirror_landmarks)
+                    if self.hand_detector.result_pending:
+                        # LIVE_STREAM 结果尚未返回，不是手势变化
+                        continue
                     if self._should_process_gesture(gesture):
                         self._process_gesture_change(gesture, hand_landmarks)
+                    self._process_temporal_events(
+                        self.hand_detector.gesture_recognizer.pop_temporal_events(), hand_landmarks
+                    )
             except Exception as e:
                 self.logger.error(f"识别循环出错: {e}")
                 if self.debug_mode:
                     print(f"[ERROR] 识别循环异常: {e}")
                 time.sleep(0.01)
     
+    def _join_recognition_thread(self, timeout: float = 2.0):
+        """识别线程仍在使用摄像头缓冲区和推理进程的共享内存，必须先退出再 cleanup"""
+        thread = self.recognize_thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+            if thread.is_alive():
+                self.logger.error("识别线程未能在超时内退出")
+        self.recognize_thread = None
+    
+    def _stop_pipeline(self):
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
+    
+    def _pipeline_act(self, item):
+        if item['result_pending']:
+            return item
+        if self._should_process_gesture(item['gesture']):
+            self._process_gesture_change(item['gesture'], item['hand_landmarks'])
+        self._process_temporal_events(item['events'], item['hand_landmarks'])
+        return item
+    
+    def _pipeline_render(self, item):
+        self.preview_panel.update_preview(item['frame'], item['hand_landmarks'], self.hand_detector.mirror_landmarks)
+        return item
+    
     def _should_process_gesture(self, current_gesture):
         current_time = time.time()
+        if current_gesture in CLICK_CHANNELS:
+            recognizer = self.hand_detector.gesture_recognizer
+            if recognizer.temporal_gestures and recognizer.temporal.dragging:
+                self.suppress_drag_clicks = True
+            if self.suppress_drag_clicks:
+                self.current_gesture = current_gesture
+                return False
+        else:
+            self.suppress_drag_clicks = False
         if current_gesture != self.current_gesture:
             self.gesture_change_time = current_time
             self.current_gesture = current_gesture
@@ -378,7 +374,7 @@ class MainWindow:
     
     def _process_gesture_change(self, gesture, hand_landmarks):
         current_time = time.time()
-        landmark_count = len(hand_landmarks.landmark) if hand_landmarks else 0
+        landmark_count = len(hand_landmarks) if hand_landmarks is not None else 0
         self.preview_panel.update_gesture_display(gesture, landmark_count)
         if self.debug_mode:
             print(f"[GESTURE CHANGE] {self.previous_gesture} → {gesture}")
@@ -394,6 +390,9 @@ class MainWindow:
             }
             
             cooldown = cooldown_times.get(gesture, 0.1)
+            if gesture in ("鼠标点击", "鼠标右键") and self.hand_detector.gesture_recognizer.edge_clicks:
+                # 边沿触发每次捏合只提交一次，不需要冷却
+                cooldown = 0.0
             last_execution = self.last_gesture_execution.get(gesture, 0)
             if current_time - last_execution >= cooldown:
                 self._execute_gesture_action(gesture, hand_landmarks,self.mouse_control_enabled)
@@ -404,18 +403,37 @@ class MainWindow:
         else:
             self._execute_gesture_action(gesture, hand_landmarks,self.mouse_control_enabled)
         self.previous_gesture = gesture
+    def _process_temporal_events(self, events, hand_landmarks):
+        recognizer = self.hand_detector.gesture_recognizer
+        for event in events:
+            gesture = event['gesture']
+            self.preview_panel.update_gesture_display(gesture, len(hand_landmarks) if hand_landmarks is not None else 0)
+            if self.debug_mode:
+                print(f"[TEMPORAL] {gesture} 判定延迟 {event['latency'] * 1000:.0f} ms")
+            if gesture == "拖拽结束":
+                self.mouse_controller.release_all_buttons()
+            elif not self.mouse_control_enabled:
+                continue
+            elif gesture == "拖拽开始":
+                self._handle_mouse_action(gesture, hand_landmarks)
+            elif gesture == "双指捏合" and not recognizer.edge_clicks:
+                # 边沿点击时第二次捏合本身会点击一次，系统自然识别为双击
+                self._handle_mouse_action(gesture, hand_landmarks)
+        # 拖拽期间原始判定是点击而不是移动，光标在这里跟手
+        if self.mouse_control_enabled and recognizer.temporal.dragging and hand_landmarks is not None:
+            self._handle_mouse_movement(hand_landmarks)
+    
     def _execute_gesture_action(self, gesture, hand_landmarks,mouse_control_enabled):
         if mouse_control_enabled:
             try:
                 if gesture == "鼠标移动":
                     self._handle_mouse_movement(hand_landmarks)
                 elif gesture in ["鼠标点击", "鼠标右键", "上滚轮", "下滚轮"]:
-                    self._handle_mouse_action(gesture)
+                    self._handle_mouse_action(gesture, hand_landmarks)
                 elif gesture == "握拳":
                     self._handle_fist_gesture()
                 else:
-                    hand_center = self.hand_detector.gesture_recognizer.get_hand_center()
-                    self.mouse_controller.handle_gesture(gesture, hand_center)
+                    self.mouse_controller.handle_gesture(gesture, self._hand_center(hand_landmarks))
                     
                 if self.debug_mode:
                     print(f"[EXECUTED] {gesture} 执行完成")
@@ -430,23 +448,38 @@ class MainWindow:
             except Exception as e:
                 if self.debug_mode:
                     print(f"[ERROR] 执行 {gesture} 失败: {e}")
+    def _hand_center(self, hand_landmarks):
+        # 流水线模式下执行阶段与识别阶段不在同一线程，位置必须取自本帧关键点
+        if hand_landmarks is None:
+            return None
+        return self.hand_detector.gesture_recognizer.get_hand_center(hand_landmarks)
+    
     def _handle_mouse_movement(self, hand_landmarks):
-        hand_center = self.hand_detector.gesture_recognizer.get_hand_center()
+        hand_center = self._hand_center(hand_landmarks)
         if hand_center:
-            point5_x, point5_y = hand_center
-            screen_width, screen_height = 1920, 1080
+            timestamp = getattr(hand_landmarks, 'timestamp', 0.0) or time.perf_counter()
+            point5_x, point5_y = self.cursor_filter.filter(hand_center[0], hand_center[1], timestamp)
+            if self.cursor_predictor is not None:
+                self.cursor_predictor.update(point5_x, point5_y, timestamp)
+                self.cursor_predictor.observe_latency(time.perf_counter() - timestamp)
+                point5_x, point5_y = self.cursor_predictor.predict()
+            screen_width = self.mouse_controller.screen_width
+            screen_height = self.mouse_controller.screen_height
             screen_x = int(point5_x * screen_width)
             screen_y = int(point5_y * screen_height)
             screen_x = max(0, min(screen_width, screen_x))
             screen_y = max(0, min(screen_height, screen_y))
-            self.mouse_controller.mouse.position = (screen_x, screen_y)
+            cursor_output = self.cursor_output
+            if cursor_output:
+                cursor_output.submit(screen_x, screen_y, timestamp)
+            else:
+                self.mouse_controller.move_to((screen_x, screen_y))
             if self.debug_mode:
                 print(f"[MOUSE MOVE] ({point5_x:.3f}, {point5_y:.3f}) → ({screen_x}, {screen_y})")
     
-    def _handle_mouse_action(self, gesture):
-        hand_center = self.hand_detector.gesture_recognizer.get_hand_center()
+    def _handle_mouse_action(self, gesture, hand_landmarks=None):
         try:
-            self.mouse_controller.handle_gesture(gesture, hand_center)
+            self.mouse_controller.handle_gesture(gesture, self._hand_center(hand_landmarks))
         except Exception as e:
             if self.debug_mode:
                 print(f"[MOUSE ACTION ERROR] {gesture}: {e}")
@@ -458,7 +491,7 @@ class MainWindow:
     
     def _safe_update_preview(self, frame, gesture, hand_landmarks):
         try:
-            self.preview_panel.update_preview(frame, hand_landmarks)
+            self.preview_panel.update_preview(frame, hand_landmarks, self.hand_detector.mirror_landmarks)
         except Exception as e:
             if self.debug_mode:
                 print(f"[ERROR] 预览更新出错: {e}")
@@ -468,10 +501,76 @@ class MainWindow:
             self.config_manager.settings.detection_confidence.get(),
             self.config_manager.settings.tracking_confidence.get()
         )
+        self._update_cursor_filter()
+    
+    def _init_cursor_output(self):
+        settings = self.config_manager.settings
+        self._stop_cursor_output()
+        if not settings.cursor_output_thread.get():
+            return
+        try:
+            self.cursor_output = CursorOutputThread(
+                self._set_cursor_position,
+                rate=settings.cursor_output_rate.get(),
+                mode=settings.cursor_output_mode.get()
+            )
+            self.cursor_output.start()
+        except (ValueError, tk.TclError) as e:
+            self.cursor_output = None
+            self.logger.error(f"光标输出线程配置无效: {e}")
+    
+    def _stop_cursor_output(self):
+        if self.cursor_output:
+            self.cursor_output.stop()
+            self.cursor_output = None
+    
+    def _set_cursor_position(self, position):
+        self.mouse_controller.move_to(position)
+    
+    def _update_cursor_filter(self):
+        self.cursor_filter.update_parameters(
+            min_cutoff=self.config_manager.settings.cursor_min_cutoff.get(),
+            beta=self.config_manager.settings.cursor_beta.get()
+        )
+    
+    def _init_cursor_predictor(self):
+        settings = self.config_manager.settings
+        self.cursor_predictor = None
+        if not settings.cursor_prediction.get():
+            return
+        try:
+            self.cursor_predictor = KalmanCursorPredictor(
+                model=settings.cursor_prediction_model.get(),
+                process_noise=settings.cursor_process_noise.get(),
+                measurement_noise=settings.cursor_measurement_noise.get(),
+                horizon=settings.cursor_prediction_horizon.get()
+            )
+        except ValueError as e:
+            self.logger.error(f"光标预测配置无效: {e}")
     
     def _update_gesture_display(self, gesture: str):
         self.current_gesture = gesture
     
+    def _schedule_screen_size_sync(self, *_):
+        # 切换分辨率预设会先后写宽、高，两次写入合并到空闲时同步一次，不会用到只改了一半的尺寸
+        if not self._screen_size_pending:
+            self._screen_size_pending = True
+            self.root.after_idle(self._apply_screen_size)
+    
+    def _apply_screen_size(self):
+        self._screen_size_pending = False
+        settings = self.config_manager.settings
+        try:
+            width, height = settings.screen_width.get(), settings.screen_height.get()
+        except tk.TclError:
+            return
+        controller = self.mouse_controller
+        if width <= 0 or height <= 0 or (width, height) == (controller.screen_width, controller.screen_height):
+            return
+        controller.update_screen_size(width, height)
+        if self.debug_mode:
+            print(f"[SCREEN] 光标映射尺寸: {width} x {height}")
+    
     def _update_resolution_display(self):
         settings = self.config_manager.settings
         width = settings.screen_width.get()
@@ -496,6 +595,25 @@ class MainWindow:
         else:
             messagebox.showerror("error", "loading config failed")
     
+    def _toggle_recording(self):
+        recorder = self.hand_detector.recorder
+        if not recorder.is_recording:
+            label = simpledialog.askstring("录制关键点", "手势标注（用于训练模板分类器，可留空）:", parent=self.root)
+            if label is None:
+                return
+            recorder.start(label.strip())
+            self.file_menu.entryconfig(self.record_menu_index, label="停止录制关键点")
+            self.status_bar.config(text="正在录制关键点...")
+            return
+        recorder.stop()
+        self.file_menu.entryconfig(self.record_menu_index, label="开始录制关键点")
+        try:
+            path = recorder.save()
+            messagebox.showinfo("录制完成", f"已保存 {len(recorder)} 帧到\n{path}")
+            self.logger.info(f"关键点录制已保存: {path}")
+        except Exception as e:
+            messagebox.showerror("error", f"保存录制失败: {e}")
+    
     def _load_config_dialog(self):
         if self.config_manager.load_config():
             messagebox.showinfo("success", "successfully loaded config")
@@ -527,6 +645,151 @@ class MainWindow:
         """
         messagebox.showinfo("使用帮助", help_text)
     
+    def get_debug_stats(self) -> dict:
+        stats = self.hand_detector.get_debug_stats()
+        stats['preview_pool'] = self.preview_panel.frame_pool.get_stats()
+        stats['cursor_filter'] = self.cursor_filter.get_stats()
+        if self.cursor_predictor is not None:
+            stats['cursor_predictor'] = self.cursor_predictor.get_stats()
+        if self.cursor_output:
+            stats['cursor_output'] = self.cursor_output.get_stats()
+        stats['input_dispatch'] = self.mouse_controller.get_dispatch_stats()
+        if self.pipeline:
+            stats['pipeline'] = self.pipeline.get_stats()
+        return stats
+    
+    def _show_debug_stats(self):
+        stats = self.get_debug_stats()
+        capture = stats['capture']
+        lines = [
+            f"推理后端: {stats['backend']}",
+            f"采集模式: {'线程' if capture['threaded'] else '同步'}",
+            f"采集帧率: {capture['capture_fps']:.1f} fps",
+            f"已采集/已取用: {capture['captured_frames']} / {capture['delivered_frames']}",
+            f"丢弃过期帧: {capture['dropped_frames']} ({capture['drop_rate']:.1%})",
+            f"跳过重复帧: {stats['skipped_duplicates']} (驱动重复返回 {capture['repeated_frames']})",
+            "",
+            "帧缓冲池 (每帧新分配次数 / 稳定期峰值 / 累计):"
+        ]
+        for pool in (capture['frame_pool'], stats['detector_pool'], stats['preview_pool']):
+            lines.append(
+                f"  {pool['pool']}: {pool['last_frame_allocations']} / "
+                f"{pool['max_steady_frame_allocations']} / {pool['total_allocations']}"
+                f"  ({pool['buffers']} 个缓冲区, {pool['buffer_bytes'] / 1024 / 1024:.1f} MB)"
+            )
+        if 'pipeline' in stats:
+            pipeline = stats['pipeline']
+            lines += ["", f"流水线端到端延迟: {pipeline['avg_latency_ms']:.1f} ms (平均)"]
+            for stage in pipeline['stages']:
+                lines.append(
+                    f"  {stage['stage']}: {stage['throughput_fps']:.1f} fps, {stage['avg_stage_ms']:.1f} ms, "
+                    f"队列 {stage['queue_depth']}/{stage['max_queue_depth']}, 丢弃 {stage['queue_dropped']}"
+                )
+        roi = stats.get('roi')
+        if roi and roi['enabled']:
+            lines += [
+                "",
+                f"裁剪跟踪: 裁剪 {roi['roi_frames']} 帧 (平均边长 {roi['avg_crop_size']:.0f} px), "
+                f"整帧 {roi['full_frames']} 帧",
+                f"  跟丢回退 {roi['fallbacks']} ({roi['fallback_rate']:.1%}), "
+                f"推理像素占比 {roi['input_pixel_ratio']:.1%}"
+            ]
+        keyframes = stats.get('keyframes')
+        if keyframes:
+            lines += [
+                "",
+                f"关键帧推理: 间隔 {keyframes['keyframe_interval']}{' (自适应)' if keyframes['adaptive'] else ''}, "
+                f"推理 {keyframes['keyframes']} 帧, 光流传播 {keyframes['propagated_frames']} 帧, "
+                f"跟丢 {keyframes['lost_tracks']}",
+                f"  推理 {keyframes['avg_inference_ms']:.1f} ms, 传播 {keyframes['avg_propagation_ms']:.1f} ms, "
+                f"漂移 平均 {keyframes['avg_drift_px']:.1f} px / 最大 {keyframes['max_drift_px']:.1f} px"
+            ]
+        motion_gate = stats.get('motion_gate')
+        if motion_gate:
+            lines += [
+                "",
+                f"运动门控: {'空闲' if motion_gate['state'] == 'idle' else '全速'}, "
+                f"运动量 {motion_gate['motion_level']:.1f}",
+                f"  推理占空比 {motion_gate['duty_cycle']:.1%}, 跳过 {motion_gate['skipped_frames']} 帧, "
+                f"空闲时间 {motion_gate['idle_ratio']:.1%}"
+            ]
+        debounce = stats.get('debounce')
+        if debounce:
+            lines += ["", "去抖延迟 (进入 / 释放):"]
+            for gesture, delay in debounce.items():
+                line = f"  {gesture}: {delay['enter_frames']} / {delay['release_frames']} 帧"
+                if 'enter_seconds' in delay:
+                    line += f" ({delay['enter_seconds'] * 1000:.0f} / {delay['release_seconds'] * 1000:.0f} ms)"
+                lines.append(line)
+        click_trigger = stats.get('click_trigger')
+        if click_trigger:
+            lines.append(
+                f"边沿点击: 左键 {click_trigger['fired']['鼠标点击']} 次, 右键 {click_trigger['fired']['鼠标右键']} 次, "
+                f"速度不足 {click_trigger['rejected_slow']} 次 (去抖补发 {sum(click_trigger['fallback'].values())} 次)"
+            )
+        temporal = stats.get('temporal')
+        if temporal:
+            lines += ["", "时序手势 (次数 / 平均判定延迟 / 最大):"]
+            for name, label in (('double_pinch', "双指捏合"), ('drag', "拖拽"), ('swipe', "滑动")):
+                detector = temporal[name]
+                lines.append(
+                    f"  {label}: {detector['events']} / {detector['avg_latency_ms']:.0f} ms / "
+                    f"{detector['max_latency_ms']:.0f} ms"
+                )
+        cursor_filter = stats['cursor_filter']
+        lines += [
+            "",
+            f"光标滤波: 最小截止 {cursor_filter['min_cutoff']:.2f} Hz, 速度系数 {cursor_filter['beta']:.1f}, "
+            f"当前截止 {cursor_filter['cutoff_hz']:.1f} Hz"
+        ]
+        cursor_predictor = stats.get('cursor_predictor')
+        if cursor_predictor:
+            lines.append(
+                f"光标预测 ({cursor_predictor['model']}): 实测延迟 {cursor_predictor['latency_ms']:.1f} ms, "
+                f"外推 {cursor_predictor['horizon_ms']:.1f} ms"
+            )
+        cursor_output = stats.get('cursor_output')
+        if cursor_output:
+            lines += [
+                f"光标输出 ({cursor_output['mode']}): 目标 {cursor_output['target_rate_hz']:.0f} Hz, "
+                f"实际 {cursor_output['tick_rate_hz']:.1f} Hz, 写入 {cursor_output['output_rate_hz']:.1f} Hz",
+                f"  检测样本 {cursor_output['sample_rate_hz']:.1f} Hz, 超时周期 {cursor_output['late_ticks']}, "
+                f"每次写入 {cursor_output['avg_write_ms']:.2f} ms"
+            ]
+        dispatch = stats['input_dispatch']
+        lines += [
+            "",
+            f"鼠标指令注入 ({dispatch['backend']}): {'异步' if dispatch['asynchronous'] else '同步'}, "
+            f"队列 {dispatch['queue_depth']} (峰值 {dispatch['max_queue_depth']})",
+            "  (入队 / 合并 / 执行 / 平均注入延迟 / 最大 / 平均执行耗时):"
+        ]
+        for name, label in (("move", "移动"), ("click", "点击"), ("press", "按下"), ("release", "松开"), ("scroll", "滚轮")):
+            command = dispatch['commands'][name]
+            if command['enqueued']:
+                lines.append(
+                    f"  {label}: {command['enqueued']} / {command['coalesced']} / {command['executed']} / "
+                    f"{command['avg_latency_ms']:.1f} ms / {command['max_latency_ms']:.1f} ms / {command['avg_exec_ms']:.2f} ms"
+                )
+        live_stream = stats.get('live_stream')
+        if live_stream:
+            lines += [
+                "",
+                f"LIVE_STREAM: 提交 {live_stream['submitted']}, 完成 {live_stream['completed']}, "
+                f"被跳过 {live_stream['skipped']}",
+                f"  本帧结果 {live_stream['matched']}, 沿用旧结果 {live_stream['stale']}, "
+                f"平均延迟 {live_stream['avg_latency_ms']:.1f} ms"
+            ]
+        inference = stats.get('inference')
+        if inference:
+            lines += [
+                "",
+                f"推理进程: {inference['workers']} 个, 已处理 {inference['frames']} 帧, 超时 {inference['timeouts']}, "
+                f"槽位占满丢帧 {inference['busy_drops']}",
+                f"  往返 {inference['avg_roundtrip_ms']:.1f} ms = 推理 {inference['avg_inference_ms']:.1f} ms"
+                f" + 进程间通信 {inference['avg_ipc_ms']:.1f} ms, 额外拷贝 {inference['frame_copies']} 次"
+            ]
+        messagebox.showinfo("性能统计", "\n".join(lines))
+    
     def _show_about(self):
         """显示关于信息"""
         about_text = """
@@ -552,11 +815,14 @@ GitHub: https://github.com/KrisitVvv/
             # 停止所有活动
             self.is_running = False
             self.is_paused = False
+            self._stop_pipeline()
+            self._join_recognition_thread()
+            self._stop_cursor_output()
             
             # 清理资源
             self.hand_detector.cleanup()
             self.keyboard_listener.stop()
-            self.mouse_controller.release_all_buttons()
+            self.mouse_controller.shutdown()
             
             self.logger.info("资源已释放，程序退出")
             self.root.quit()
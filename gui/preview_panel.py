@@ -5,8 +5,10 @@ from tkinter import ttk
 from PIL import Image, ImageTk
 import cv2
 import numpy as np
+import threading
 import time
 from typing import Callable, Optional, Any
+from utils.frame_pool import FramePool
 class PreviewPanel:
     def __init__(self, parent: tk.Widget, gesture_callback: Callable[[str], None]):
         self.parent = parent
@@ -15,17 +17,28 @@ class PreviewPanel:
         self.hand_landmarks = None
         self.last_update_time = 0
         self.min_update_interval = 1/30 
-        self.pending_update = None
+        self.frame_pool = FramePool("preview")
+        self.display_index = 0
+        # 识别线程只把准备好的显示帧和手势放进邮箱，由 Tk 线程定时取出显示，识别线程不调用任何 Tk 接口
+        self._mailbox_lock = threading.Lock()
+        self._pending_display: Optional[tuple] = None
+        self._pending_gesture: Optional[tuple] = None
+        self._converting_index: Optional[int] = None
+        self._canvas_size = (0, 0)
+        self._show_skeleton = True
         self._build_preview_area()
         self._build_status_area()
+        self.preview_canvas.after(int(self.min_update_interval * 1000), self._poll_updates)
     def _build_preview_area(self):
         preview_frame = ttk.LabelFrame(self.parent, text="摄像头预览", padding="5")
         preview_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         self.preview_canvas = tk.Canvas(preview_frame, bg='black')
         self.preview_canvas.pack(fill=tk.BOTH, expand=True)
+        self.preview_canvas.bind('<Configure>', self._on_canvas_configure)
         preview_ctrl_frame = ttk.Frame(preview_frame)
         preview_ctrl_frame.pack(fill=tk.X, pady=(5, 0))
         self.show_skeleton_var = tk.BooleanVar(value=True)
+        self.show_skeleton_var.trace_add('write', self._on_show_skeleton_change)
         ttk.Checkbutton(preview_ctrl_frame, text="显示骨架", variable=self.show_skeleton_var).pack(side=tk.LEFT, padx=10)
     def _build_status_area(self):
         status_frame = ttk.LabelFrame(self.parent, text="状态信息", padding="5")
@@ -41,62 +54,98 @@ class PreviewPanel:
         self.landmark_count_label = ttk.Label(skeleton_frame, text="0", foreground="gray")
         self.landmark_count_label.pack(side=tk.LEFT)
     
-    def update_preview(self, frame, hand_landmarks=None):
-        current_time = time.time()
-        if current_time - self.last_update_time >= self.min_update_interval:
-            self._perform_immediate_update(frame, hand_landmarks, current_time)
-        else:
-            self._schedule_delayed_update(frame, hand_landmarks, current_time)
+    def _on_canvas_configure(self, event):
+        self._canvas_size = (event.width, event.height)
     
-    def _perform_immediate_update(self, frame, hand_landmarks, current_time):
+    def _on_show_skeleton_change(self, *args):
+        self._show_skeleton = bool(self.show_skeleton_var.get())
+    
+    def update_preview(self, frame_rgb, hand_landmarks=None, mirror: bool = False):
+        """可在任意线程调用：立即缩放到显示分辨率（帧缓冲区会被下一帧复用），显示交给 Tk 线程"""
+        self.hand_landmarks = hand_landmarks
+        with self._mailbox_lock:
+            busy = {self._converting_index}
+            if self._pending_display is not None:
+                busy.add(self._pending_display[0])
+        # 三个显示缓冲区轮流使用，跳过等待显示和正在转换的两个
+        index = next(i for i in ((self.display_index + k) % 3 for k in (1, 2, 3)) if i not in busy)
+        display_frame = self._prepare_display_frame(frame_rgb, hand_landmarks, mirror, index)
+        if display_frame is None:
+            return
+        self.display_index = index
+        with self._mailbox_lock:
+            self._pending_display = (index, display_frame)
+    
+    def _prepare_display_frame(self, frame_rgb, hand_landmarks, mirror: bool, index: int):
+        try:
+            canvas_width, canvas_height = self._canvas_size
+            if canvas_width <= 1 or canvas_height <= 1:
+                return None
+            frame_height, frame_width = frame_rgb.shape[:2]
+            img_ratio = frame_width / frame_height
+            canvas_ratio = canvas_width / canvas_height
+            if img_ratio > canvas_ratio:
+                new_width = canvas_width
+                new_height = int(canvas_width / img_ratio)
+            else:
+                new_height = canvas_height
+                new_width = int(canvas_height * img_ratio)
+            display_frame = self.frame_pool.get(
+                f"display_{index}", (new_height, new_width, 3), frame_rgb.dtype
+            )
+            cv2.resize(frame_rgb, (new_width, new_height), dst=display_frame, interpolation=cv2.INTER_AREA)
+            if mirror:
+                # 只在显示分辨率上镜像，关键点已由检测器镜像
+                cv2.flip(display_frame, 1, dst=display_frame)
+            if self._show_skeleton and hand_landmarks is not None:
+                self._draw_hand_skeleton(display_frame, hand_landmarks)
+            self.frame_pool.end_frame()
+            return display_frame
+        except Exception as e:
+            print(f"准备预览帧出错: {e}")
+            return None
+    
+    def _poll_updates(self):
+        """Tk 线程中定时执行，显示邮箱中最新的帧和手势"""
+        try:
+            with self._mailbox_lock:
+                pending_display, self._pending_display = self._pending_display, None
+                pending_gesture, self._pending_gesture = self._pending_gesture, None
+                if pending_display is not None:
+                    self._converting_index = pending_display[0]
+            if pending_display is not None:
+                self._perform_immediate_update(pending_display[1], time.time())
+                with self._mailbox_lock:
+                    self._converting_index = None
+            if pending_gesture is not None:
+                self._apply_gesture_display(*pending_gesture)
+        finally:
+            self.preview_canvas.after(int(self.min_update_interval * 1000), self._poll_updates)
+    
+    def _perform_immediate_update(self, display_frame, current_time):
         try:
-            self.hand_landmarks = hand_landmarks
             self.last_update_time = current_time
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            if self.show_skeleton_var.get() and hand_landmarks is not None:
-                frame_rgb = self._draw_hand_skeleton(frame_rgb, hand_landmarks)
-            img = Image.fromarray(frame_rgb)
             canvas_width = self.preview_canvas.winfo_width()
             canvas_height = self.preview_canvas.winfo_height()
-            
-            if canvas_width > 1 and canvas_height > 1:
-                img_ratio = img.width / img.height
-                canvas_ratio = canvas_width / canvas_height
-                if img_ratio > canvas_ratio:
-                    new_width = canvas_width
-                    new_height = int(canvas_width / img_ratio)
-                else:
-                    new_height = canvas_height
-                    new_width = int(canvas_height * img_ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                x_offset = (canvas_width - new_width) // 2
-                y_offset = (canvas_height - new_height) // 2
-                photo = ImageTk.PhotoImage(img)
-                self.preview_canvas.delete("preview_image")
-                self.preview_canvas.create_image(
-                    x_offset, y_offset, 
-                    anchor=tk.NW, 
-                    image=photo,
-                    tags="preview_image"
-                )
-                self.preview_canvas.image = photo
-                if self.pending_update:
-                    self.preview_canvas.after_cancel(self.pending_update)
-                    self.pending_update = None
+            display_height, display_width = display_frame.shape[:2]
+            x_offset = (canvas_width - display_width) // 2
+            y_offset = (canvas_height - display_height) // 2
+            photo = ImageTk.PhotoImage(Image.fromarray(display_frame))
+            self.preview_canvas.delete("preview_image")
+            self.preview_canvas.create_image(
+                x_offset, y_offset, 
+                anchor=tk.NW, 
+                image=photo,
+                tags="preview_image"
+            )
+            self.preview_canvas.image = photo
         except Exception as e:
             print(f"更新预览出错: {e}")
-    
-    def _schedule_delayed_update(self, frame, hand_landmarks, current_time):
-        if self.pending_update:
-            self.preview_canvas.after_cancel(self.pending_update)
-        delay = int((self.min_update_interval - (current_time - self.last_update_time)) * 1000)
-        self.pending_update = self.preview_canvas.after(delay, 
-            lambda: self._perform_immediate_update(frame, hand_landmarks, time.time()))
 
     def _draw_hand_skeleton(self, frame_rgb, hand_landmarks):
+        """直接在显示分辨率的 RGB 帧上原地绘制"""
         try:
-            frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-            h, w = frame.shape[:2]
+            h, w = frame_rgb.shape[:2]
             connections = [
                 (0, 1), (1, 2), (2, 3), (3, 4), 
                 (0, 5), (5, 6), (6, 7), (7, 8), 
@@ -107,34 +156,38 @@ class PreviewPanel:
                 (4, 8), (8, 12), (12, 16), (16, 20)
             ]
             
+            # 一次换算成显示分辨率下的整数像素坐标
+            points = (hand_landmarks.landmarks[:, :2] * (w, h)).astype(np.int32).tolist()
             for connection in connections:
                 start_idx, end_idx = connection
-                if start_idx < len(hand_landmarks.landmark) and end_idx < len(hand_landmarks.landmark):
-                    start_point = hand_landmarks.landmark[start_idx]
-                    end_point = hand_landmarks.landmark[end_idx]
-                    start_x, start_y = int(start_point.x * w), int(start_point.y * h)
-                    end_x, end_y = int(end_point.x * w), int(end_point.y * h)
-                    cv2.line(frame, (start_x, start_y), (end_x, end_y), (0, 255, 0), 2, cv2.LINE_AA)
-            for idx, landmark in enumerate(hand_landmarks.landmark):
-                if idx < len(hand_landmarks.landmark):
-                    x, y = int(landmark.x * w), int(landmark.y * h)
+                if start_idx < len(points) and end_idx < len(points):
+                    cv2.line(frame_rgb, tuple(points[start_idx]), tuple(points[end_idx]), (0, 255, 0), 2, cv2.LINE_AA)
+            for idx, (x, y) in enumerate(points):
+                if idx < len(points):
                     if idx in [4, 8, 12, 16, 20]: 
-                        color = (0, 0, 255) 
+                        color = (255, 0, 0) 
                         radius = 4
                     elif idx == 0: 
-                        color = (255, 0, 0)
+                        color = (0, 0, 255)
                         radius = 6
                     else: 
-                        color = (0, 255, 255) 
+                        color = (255, 255, 0) 
                         radius = 3
-                    cv2.circle(frame, (x, y), radius, color, -1, cv2.LINE_AA)
-                    cv2.putText(frame, str(idx), (x+5, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 255), 1, cv2.LINE_AA)
-            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    cv2.circle(frame_rgb, (x, y), radius, color, -1, cv2.LINE_AA)
+                    cv2.putText(frame_rgb, str(idx), (x+5, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 255), 1, cv2.LINE_AA)
+            return frame_rgb
         except Exception as e:
             print(f"绘制骨架出错: {e}")
             return frame_rgb
     
     def update_gesture_display(self, gesture: str, landmark_count: int = 0):
+        """可在任意线程调用，标签在 Tk 线程中更新"""
+        with self._mailbox_lock:
+            self._pending_gesture = (gesture, landmark_count)
+        if self.gesture_callback:
+            self.gesture_callback(gesture)
+    
+    def _apply_gesture_display(self, gesture: str, landmark_count: int):
         self.gesture_label.config(text=gesture)
         self.landmark_count_label.config(text=str(landmark_count))
         color_map = {
@@ -144,6 +197,4 @@ class PreviewPanel:
             "手掌张开": "green",
         }
         color = color_map.get(gesture, "black")
-        self.gesture_label.config(foreground=color)
-        if self.gesture_callback:
-            self.gesture_callback(gesture)
\ No newline at end of file
+        self.gesture_label.config(foreground=color)
\ No newline at end of file
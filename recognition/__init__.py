@@ -1,5 +1,8 @@
 from .hand_detector import HandDetector
 from .gesture_recognizer import GestureRecognizer
 from .gesture_processor import GestureProcessor
+from .pipeline import RecognitionPipeline
+from .hand_frame import HandFrame
+from .landmark_recorder import LandmarkRecorder, load_recording
 
-__all__ = ['HandDetector', 'GestureRecognizer', 'GestureProcessor']
\ No newline at end of file
+__all__ = ['HandDetector', 'GestureRecognizer', 'GestureProcessor', 'RecognitionPipeline', 'HandFrame', 'LandmarkRecorder', 'load_recording']
\ No newline at end of file
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+边沿触发点击
+拇指尖与食指尖（左键）或中指尖（右键）的距离越过进入阈值、且以足够速度靠近的那一帧立即提交点击，
+不经过去抖投票；距离重新超过更宽的退出阈值后才再次待命，按住不放不会重复点击。
+靠近速度不够（缓慢、刻意的捏合）或捏合时通道还未待命时，去抖后的手势进入该点击时补发一次，
+同一次捏合只提交一次。
+"""
+
+from typing import Optional
+
+CLICK_CHANNELS = ("鼠标点击", "鼠标右键")
+
+
+class _EdgeChannel:
+    __slots__ = ('armed', 'consumed', 'last_distance', 'last_timestamp')
+
+    def __init__(self):
+        self.armed = False
+        # 本次捏合已经提交过点击，重新待命时清除
+        self.consumed = False
+        self.last_distance: Optional[float] = None
+        self.last_timestamp = 0.0
+
+
+class PinchClickTrigger:
+    def __init__(self, exit_ratio: float = 1.6, min_approach_speed: float = 0.2,
+                 default_frame_period: float = 1.0 / 30):
+        # 退出阈值 = 进入阈值 × exit_ratio；靠近速度单位为归一化坐标/秒
+        self.exit_ratio = exit_ratio
+        self.min_approach_speed = min_approach_speed
+        self.default_frame_period = default_frame_period
+        self.channels = {gesture: _EdgeChannel() for gesture in CLICK_CHANNELS}
+        self.fired = {gesture: 0 for gesture in CLICK_CHANNELS}
+        self.fallback = {gesture: 0 for gesture in CLICK_CHANNELS}
+        self.rejected_slow = 0
+        self.last_stable = "无"
+
+    def reset(self):
+        for channel in self.channels.values():
+            channel.armed = False
+            channel.consumed = False
+            channel.last_distance = None
+        self.last_stable = "无"
+
+    def lost(self):
+        """手丢失：保留待命状态，但不用丢失前的距离计算速度"""
+        for channel in self.channels.values():
+            channel.last_distance = None
+
+    def update(self, raw_gesture: str, distances: dict, enter_threshold: float, timestamp: float,
+               stable_gesture: str = "无") -> Optional[str]:
+        """distances 为 {手势: 对应指尖距离}，stable_gesture 为本帧去抖后的手势，
+        返回本帧提交的点击手势，没有则返回 None"""
+        exit_threshold = enter_threshold * self.exit_ratio
+        event = None
+        for gesture, channel in self.channels.items():
+            distance = distances[gesture]
+            if not channel.armed:
+                if distance > exit_threshold:
+                    channel.armed = True
+                    channel.consumed = False
+            elif raw_gesture == gesture and channel.last_distance is not None:
+                # raw_gesture 已保证距离低于进入阈值且不是握拳
+                dt = timestamp - channel.last_timestamp
+                if dt <= 0:
+                    dt = self.default_frame_period
+                speed = (channel.last_distance - distance) / dt
+                channel.armed = False
+                if speed >= self.min_approach_speed:
+                    self.fired[gesture] += 1
+                    channel.consumed = True
+                    event = gesture
+                else:
+                    self.rejected_slow += 1
+            channel.last_distance = distance
+            channel.last_timestamp = timestamp
+        # 边沿没有提交的捏合，在去抖结果进入点击的那一帧补发；只看进入，去抖释放前松开再待命也不会重复
+        if event is None and stable_gesture in self.channels and stable_gesture != self.last_stable:
+            channel = self.channels[stable_gesture]
+            if not channel.consumed:
+                channel.consumed = True
+                self.fallback[stable_gesture] += 1
+                event = stable_gesture
+        self.last_stable = stable_gesture
+        return event
+
+    def get_stats(self) -> dict:
+        return {
+            'armed': {gesture: channel.armed for gesture, channel in self.channels.items()},
+            'fired': dict(self.fired),
+            'fallback': dict(self.fallback),
+            'rejected_slow': self.rejected_slow
+        }
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+光标坐标滤波 (One Euro Filter, Casiez 等, CHI 2012)
+一阶低通的截止频率随速度自适应: cutoff = min_cutoff + beta × |速度|。
+慢速时截止频率低、抖动被压住，快速移动时截止频率升高、滞后变小。
+平滑系数由相邻两次采样的时间戳算出，帧率变化或丢帧时行为不变；
+两个坐标轴共用同一个速度幅值，斜向移动时两轴的滞后一致。
+坐标为 0~1 的归一化坐标，速度单位为 归一化单位/秒。
+"""
+
+import math
+from typing import Optional, Tuple
+
+
+def smoothing_alpha(cutoff: float, dt: float) -> float:
+    """截止频率 cutoff (Hz)、采样间隔 dt (s) 对应的一阶低通系数"""
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    def __init__(self, min_cutoff: float = 0.5, beta: float = 20.0, d_cutoff: float = 1.0, max_gap: float = 0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        # 速度估计本身的低通截止频率
+        self.d_cutoff = d_cutoff
+        # 两次采样间隔超过 max_gap 秒（手丢失后重新出现）时重新开始，不从旧位置滑过去
+        self.max_gap = max_gap
+        self.last_timestamp: Optional[float] = None
+        self.position: Optional[Tuple[float, float]] = None
+        self.velocity = (0.0, 0.0)
+        self.cutoff = min_cutoff
+
+    def filter(self, x: float, y: float, timestamp: float) -> Tuple[float, float]:
+        """输入一个带采样时间戳的坐标，返回滤波后的坐标"""
+        if self.position is None or timestamp - self.last_timestamp > self.max_gap:
+            self.last_timestamp = timestamp
+            self.position = (x, y)
+            self.velocity = (0.0, 0.0)
+            self.cutoff = self.min_cutoff
+            return self.position
+        dt = timestamp - self.last_timestamp
+        if dt <= 0:
+            # 同一帧重复送入或时间戳倒退
+            return self.position
+        self.last_timestamp = timestamp
+        last_x, last_y = self.position
+        alpha_d = smoothing_alpha(self.d_cutoff, dt)
+        vx = self.velocity[0] + alpha_d * ((x - last_x) / dt - self.velocity[0])
+        vy = self.velocity[1] + alpha_d * ((y - last_y) / dt - self.velocity[1])
+        self.velocity = (vx, vy)
+        self.cutoff = self.min_cutoff + self.beta * math.hypot(vx, vy)
+        alpha = smoothing_alpha(self.cutoff, dt)
+        self.position = (last_x + alpha * (x - last_x), last_y + alpha * (y - last_y))
+        return self.position
+
+    def update_parameters(self, min_cutoff: float = None, beta: float = None, d_cutoff: float = None):
+        if min_cutoff is not None:
+            self.min_cutoff = max(0.01, min_cutoff)
+        if beta is not None:
+            self.beta = max(0.0, beta)
+        if d_cutoff is not None:
+            self.d_cutoff = max(0.01, d_cutoff)
+
+    def reset(self):
+        self.last_timestamp = None
+        self.position = None
+        self.velocity = (0.0, 0.0)
+        self.cutoff = self.min_cutoff
+
+    def get_stats(self) -> dict:
+        return {
+            'min_cutoff': self.min_cutoff,
+            'beta': self.beta,
+            'cutoff_hz': self.cutoff,
+            'speed': math.hypot(*self.velocity)
+        }
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+光标位置的卡尔曼预测
+手掌中心按匀速（或匀加速）模型做卡尔曼滤波，再把估计的状态外推一段时间，
+外推量取实测的 采集→鼠标指令 延迟，使光标领先于滞后的测量、落在手此刻的位置。
+两个坐标轴模型相同，共用协方差矩阵，状态为 (阶数, 2) 矩阵，每帧只有几次小矩阵运算。
+坐标为 0~1 的归一化坐标，时间单位为秒。
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from config.defaults import DEFAULT_MEASUREMENT_NOISE, DEFAULT_PROCESS_NOISE
+
+MODELS = ("velocity", "acceleration")
+
+
+class KalmanCursorPredictor:
+    def __init__(self, model: str = "velocity", process_noise: float = DEFAULT_PROCESS_NOISE,
+                 measurement_noise: float = DEFAULT_MEASUREMENT_NOISE,
+                 horizon: float = 0.0, max_horizon: float = 0.15, max_gap: float = 0.5):
+        if model not in MODELS:
+            raise ValueError(f"未知运动模型: {model}")
+        self.model = model
+        self.order = 2 if model == "velocity" else 3
+        # 白噪声加速度（匀速模型）或加加速度（匀加速模型）的谱密度
+        self.process_noise = process_noise
+        # 关键点测量噪声的标准差
+        self.measurement_noise = measurement_noise
+        # 外推时长，0 表示使用实测延迟
+        self.horizon = horizon
+        self.max_horizon = max_horizon
+        self.max_gap = max_gap
+        self.state: Optional[np.ndarray] = None
+        self.covariance = np.eye(self.order)
+        self.last_timestamp = 0.0
+        # 采集→指令延迟的滑动平均
+        self.latency = 0.0
+        self.latency_samples = 0
+        self.last_horizon = 0.0
+
+    def _transition(self, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        q = self.process_noise
+        if self.order == 2:
+            transition = np.array([[1.0, dt], [0.0, 1.0]])
+            noise = q * np.array([[dt ** 3 / 3, dt ** 2 / 2], [dt ** 2 / 2, dt]])
+        else:
+            transition = np.array([[1.0, dt, dt * dt / 2], [0.0, 1.0, dt], [0.0, 0.0, 1.0]])
+            noise = q * np.array([
+                [dt ** 5 / 20, dt ** 4 / 8, dt ** 3 / 6],
+                [dt ** 4 / 8, dt ** 3 / 3, dt ** 2 / 2],
+                [dt ** 3 / 6, dt ** 2 / 2, dt]
+            ])
+        return transition, noise
+
+    def update(self, x: float, y: float, timestamp: float):
+        """输入一次带采集时间戳的测量"""
+        if self.state is None or timestamp - self.last_timestamp > self.max_gap:
+            self.state = np.zeros((self.order, 2))
+            self.state[0] = (x, y)
+            self.covariance = np.diag([self.measurement_noise ** 2] + [1.0] * (self.order - 1))
+            self.last_timestamp = timestamp
+            return
+        dt = timestamp - self.last_timestamp
+        if dt <= 0:
+            return
+        self.last_timestamp = timestamp
+        transition, noise = self._transition(dt)
+        self.state = transition @ self.state
+        self.covariance = transition @ self.covariance @ transition.T + noise
+        # 只观测位置，H = [1, 0, ...]，卡尔曼增益为协方差第一列 / (P00 + R)
+        gain = self.covariance[:, 0] / (self.covariance[0, 0] + self.measurement_noise ** 2)
+        self.state = self.state + np.outer(gain, np.array([x, y]) - self.state[0])
+        self.covariance = self.covariance - np.outer(gain, self.covariance[0])
+
+    def observe_latency(self, latency: float, alpha: float = 0.1):
+        """记录一次 采集→指令 延迟（秒），horizon 为 0 时按其滑动平均外推"""
+        if latency < 0 or latency > 1.0:
+            return
+        self.latency = latency if self.latency_samples == 0 else self.latency + alpha * (latency - self.latency)
+        self.latency_samples += 1
+
+    def predict(self, horizon: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """外推 horizon 秒后的位置，缺省为设定值或实测延迟；还没有测量时返回 None"""
+        if self.state is None:
+            return None
+        if horizon is None:
+            horizon = self.horizon if self.horizon > 0 else self.latency
+        horizon = max(0.0, min(self.max_horizon, horizon))
+        self.last_horizon = horizon
+        position = self.state[0] + self.state[1] * horizon
+        if self.order == 3:
+            position = position + self.state[2] * horizon * horizon / 2
+        return float(position[0]), float(position[1])
+
+    def filter(self, x: float, y: float, timestamp: float, horizon: Optional[float] = None) -> Tuple[float, float]:
+        self.update(x, y, timestamp)
+        return self.predict(horizon)
+
+    def update_parameters(self, process_noise: float = None, measurement_noise: float = None, horizon: float = None):
+        if process_noise is not None:
+            self.process_noise = max(1e-6, process_noise)
+        if measurement_noise is not None:
+            self.measurement_noise = max(1e-6, measurement_noise)
+        if horizon is not None:
+            self.horizon = max(0.0, min(self.max_horizon, horizon))
+
+    def reset(self):
+        self.state = None
+        self.last_timestamp = 0.0
+
+    def get_stats(self) -> dict:
+        speed = 0.0 if self.state is None else math.hypot(*self.state[1])
+        return {
+            'model': self.model,
+            'latency_ms': self.latency * 1000,
+            'horizon_ms': self.last_horizon * 1000,
+            'speed': speed
+        }
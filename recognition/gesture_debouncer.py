@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+手势去抖
+固定长度环形缓冲区保存最近 window_size 帧的原始手势，逐帧增量维护各手势票数，每帧 O(1)。
+进入/退出滞回: 新手势票数比例达到进入阈值才切换，当前手势票数比例低于退出阈值才释放，
+释放后没有手势达到进入阈值时输出 "无"。
+"""
+
+import math
+from typing import Dict, Optional
+
+CLICK_GESTURES = ("鼠标点击", "鼠标右键", "下滚轮", "上滚轮")
+
+DEFAULT_ENTER_FRACTION = 0.6
+DEFAULT_EXIT_FRACTION = 0.3
+# 点击类和握拳要求的票数更少，响应更快
+DEFAULT_ENTER_FRACTIONS = {**{gesture: 0.3 for gesture in CLICK_GESTURES}, "握拳": 0.2}
+DEFAULT_EXIT_FRACTIONS = {**{gesture: 0.15 for gesture in CLICK_GESTURES}, "握拳": 0.1}
+
+
+class GestureDebouncer:
+    def __init__(self, window_size: int = 8,
+                 enter_fractions: Optional[Dict[str, float]] = None,
+                 exit_fractions: Optional[Dict[str, float]] = None,
+                 default_enter: float = DEFAULT_ENTER_FRACTION,
+                 default_exit: float = DEFAULT_EXIT_FRACTION):
+        self.window_size = max(1, int(window_size))
+        self.enter_fractions = dict(DEFAULT_ENTER_FRACTIONS if enter_fractions is None else enter_fractions)
+        self.exit_fractions = dict(DEFAULT_EXIT_FRACTIONS if exit_fractions is None else exit_fractions)
+        self.default_enter = default_enter
+        self.default_exit = default_exit
+        self.reset()
+
+    def reset(self):
+        self._buffer = [None] * self.window_size
+        self._index = 0
+        self._filled = 0
+        self.counts: Dict[str, int] = {}
+        self.active = "无"
+
+    def enter_fraction(self, gesture: str) -> float:
+        return self.enter_fractions.get(gesture, self.default_enter)
+
+    def exit_fraction(self, gesture: str) -> float:
+        return min(self.exit_fractions.get(gesture, self.default_exit), self.enter_fraction(gesture))
+
+    def update(self, gesture: str) -> str:
+        """加入一帧原始手势，返回去抖后的手势"""
+        counts = self.counts
+        if self._filled == self.window_size:
+            old = self._buffer[self._index]
+            counts[old] -= 1
+        else:
+            self._filled += 1
+        self._buffer[self._index] = gesture
+        self._index = (self._index + 1) % self.window_size
+        counts[gesture] = counts.get(gesture, 0) + 1
+
+        # 窗口未满时直接输出原始手势
+        if self._filled < self.window_size:
+            self.active = gesture
+            return gesture
+
+        size = self.window_size
+        # 有专门进入阈值的手势（点击、握拳）优先
+        if gesture in self.enter_fractions and counts[gesture] / size >= self.enter_fractions[gesture]:
+            self.active = gesture
+            return gesture
+        # 其余手势按多数票进入；票数表只有几种手势，取最大值不随窗口长度增长
+        leader, leader_count = max(counts.items(), key=lambda item: item[1])
+        if leader != self.active and leader_count / size >= self.enter_fraction(leader):
+            self.active = leader
+        elif self.active != "无" and counts.get(self.active, 0) / size < self.exit_fraction(self.active):
+            self.active = "无"
+        return self.active
+
+    def update_fractions(self, enter_fractions: Optional[Dict[str, float]] = None,
+                         exit_fractions: Optional[Dict[str, float]] = None):
+        if enter_fractions:
+            self.enter_fractions.update({gesture: max(0.0, min(1.0, value)) for gesture, value in enter_fractions.items()})
+        if exit_fractions:
+            self.exit_fractions.update({gesture: max(0.0, min(1.0, value)) for gesture, value in exit_fractions.items()})
+
+    def get_delays(self, frame_period: Optional[float] = None) -> Dict[str, dict]:
+        """每种手势引入的去抖延迟
+
+        enter_frames: 窗口被其他手势占满时，连续多少帧该手势才会输出；
+        release_frames: 该手势占满窗口后，连续多少帧其他手势才会被释放（没有其他手势抢先进入时）。
+        给出 frame_period（秒）时同时换算成秒。
+        """
+        size = self.window_size
+        gestures = ("握拳", "鼠标移动") + CLICK_GESTURES
+        delays = {}
+        for gesture in gestures:
+            enter_frames = max(1, math.ceil(self.enter_fraction(gesture) * size - 1e-9))
+            release_frames = math.floor(size - self.exit_fraction(gesture) * size + 1e-9) + 1
+            delays[gesture] = {'enter_frames': enter_frames, 'release_frames': min(release_frames, size)}
+            if frame_period is not None:
+                delays[gesture]['enter_seconds'] = enter_frames * frame_period
+                delays[gesture]['release_seconds'] = delays[gesture]['release_frames'] * frame_period
+        return delays
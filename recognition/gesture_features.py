@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+手势特征提取
+一次 NumPy 运算得到识别所需的全部距离、手指弯曲角和按手掌尺寸归一化的特征，
+输入可以是单帧 (21, 3) 或批量 (N, 21, 3) 关键点，输出 (..., NUM_FEATURES)
+"""
+
+import numpy as np
+
+WRIST = 0
+FINGER_TIPS = (4, 8, 12, 16, 20)
+
+# (起点, 终点) 的二维距离，顺序与 FEATURE_NAMES 前 9 项一致
+DISTANCE_PAIRS = np.array([
+    (4, 8),    # 拇指尖 - 食指尖
+    (4, 12),   # 拇指尖 - 中指尖
+    (4, 5),    # 拇指尖 - 食指根
+    (4, 6),    # 拇指尖 - 食指第二关节
+    (8, 0),    # 食指尖 - 手腕
+    (12, 0),   # 中指尖 - 手腕
+    (16, 0),   # 无名指尖 - 手腕
+    (20, 0),   # 小指尖 - 手腕
+    (0, 9),    # 手腕 - 中指根，作为手掌尺寸
+])
+NUM_DISTANCES = len(DISTANCE_PAIRS)
+NUM_NORMALIZED = 8
+
+# 每根手指从手腕到指尖的关节链，弯曲角为相邻骨骼夹角之和
+FINGER_CHAINS = np.array([
+    (0, 1, 2, 3, 4),
+    (0, 5, 6, 7, 8),
+    (0, 9, 10, 11, 12),
+    (0, 13, 14, 15, 16),
+    (0, 17, 18, 19, 20),
+])
+
+FEATURE_NAMES = (
+    'thumb_index_tip', 'thumb_middle_tip', 'thumb_index_mcp', 'thumb_index_pip',
+    'index_tip_wrist', 'middle_tip_wrist', 'ring_tip_wrist', 'pinky_tip_wrist',
+    'palm_size',
+    'norm_thumb_index_tip', 'norm_thumb_middle_tip', 'norm_thumb_index_mcp', 'norm_thumb_index_pip',
+    'norm_index_tip_wrist', 'norm_middle_tip_wrist', 'norm_ring_tip_wrist', 'norm_pinky_tip_wrist',
+    'thumb_curl', 'index_curl', 'middle_curl', 'ring_curl', 'pinky_curl',
+    'wrist_x', 'wrist_y',
+)
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+NUM_FEATURES = len(FEATURE_NAMES)
+
+TIP_WRIST_SLICE = slice(FEATURE_INDEX['index_tip_wrist'], FEATURE_INDEX['pinky_tip_wrist'] + 1)
+CURL_SLICE = slice(FEATURE_INDEX['thumb_curl'], FEATURE_INDEX['pinky_curl'] + 1)
+
+
+def pairwise_distances(landmarks: np.ndarray, dims: int = 2) -> np.ndarray:
+    """完整的 21×21 距离矩阵，(..., 21, 3) → (..., 21, 21)"""
+    points = np.asarray(landmarks, dtype=np.float64)[..., :dims]
+    diff = points[..., :, None, :] - points[..., None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+
+def finger_curls(landmarks: np.ndarray) -> np.ndarray:
+    """五根手指的弯曲角（弧度），伸直为 0，(..., 21, 3) → (..., 5)"""
+    points = np.asarray(landmarks, dtype=np.float64)
+    bones = points[..., FINGER_CHAINS[:, 1:], :] - points[..., FINGER_CHAINS[:, :-1], :]
+    lengths = np.linalg.norm(bones, axis=-1)
+    lengths = np.maximum(lengths, 1e-9)
+    cosines = (bones[..., 1:, :] * bones[..., :-1, :]).sum(axis=-1) / (lengths[..., 1:] * lengths[..., :-1])
+    return np.arccos(np.clip(cosines, -1.0, 1.0)).sum(axis=-1)
+
+
+def extract_features(landmarks: np.ndarray) -> np.ndarray:
+    """(21, 3) 或 (N, 21, 3) 关键点 → (..., NUM_FEATURES) 特征，列顺序见 FEATURE_NAMES"""
+    points = np.asarray(landmarks, dtype=np.float64)
+    xy = points[..., :2]
+    diff = xy[..., DISTANCE_PAIRS[:, 0], :] - xy[..., DISTANCE_PAIRS[:, 1], :]
+    # 与逐项 math.sqrt(dx**2 + dy**2) 的结果逐位一致
+    distances = np.sqrt(diff[..., 0] ** 2 + diff[..., 1] ** 2)
+    palm_size = np.maximum(distances[..., NUM_DISTANCES - 1:], 1e-9)
+    normalized = distances[..., :NUM_NORMALIZED] / palm_size
+    return np.concatenate([
+        distances,
+        normalized,
+        finger_curls(points),
+        xy[..., WRIST, :],
+    ], axis=-1)
@@ -1,31 +1,26 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import time
-from typing import List, Tuple
+from typing import Tuple
+
+from .hand_frame import HandFrame
+from .cursor_filter import OneEuroFilter
 
 class GestureProcessor:
     def __init__(self):
-        self.frame_buffer: List[Tuple[float, float]] = []
+        self.cursor_filter = OneEuroFilter()
         self.last_mouse_x = 0
         self.last_mouse_y = 0
-        self.smoothing_factor = 0.3
         self.gesture_stability_time = 0.3
         self.last_gesture_time = time.time()
         self.current_gesture = "无"
         
-    def smooth_coordinates(self, x: float, y: float) -> Tuple[float, float]:
-        if not self.frame_buffer:
-            self.frame_buffer = [(x, y)] * 5 
-        self.frame_buffer.append((x, y))
-        if len(self.frame_buffer) > 5:
-            self.frame_buffer.pop(0)
-        avg_x = sum(pos[0] for pos in self.frame_buffer) / len(self.frame_buffer)
-        avg_y = sum(pos[1] for pos in self.frame_buffer) / len(self.frame_buffer)
-        smooth_x = self.last_mouse_x * (1 - self.smoothing_factor) + avg_x * self.smoothing_factor
-        smooth_y = self.last_mouse_y * (1 - self.smoothing_factor) + avg_y * self.smoothing_factor
-        
-        self.last_mouse_x, self.last_mouse_y = smooth_x, smooth_y
-        return smooth_x, smooth_y
+    def smooth_coordinates(self, x: float, y: float, timestamp: float = None) -> Tuple[float, float]:
+        """timestamp 为采集时间戳，缺省时取当前时间"""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        self.last_mouse_x, self.last_mouse_y = self.cursor_filter.filter(x, y, timestamp)
+        return self.last_mouse_x, self.last_mouse_y
     
     def stabilize_gesture(self, gesture: str) -> str:
         current_time = time.time()
@@ -40,23 +35,20 @@ class GestureProcessor:
             else:
                 return "无"
     
-    def get_hand_center(self, hand_landmarks: any) -> Tuple[float, float]:
+    def get_hand_center(self, hand_landmarks: HandFrame) -> Tuple[float, float]:
         try:
-            x_sum, y_sum = 0, 0
-            for lm in hand_landmarks.landmark:
-                x_sum += lm.x
-                y_sum += lm.y
-            return x_sum/21, y_sum/21
+            x, y = hand_landmarks.landmarks[:, :2].mean(axis=0).tolist()
+            return x, y
         except Exception:
             return 0.5, 0.5
     
-    def update_smoothing_factor(self, factor: float):
-        self.smoothing_factor = max(0.1, min(0.9, factor))
+    def update_cursor_filter(self, min_cutoff: float = None, beta: float = None):
+        self.cursor_filter.update_parameters(min_cutoff=min_cutoff, beta=beta)
     def update_stability_time(self, stability_time: float):
         self.gesture_stability_time = max(0.1, min(1.0, stability_time))
     
     def reset_state(self):
-        self.frame_buffer.clear()
+        self.cursor_filter.reset()
         self.last_mouse_x = 0
         self.last_mouse_y = 0
         self.current_gesture = "无"
@@ -5,10 +5,20 @@
 负责识别各种手势类型，支持点击和滚轮控制
 """
 
-from typing import Any
+from typing import Any, List, Optional, Tuple
 import math
 import time
 
+import numpy as np
+
+from .hand_frame import HandFrame
+from .gesture_features import FEATURE_INDEX, extract_features
+from .gesture_debouncer import GestureDebouncer
+from .click_trigger import CLICK_CHANNELS, PinchClickTrigger
+from .gesture_rules import GestureRuleSet, load_gesture_rules
+from .temporal_gestures import TemporalGestureRecognizer
+from .template_classifier import TemplateClassifier
+
 
 class GestureRecognizer:    
     def __init__(self):
@@ -23,150 +33,221 @@ class GestureRecognizer:
         self.last_gesture = "无"
         self.stable_count = 0
         self.stability_required = 1
-        self.gesture_history = []
-        self.history_size = 8
-        self.hand_landmarks_cache = None
+        self.debouncer = GestureDebouncer(window_size=8)
+        # 点击走边沿触发，不等去抖投票
+        self.edge_clicks = True
+        self.click_trigger = PinchClickTrigger()
+        # 双指捏合、拖拽、滑动等时序手势，事件由 pop_temporal_events 取走
+        self.temporal_gestures = False
+        self.temporal = TemporalGestureRecognizer()
+        self.temporal_events: List[dict] = []
+        self.last_features: Optional[list] = None
+        self.last_hand: Optional[HandFrame] = None
         self.last_wrist_position = (0.5, 0.5)
         self.wrist_movement_threshold = 0.01 # contorl move scale
+        self._set_rule_set(load_gesture_rules())
+        # 设置后静态手势改由模板最近邻判定，规则集只在未加载模板时使用
+        self.template_classifier: Optional[TemplateClassifier] = None
     
-    def recognize_gesture(self, hand_landmarks: Any) -> str:
+    def recognize_gesture(self, hand_landmarks: HandFrame) -> str:
         try:
-            if not hasattr(hand_landmarks, 'landmark') or len(hand_landmarks.landmark) < 21:
+            if getattr(hand_landmarks, 'landmarks', None) is None or len(hand_landmarks) < 21:
+                self.hand_lost(getattr(hand_landmarks, 'timestamp', 0.0))
                 return self._get_stable_result("无")
-            self.hand_landmarks_cache = hand_landmarks
+            self.last_hand = hand_landmarks
             current_gesture = self._wrist_control_recognition(hand_landmarks)
-            self.gesture_history.append(current_gesture)
-            if len(self.gesture_history) > self.history_size:
-                self.gesture_history.pop(0)
-            stable_gesture = self._apply_debouncing(current_gesture)
-            return self._get_stable_result(stable_gesture)
+            if self.last_features is None:
+                return self._stabilize(current_gesture)
+            palm = tuple(hand_landmarks.landmarks[9, :2].tolist())
+            return self._postprocess(current_gesture, self.last_features, palm, hand_landmarks.timestamp)
         except Exception as e:
             print(f"手势识别出错: {e}")
             return self._get_stable_result("无")
     
-    def _wrist_control_recognition(self, hand_landmarks: Any) -> str:
-        try:
-            thumb_tip = hand_landmarks.landmark[4]
-            thumb_ip = hand_landmarks.landmark[3]
-            thumb_mcp = hand_landmarks.landmark[2]
-            
-            index_tip = hand_landmarks.landmark[8]
-            index_dip = hand_landmarks.landmark[7]
-            index_pip = hand_landmarks.landmark[6]
-            index_mcp = hand_landmarks.landmark[5]
-            
-            middle_tip = hand_landmarks.landmark[12]
-            middle_dip = hand_landmarks.landmark[11]
-            middle_pip = hand_landmarks.landmark[10]
-            middle_mcp = hand_landmarks.landmark[9]
-            
-            ring_tip = hand_landmarks.landmark[16]
-            ring_dip = hand_landmarks.landmark[15]
-            ring_pip = hand_landmarks.landmark[14]
-            
-            pinky_tip = hand_landmarks.landmark[20]
-            pinky_dip = hand_landmarks.landmark[19]
-            pinky_pip = hand_landmarks.landmark[18]
-            
-            wrist = hand_landmarks.landmark[0]
-            
-
-            thumb_index_tip_distance = math.sqrt((thumb_tip.x - index_tip.x)**2 + 
-                                               (thumb_tip.y - index_tip.y)**2)
-            
-            thumb_middle_tip_distance = math.sqrt((thumb_tip.x - middle_tip.x)**2 + 
-                                                (thumb_tip.y - middle_tip.y)**2)
-            
-            thumb_index_mcp_distance = math.sqrt((thumb_tip.x - index_mcp.x)**2 + 
-                                               (thumb_tip.y - index_mcp.y)**2)
-            
-            thumb_index_pip_distance = math.sqrt((thumb_tip.x - index_pip.x)**2 + 
-                                               (thumb_tip.y - index_pip.y)**2)
-            
-            bent_fingers = 0
-            finger_tips = [8, 12, 16, 20]
-            
-            for tip_id in finger_tips:
-                tip = hand_landmarks.landmark[tip_id]
-                distance = math.sqrt((tip.x - wrist.x)**2 + (tip.y - wrist.y)**2)
-                if distance < self.thresholds['fist']:
-                    bent_fingers += 1
-            if bent_fingers >= 3:
-                return "握拳"
-            
-            if thumb_index_tip_distance < self.thresholds['click_contact']:
-                return "鼠标点击"
-            
-            elif thumb_middle_tip_distance < self.thresholds['click_contact']:
-                return "鼠标右键"
-            
-            elif thumb_index_pip_distance < self.thresholds['wheel_down_threshold'] and bent_fingers < 2:
-                if thumb_index_mcp_distance >= self.thresholds['wheel_up_threshold']:
-                    return "下滚轮"
-                else:
-                    if thumb_index_pip_distance <= thumb_index_mcp_distance:
-                        return "下滚轮"
-                    else:
-                        return "上滚轮"
-            
-            elif thumb_index_mcp_distance < self.thresholds['wheel_up_threshold'] and bent_fingers < 2:
-                if thumb_index_pip_distance >= self.thresholds['wheel_down_threshold']:
-                    return "上滚轮"
-                else:
-                    if thumb_index_mcp_distance <= thumb_index_pip_distance:
-                        return "上滚轮"
-                    else:
-                        return "下滚轮"
-            current_wrist_pos = (wrist.x, wrist.y)
-            wrist_movement = math.sqrt((current_wrist_pos[0] - self.last_wrist_position[0])**2 + 
-                                     (current_wrist_pos[1] - self.last_wrist_position[1])**2)
-            self.last_wrist_position = current_wrist_pos
-            
-            if wrist_movement > self.wrist_movement_threshold:
-                return "鼠标移动"
+    def _stabilize(self, current_gesture: str) -> str:
+        """去抖与稳定判定，只依赖帧序，不依赖时钟"""
+        return self._get_stable_result(self.debouncer.update(current_gesture))
+    
+    def _postprocess(self, raw_gesture: str, features: list, palm: Tuple[float, float], timestamp: float) -> str:
+        """原始判定之后的逐帧处理: 去抖、时序手势、边沿点击，实时与离线重放共用"""
+        stable_gesture = self._stabilize(raw_gesture)
+        if self.temporal_gestures:
+            self.temporal_events.extend(self.temporal.update(
+                raw_gesture, features, palm, self.thresholds['click_contact'], timestamp
+            ))
+        if self.edge_clicks:
+            return self._apply_click_trigger(raw_gesture, stable_gesture, features, timestamp)
+        return stable_gesture
+    
+    def hand_lost(self, timestamp: float):
+        """本帧没有检测到手：点击不再用丢失前的距离算速度，进行中的拖拽结束"""
+        self.click_trigger.lost()
+        if self.temporal_gestures:
+            self.temporal_events.extend(self.temporal.lost(timestamp))
+    
+    def pop_temporal_events(self) -> List[dict]:
+        events = self.temporal_events
+        self.temporal_events = []
+        return events
+    
+    def _apply_click_trigger(self, raw_gesture: str, stable_gesture: str, features: list, timestamp: float) -> str:
+        """边沿触发的点击替换去抖后的点击：越过进入阈值的那一帧输出点击，按住期间不再输出点击；
+        边沿因速度不足未提交的捏合，在去抖结果进入点击时补发一次"""
+        event = self.click_trigger.update(raw_gesture, {
+            "鼠标点击": features[FEATURE_INDEX['thumb_index_tip']],
+            "鼠标右键": features[FEATURE_INDEX['thumb_middle_tip']],
+        }, self.thresholds['click_contact'], timestamp, stable_gesture)
+        if event is not None:
+            return event
+        if stable_gesture in CLICK_CHANNELS:
             return "无"
-                
+        return stable_gesture
+    
+    def recognize_batch(self, landmarks: np.ndarray, timestamps: Optional[np.ndarray] = None,
+                        reset: bool = True) -> dict:
+        """离线重放一段关键点序列，返回手势时间线
+
+        landmarks 为 (N, 21, 3)，没有检测到手的帧用 NaN 填充（与实时循环一样不更新识别状态）；
+        timestamps 为采样时间戳，缺省时用帧序号。reset 为 True 时先清空识别状态。
+        返回 {'timestamps', 'raw'（逐帧原始判定）, 'gestures'（逐帧去抖后的手势）, 'segments',
+        'events'（开启时序手势时的事件列表）}。
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        count = len(landmarks)
+        if timestamps is None:
+            timestamps = np.arange(count, dtype=np.float64)
+            # 点击速度判定按默认帧间隔换算
+            times = (timestamps * self.click_trigger.default_frame_period).tolist()
+        else:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            times = timestamps.tolist()
+        if reset:
+            self.reset_stability()
+        raw_gestures = ["无"] * count
+        gestures = ["无"] * count
+        present = np.flatnonzero(~np.isnan(landmarks).any(axis=(1, 2)))
+        if len(present):
+            features = extract_features(landmarks[present])
+            raw, self.last_wrist_position = self.classify_features(
+                features, self.last_wrist_position, landmarks[present]
+            )
+            if self.edge_clicks or self.temporal_gestures:
+                rows = features.tolist()
+                palms = landmarks[present, 9, :2].tolist()
+                previous = -1
+                for row, (index, gesture) in enumerate(zip(present.tolist(), raw.tolist())):
+                    if index != previous + 1:
+                        self.hand_lost(times[previous + 1])
+                    raw_gestures[index] = gesture
+                    gestures[index] = self._postprocess(gesture, rows[row], tuple(palms[row]), times[index])
+                    previous = index
+            else:
+                stabilize = self._stabilize
+                for index, gesture in zip(present.tolist(), raw.tolist()):
+                    raw_gestures[index] = gesture
+                    gestures[index] = stabilize(gesture)
+        return {
+            'timestamps': timestamps,
+            'raw': raw_gestures,
+            'gestures': gestures,
+            'segments': self.build_timeline(timestamps, gestures),
+            'events': self.pop_temporal_events()
+        }
+    
+    @staticmethod
+    def build_timeline(timestamps: np.ndarray, gestures: List[str]) -> List[dict]:
+        """把逐帧手势合并成连续片段: gesture, start, end, frames"""
+        segments = []
+        for timestamp, gesture in zip(np.asarray(timestamps).tolist(), gestures):
+            if segments and segments[-1]['gesture'] == gesture:
+                segments[-1]['end'] = timestamp
+                segments[-1]['frames'] += 1
+            else:
+                segments.append({'gesture': gesture, 'start': timestamp, 'end': timestamp, 'frames': 1})
+        return segments
+    
+    def _wrist_control_recognition(self, hand_landmarks: HandFrame) -> str:
+        try:
+            features = extract_features(hand_landmarks.landmarks).tolist()
+            self.last_features = features
+            return self._classify_row(features, hand_landmarks.landmarks)
         except Exception as e:
             print(f"手腕控制手势识别逻辑出错: {e}")
+            self.last_features = None
             return "无"
     
-    def _is_finger_extended(self, hand_landmarks: Any, finger_tip_id: int, wrist) -> bool:
+    def _classify_row(self, features: list, landmarks: Optional[np.ndarray] = None) -> str:
+        """单帧特征的标量判定，规则与 classify_features 相同，省去小数组上的 NumPy 调用开销"""
+        if self.template_classifier is not None and landmarks is not None:
+            gesture = self.template_classifier.predict_one(landmarks)
+            if gesture == "无":
+                gesture = None
+        else:
+            gesture = self.rule_set.classify_row(features, self.thresholds)
+        if gesture is not None:
+            return gesture
+        current_wrist_pos = (features[FEATURE_INDEX['wrist_x']], features[FEATURE_INDEX['wrist_y']])
+        wrist_movement = math.sqrt((current_wrist_pos[0] - self.last_wrist_position[0])**2 + 
+                                 (current_wrist_pos[1] - self.last_wrist_position[1])**2)
+        self.last_wrist_position = current_wrist_pos
+        if wrist_movement > self.wrist_movement_threshold:
+            return "鼠标移动"
+        return "无"
+    
+    def classify_features(self, features: np.ndarray,
+                          last_wrist_position: Tuple[float, float] = (0.5, 0.5),
+                          landmarks: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Tuple[float, float]]:
+        """对 (N, NUM_FEATURES) 特征逐帧判定手势，返回 (手势标签数组, 更新后的手腕位置)
+
+        先按规则集的优先级判定（加载了模板且给出 landmarks 时改用模板最近邻），
+        都不满足的帧再做移动判定；只有走到移动判定的帧才会更新手腕位置。
+        """
+        if self.template_classifier is not None and landmarks is not None:
+            labels = self.template_classifier.predict(landmarks)
+            reached = np.flatnonzero(labels == "无")
+            codes = None
+        else:
+            codes = self.rule_set.evaluate(features, self.thresholds)
+            reached = np.flatnonzero(codes == 0)
+
+        # 移动判定依赖上一次走到这里的帧的手腕位置
+        if len(reached):
+            wrist = features[reached][:, [FEATURE_INDEX['wrist_x'], FEATURE_INDEX['wrist_y']]]
+            previous = np.vstack([np.asarray(last_wrist_position, dtype=np.float64)[None], wrist[:-1]])
+            delta = wrist - previous
+            movement = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+            moved = reached[movement > self.wrist_movement_threshold]
+            if codes is None:
+                labels[moved] = "鼠标移动"
+            else:
+                codes[moved] = self._move_code
+            last_wrist_position = tuple(wrist[-1].tolist())
+        if codes is None:
+            return labels, last_wrist_position
+        return self._labels[codes], last_wrist_position
+    
+    def classify_batch(self, landmarks: np.ndarray) -> np.ndarray:
+        """离线评估：对 (N, 21, 3) 关键点一次性判定未去抖的手势，不改变识别器状态"""
+        labels, _ = self.classify_features(extract_features(landmarks), self.last_wrist_position, landmarks)
+        return labels
+    
+    def _is_finger_extended(self, hand_landmarks: HandFrame, finger_tip_id: int, wrist) -> bool:
         try:
-            finger_tip = hand_landmarks.landmark[finger_tip_id]
-            return finger_tip.y < (wrist.y - 0.1)
+            finger_tip = hand_landmarks.landmarks[finger_tip_id]
+            return finger_tip[1] < (wrist[1] - 0.1)
         except:
             return False
     
-    def _is_thumb_extended(self, hand_landmarks: Any, wrist) -> bool:
+    def _is_thumb_extended(self, hand_landmarks: HandFrame, wrist) -> bool:
         try:
-            thumb_tip = hand_landmarks.landmark[4]
-            thumb_mcp = hand_landmarks.landmark[2]
-            thumb_extended_horizontally = abs(thumb_tip.x - thumb_mcp.x) > 0.05
-            thumb_not_too_low = thumb_tip.y < (wrist.y + 0.05)
+            thumb_tip = hand_landmarks.landmarks[4]
+            thumb_mcp = hand_landmarks.landmarks[2]
+            thumb_extended_horizontally = abs(thumb_tip[0] - thumb_mcp[0]) > 0.05
+            thumb_not_too_low = thumb_tip[1] < (wrist[1] + 0.05)
             return thumb_extended_horizontally and thumb_not_too_low
         except:
             return False
     
-    def _apply_debouncing(self, current_gesture: str) -> str:
-        if len(self.gesture_history) < self.history_size:
-            return current_gesture
-        gesture_counts = {}
-        for gesture in self.gesture_history[-self.history_size:]:
-            gesture_counts[gesture] = gesture_counts.get(gesture, 0) + 1
-        most_common_gesture = max(gesture_counts.items(), key=lambda x: x[1])[0]
-        most_common_count = gesture_counts[most_common_gesture]
-        click_gestures = ["鼠标点击", "鼠标右键", "下滚轮", "上滚轮"]
-        if current_gesture in click_gestures:
-            if gesture_counts.get(current_gesture, 0) / self.history_size >= 0.3:
-                return current_gesture
-        if current_gesture == "握拳":
-            if gesture_counts.get(current_gesture, 0) / self.history_size >= 0.2:
-                return current_gesture
-        elif most_common_count / self.history_size >= 0.6:
-            return most_common_gesture
-        else:
-            return self.last_gesture if self.last_gesture != "无" else current_gesture
-    
     def _get_stable_result(self, current_gesture: str) -> str:
         if current_gesture == self.last_gesture:
             self.stable_count += 1
@@ -200,24 +281,70 @@ class GestureRecognizer:
         if wheel_down_threshold is not None:
             self.thresholds['wheel_down_threshold'] = max(0.03, min(0.15, wheel_down_threshold))
     
+    def update_debounce_fractions(self, enter_fractions: dict = None, exit_fractions: dict = None):
+        """按手势设置去抖的进入/退出票数比例，如 {'鼠标点击': 0.3}"""
+        self.debouncer.update_fractions(enter_fractions, exit_fractions)
+    
+    def get_debounce_delays(self, frame_period: float = None) -> dict:
+        return self.debouncer.get_delays(frame_period)
+    
+    def _set_rule_set(self, rule_set: GestureRuleSet):
+        missing = rule_set.threshold_names - set(self.thresholds) - set(rule_set.thresholds)
+        if missing:
+            raise ValueError(f"规则引用了未定义的阈值: {', '.join(sorted(missing))}")
+        for key, value in rule_set.thresholds.items():
+            self.thresholds.setdefault(key, value)
+        self.rule_set = rule_set
+        # 规则都不满足的帧走移动判定，"鼠标移动" 固定放在标签末尾
+        self._labels = np.append(rule_set.labels, "鼠标移动")
+        self._move_code = len(self._labels) - 1
+    
+    def load_rules(self, path: str = None) -> bool:
+        """从 JSON 重新加载手势规则，失败时保留当前规则"""
+        try:
+            self._set_rule_set(load_gesture_rules(path))
+            return True
+        except Exception as e:
+            print(f"加载手势规则失败: {e}")
+            return False
+    
+    def load_template_model(self, path: str) -> bool:
+        """加载离线训练的模板模型，之后静态手势走模板最近邻；失败时继续使用规则集"""
+        try:
+            self.template_classifier = TemplateClassifier.load(path)
+            return True
+        except Exception as e:
+            print(f"加载手势模板失败: {e}")
+            self.template_classifier = None
+            return False
+    
+    def use_rule_classifier(self):
+        self.template_classifier = None
+    
     def get_thresholds(self):
         return self.thresholds.copy()
     
     def reset_stability(self):
         self.stable_count = 0
         self.last_gesture = "无"
-        self.gesture_history.clear()
+        self.debouncer.reset()
+        self.click_trigger.reset()
+        self.temporal.reset()
+        self.temporal_events = []
         self.last_wrist_position = (0.5, 0.5)
     
-    def get_hand_center(self):
-        if self.hand_landmarks_cache:
+    def get_hand_center(self, hand: Optional[HandFrame] = None):
+        """点9 坐标；传入 hand 时按该帧计算（流水线执行阶段的 last_hand 已被下一帧覆盖）"""
+        if hand is None:
+            hand = self.last_hand
+        if hand is not None:
             try:
-                middle_mcp = self.hand_landmarks_cache.landmark[9]
-                if 0 <= middle_mcp.x <= 1 and 0 <= middle_mcp.y <= 1:
-                    # print(f"[DEBUG] 点9坐标: ({middle_mcp.x:.3f}, {middle_mcp.y:.3f})")
-                    return middle_mcp.x, middle_mcp.y
+                x, y = hand.landmarks[9, :2].tolist()
+                if 0 <= x <= 1 and 0 <= y <= 1:
+                    # print(f"[DEBUG] 点9坐标: ({x:.3f}, {y:.3f})")
+                    return x, y
                 else:
-                    print(f"[WARNING] 点9坐标超出有效范围: ({middle_mcp.x}, {middle_mcp.y})")
+                    print(f"[WARNING] 点9坐标超出有效范围: ({x}, {y})")
                     return 0.5, 0.5
             except Exception as e:
                 print(f"[ERROR] 获取点9坐标失败: {e}")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+声明式手势规则
+规则从 JSON 读取，加载时编译一次：每个条件同时编译成对 (N, K) 特征矩阵的 NumPy 判定和对单帧特征列表的标量判定，
+两条路径出自同一份定义，结果逐位一致。规则按 (priority, 定义顺序) 排序，取第一条满足的规则。
+
+格式:
+    thresholds  规则引用的阈值默认值，识别器里已有的同名阈值优先
+    groups      特征组，{"组名": [特征名, ...]}
+    derived     派生特征，{"名称": {"count": 组名或特征列表, "op": "<", "threshold"/"value"/"other": ...}}
+    rules       [{"gesture": 手势名, "priority": 数字, "when": 条件}]
+条件:
+    {"feature": 特征名, "op": "<" | "<=" | ">" | ">=" | "==" | "!=", 以及 "threshold": 阈值名 / "value": 常数 / "other": 特征名}
+    {"all": [条件, ...]}  {"any": [条件, ...]}  {"not": 条件}
+特征名见 gesture_features.FEATURE_NAMES，也可以引用 derived 中定义的派生特征。
+"""
+
+import json
+import operator
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .gesture_features import FEATURE_INDEX
+
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "gesture_rules.json"
+)
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+ScalarPredicate = Callable[[list, dict], bool]
+VectorPredicate = Callable[[np.ndarray, dict], np.ndarray]
+
+
+class GestureRuleSet:
+    def __init__(self, definition: dict):
+        self.thresholds: Dict[str, float] = dict(definition.get('thresholds', {}))
+        self.threshold_names = set()
+        self.feature_index: Dict[str, int] = dict(FEATURE_INDEX)
+        groups = {name: list(features) for name, features in definition.get('groups', {}).items()}
+
+        # 派生特征按定义顺序追加到特征末尾，后定义的可以引用先定义的
+        self._derived: List[Tuple[Callable, Callable]] = []
+        for name, spec in definition.get('derived', {}).items():
+            if name in self.feature_index:
+                raise ValueError(f"派生特征与已有特征重名: {name}")
+            self._derived.append(self._compile_count(spec, groups))
+            self.feature_index[name] = len(self.feature_index)
+
+        rules = definition.get('rules', [])
+        if not rules:
+            raise ValueError("规则集为空")
+        ordered = sorted(enumerate(rules), key=lambda item: (item[1].get('priority', 0), item[0]))
+        labels = ["无"]
+        self.rules: List[Tuple[str, int, ScalarPredicate, VectorPredicate]] = []
+        for _, rule in ordered:
+            gesture = rule['gesture']
+            if gesture not in labels:
+                labels.append(gesture)
+            scalar, vector = self._compile(rule['when'])
+            self.rules.append((gesture, labels.index(gesture), scalar, vector))
+        self.labels = np.array(labels, dtype=object)
+
+    def _index(self, name: str) -> int:
+        if name not in self.feature_index:
+            raise ValueError(f"未知特征: {name}")
+        return self.feature_index[name]
+
+    def _operand(self, spec: dict) -> Tuple[Callable, Callable]:
+        """比较右侧: 阈值名、常数或另一个特征"""
+        if 'threshold' in spec:
+            key = spec['threshold']
+            self.threshold_names.add(key)
+            return (lambda row, thresholds: thresholds[key]), (lambda features, thresholds: thresholds[key])
+        if 'value' in spec:
+            value = float(spec['value'])
+            return (lambda row, thresholds: value), (lambda features, thresholds: value)
+        if 'other' in spec:
+            index = self._index(spec['other'])
+            return (lambda row, thresholds: row[index]), (lambda features, thresholds: features[:, index])
+        raise ValueError(f"条件缺少 threshold/value/other: {spec}")
+
+    def _compare(self, spec: dict) -> Tuple[Callable, Callable]:
+        if spec.get('op') not in OPERATORS:
+            raise ValueError(f"未知比较运算: {spec.get('op')}")
+        compare = OPERATORS[spec['op']]
+        index = self._index(spec['feature'])
+        scalar_operand, vector_operand = self._operand(spec)
+        return (
+            lambda row, thresholds: compare(row[index], scalar_operand(row, thresholds)),
+            lambda features, thresholds: compare(features[:, index], vector_operand(features, thresholds))
+        )
+
+    def _compile(self, spec: dict) -> Tuple[ScalarPredicate, VectorPredicate]:
+        if 'all' in spec or 'any' in spec:
+            parts = [self._compile(part) for part in spec.get('all', spec.get('any'))]
+            scalars = [scalar for scalar, _ in parts]
+            vectors = [vector for _, vector in parts]
+            if 'all' in spec:
+                return (
+                    lambda row, thresholds: all(scalar(row, thresholds) for scalar in scalars),
+                    lambda features, thresholds: np.logical_and.reduce([vector(features, thresholds) for vector in vectors])
+                )
+            return (
+                lambda row, thresholds: any(scalar(row, thresholds) for scalar in scalars),
+                lambda features, thresholds: np.logical_or.reduce([vector(features, thresholds) for vector in vectors])
+            )
+        if 'not' in spec:
+            scalar, vector = self._compile(spec['not'])
+            return (
+                lambda row, thresholds: not scalar(row, thresholds),
+                lambda features, thresholds: ~vector(features, thresholds)
+            )
+        if 'feature' in spec:
+            return self._compare(spec)
+        raise ValueError(f"无法识别的条件: {spec}")
+
+    def _compile_count(self, spec: dict, groups: dict) -> Tuple[Callable, Callable]:
+        """派生特征: 一组特征中满足比较条件的个数"""
+        names = groups.get(spec['count'], spec['count']) if isinstance(spec['count'], str) else spec['count']
+        if isinstance(names, str):
+            raise ValueError(f"未知特征组: {names}")
+        indices = [self._index(name) for name in names]
+        if spec.get('op') not in OPERATORS:
+            raise ValueError(f"未知比较运算: {spec.get('op')}")
+        compare = OPERATORS[spec['op']]
+        scalar_operand, vector_operand = self._operand(spec)
+
+        def vector(features, thresholds):
+            operand = vector_operand(features, thresholds)
+            if isinstance(operand, np.ndarray):
+                operand = operand[:, None]
+            return compare(features[:, indices], operand).sum(axis=1)
+
+        return (
+            lambda row, thresholds: sum(1 for index in indices if compare(row[index], scalar_operand(row, thresholds))),
+            vector
+        )
+
+    def extend(self, features: np.ndarray, thresholds: dict) -> np.ndarray:
+        """(N, NUM_FEATURES) → 追加派生特征列"""
+        for _, vector in self._derived:
+            features = np.concatenate([features, vector(features, thresholds)[:, None].astype(features.dtype)], axis=1)
+        return features
+
+    def classify_row(self, row: list, thresholds: dict) -> Optional[str]:
+        """单帧特征列表，返回第一条满足的规则的手势，都不满足返回 None"""
+        if self._derived:
+            row = list(row)
+            for scalar, _ in self._derived:
+                row.append(scalar(row, thresholds))
+        for gesture, _, scalar, _ in self.rules:
+            if scalar(row, thresholds):
+                return gesture
+        return None
+
+    def evaluate(self, features: np.ndarray, thresholds: dict) -> np.ndarray:
+        """(N, NUM_FEATURES) 特征 → (N,) 手势编码（labels 的下标），都不满足为 0"""
+        features = self.extend(features, thresholds)
+        return np.select(
+            [vector(features, thresholds) for _, _, _, vector in self.rules],
+            [code for _, code, _, _ in self.rules],
+            default=0
+        )
+
+
+def load_gesture_rules(path: Optional[str] = None) -> GestureRuleSet:
+    with open(path or DEFAULT_RULES_PATH, 'r', encoding='utf-8') as f:
+        return GestureRuleSet(json.load(f))
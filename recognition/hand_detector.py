@@ -1,11 +1,20 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import os
+import threading
+import time
 import cv2
 import mediapipe as mp
 from typing import Tuple, Optional, Any
 import numpy as np
 from .gesture_recognizer import GestureRecognizer
 from utils.camera_manager import CameraManager
+from utils.frame_pool import FramePool
+from .inference_worker import ProcessInferencePool
+from .landmark_tracker import LandmarkFlowTracker
+from .motion_gate import MotionGate
+from .hand_frame import HandFrame
+from .landmark_recorder import LandmarkRecorder
 
 
 class HandDetector:
@@ -19,6 +28,53 @@ class HandDetector:
         self.detection_confidence = 0.7
         self.tracking_confidence = 0.7
         self.is_initialized = False
+        self.frame_pool = FramePool("detector")
+        # True: 在原始帧上推理后镜像关键点，预览只在显示分辨率上翻转
+        self.mirror_landmarks = True
+        self.handedness = None
+        # "inline": 旧版 solutions API；"tasks": Tasks API LIVE_STREAM 异步推理；"process": 交给独立的推理进程
+        self.inference_backend = "inline"
+        self.active_backend = None
+        self.inference_workers = 1
+        self.process_pool: Optional[ProcessInferencePool] = None
+        self.hand_model_path = "models/hand_landmarker.task"
+        self.landmarker = None
+        # LIVE_STREAM 模式下等待本帧结果的最长时间，0 表示直接使用已完成的最新结果
+        self.live_stream_wait = 0.0
+        # 最近一次 detect 返回的结果所属帧；LIVE_STREAM 的结果可能来自更早提交的帧
+        self.result_seq = 0
+        self.result_timestamp = 0.0
+        # True: 本次 detect 没有新的推理结果（LIVE_STREAM 结果未返回或已交付过），不代表画面中没有手
+        self.result_pending = False
+        self._live_condition = threading.Condition()
+        self._reset_live_stream_state()
+        # ROI 跟踪：置信度足够时下一帧只在上一帧手部包围盒附近的裁剪区域上推理
+        self.roi_tracking = False
+        self.roi_padding = 0.3
+        self.roi_min_size = 160
+        self.roi_input_size = 256
+        # 关键点包围盒的合理范围（占画面短边的比例），超出时不沿用 ROI
+        self.roi_min_box = 0.05
+        self.roi_max_box = 0.9
+        self.roi_hands_detector = None
+        self._roi: Optional[Tuple[int, int, int]] = None
+        self._reset_roi_stats()
+        # 关键帧推理：每 keyframe_interval 帧推理一次，中间帧用光流传播关键点
+        self.keyframe_interval = 1
+        self.adaptive_keyframes = False
+        self.flow_tracker: Optional[LandmarkFlowTracker] = None
+        # LIVE_STREAM 后端在关键帧上等待本帧结果的最长时间，只有本帧的结果才能锚定光流
+        self.keyframe_result_wait = 0.1
+        self._keyframe_z = None
+        self._keyframe_handedness = None
+        self._keyframe_score = 0.0
+        # 运动门控：无手且无运动时降低推理频率
+        self.motion_gate: Optional[MotionGate] = None
+        # 已处理帧的采集序号，同一帧不重复推理
+        self.last_frame_seq = 0
+        self.last_frame_timestamp = 0.0
+        self.skipped_duplicates = 0
+        self.recorder = LandmarkRecorder()
 
     def _init_mediapipe_components(self):
         try:
@@ -36,7 +92,8 @@ class HandDetector:
             else:
                 self.use_new_api = False
 
-            if not self.use_new_api:
+            # 旧版 API 始终保留，Tasks 模型不可用时回退
+            if hasattr(mp, 'solutions'):
                 self.mp_hands = mp.solutions.hands
                 self.mp_drawing = mp.solutions.drawing_utils
                 self.HandLandmark = self.mp_hands.HandLandmark
@@ -51,11 +108,28 @@ class HandDetector:
                 if not self.camera_manager.reinitialize_with_config(config_manager):
                     print("摄像头初始化失败")
                     return False
+                settings = config_manager.get_settings()
+                self.mirror_landmarks = bool(settings.mirror_landmarks.get() if hasattr(settings.mirror_landmarks, 'get') else settings.mirror_landmarks)
+                self.inference_backend = settings.inference_backend.get() if hasattr(settings.inference_backend, 'get') else settings.inference_backend
+                self.inference_workers = int(settings.inference_workers.get() if hasattr(settings.inference_workers, 'get') else settings.inference_workers)
+                self.hand_model_path = settings.hand_model_path.get() if hasattr(settings.hand_model_path, 'get') else settings.hand_model_path
+                self.roi_tracking = bool(settings.roi_tracking.get() if hasattr(settings.roi_tracking, 'get') else settings.roi_tracking)
+                self.keyframe_interval = int(settings.keyframe_interval.get() if hasattr(settings.keyframe_interval, 'get') else settings.keyframe_interval)
+                self.adaptive_keyframes = bool(settings.adaptive_keyframes.get() if hasattr(settings.adaptive_keyframes, 'get') else settings.adaptive_keyframes)
+                motion_gate = bool(settings.motion_gate.get() if hasattr(settings.motion_gate, 'get') else settings.motion_gate)
+                self.motion_gate = MotionGate() if motion_gate else None
+                self.gesture_recognizer.edge_clicks = bool(settings.edge_clicks.get() if hasattr(settings.edge_clicks, 'get') else settings.edge_clicks)
+                self.gesture_recognizer.temporal_gestures = bool(settings.temporal_gestures.get() if hasattr(settings.temporal_gestures, 'get') else settings.temporal_gestures)
+                gesture_rules_file = settings.gesture_rules_file.get() if hasattr(settings.gesture_rules_file, 'get') else settings.gesture_rules_file
+                self.gesture_recognizer.load_rules(gesture_rules_file or None)
+                gesture_classifier = settings.gesture_classifier.get() if hasattr(settings.gesture_classifier, 'get') else settings.gesture_classifier
+                if gesture_classifier == "template":
+                    template_model_path = settings.template_model_path.get() if hasattr(settings.template_model_path, 'get') else settings.template_model_path
+                    self.gesture_recognizer.load_template_model(template_model_path)
+                else:
+                    self.gesture_recognizer.use_rule_classifier()
             
-            if self.use_new_api:
-                result = self._init_new_api_detector()
-            else:
-                result = self._init_old_api_detector()
+            result = self._init_backend()
             
             if result:
                 self.is_initialized = True
@@ -64,15 +138,87 @@ class HandDetector:
             print(f"初始化手部检测器失败: {e}")
             return False
     
+    def _init_backend(self) -> bool:
+        """按 inference_backend 初始化推理后端，失败时回退到旧版 API"""
+        self.active_backend = None
+        self.last_frame_seq = 0
+        self.skipped_duplicates = 0
+        self._roi = None
+        self._reset_roi_stats()
+        self.flow_tracker = None
+        if self.keyframe_interval > 1 or self.adaptive_keyframes:
+            self.flow_tracker = LandmarkFlowTracker(self.keyframe_interval, adaptive=self.adaptive_keyframes)
+        if self.inference_backend == "process":
+            if self._init_process_pool():
+                self.active_backend = "process"
+                return True
+            print("推理进程启动失败，回退到本进程推理")
+        elif self.inference_backend == "tasks":
+            if self._init_new_api_detector():
+                self.active_backend = "tasks"
+                return True
+            print("Tasks API 不可用，回退到旧版API")
+        if self._init_old_api_detector():
+            self.active_backend = "inline"
+            return True
+        return False
+    
     def _init_new_api_detector(self) -> bool:
+        """以 LIVE_STREAM 模式创建 HandLandmarker，模型只从本地路径加载"""
         try:
-            # 这里需要模型文件，暂时回退到旧版API
-            print("新版API需要额外的模型文件，使用旧版API")
-            return self._init_old_api_detector()
+            if not self.use_new_api:
+                return False
+            if not self.hand_model_path or not os.path.isfile(self.hand_model_path):
+                print(f"找不到手部模型文件: {self.hand_model_path}")
+                return False
+            self.cleanup_landmarker()
+            options = self.HandLandmarkerOptions(
+                base_options=self.BaseOptions(model_asset_path=self.hand_model_path),
+                running_mode=self.VisionRunningMode.LIVE_STREAM,
+                num_hands=1,
+                min_hand_detection_confidence=self.detection_confidence,
+                min_hand_presence_confidence=self.detection_confidence,
+                min_tracking_confidence=self.tracking_confidence,
+                result_callback=self._on_live_stream_result
+            )
+            self.landmarker = self.HandLandmarker.create_from_options(options)
+            self._reset_live_stream_state()
+            return True
         except Exception as e:
             print(f"新版API初始化失败: {e}")
             return False
     
+    def _reset_live_stream_state(self):
+        with self._live_condition:
+            # timestamp_ms → (提交时间, 帧序号, 采集时间戳)
+            self._live_pending = {}
+            self._live_latest = None
+            self._live_delivered_ms = 0
+            self._last_timestamp_ms = 0
+            self.live_stats = {
+                'submitted': 0,
+                'completed': 0,
+                'skipped': 0,
+                'matched': 0,
+                'stale': 0,
+                'total_latency': 0.0
+            }
+    
+    def _init_process_pool(self) -> bool:
+        """启动推理进程池，共享内存槽位按不小于 1080p 的帧尺寸分配"""
+        self.cleanup_process_pool()
+        max_shape = (max(self.camera_manager.height, 1080), max(self.camera_manager.width, 1920), 3)
+        pool = ProcessInferencePool(
+            num_workers=self.inference_workers,
+            max_frame_shape=max_shape,
+            detection_confidence=self.detection_confidence,
+            tracking_confidence=self.tracking_confidence
+        )
+        if not pool.start():
+            return False
+        self.process_pool = pool
+        return True
+    
     def _init_old_api_detector(self) -> bool:
         """初始化旧版API检测器"""
         try:
@@ -102,8 +248,12 @@ class HandDetector:
     
     def _reinitialize_detector(self):
         try:
+            if self.process_pool is not None:
+                # 只让工作进程重建 Hands，避免拖动滑块时反复重启进程
+                self.process_pool.update_options(self.detection_confidence, self.tracking_confidence)
+                return
             self.cleanup_detector()
-            if self.use_new_api:
+            if self.active_backend == "tasks":
                 self._init_new_api_detector()
             else:
                 self._init_old_api_detector()
@@ -119,42 +269,402 @@ class HandDetector:
                 except Exception:
                     pass
                 self.hands_detector = None
+            if self.roi_hands_detector:
+                try:
+                    self.roi_hands_detector.close()
+                except Exception:
+                    pass
+                self.roi_hands_detector = None
+            self._roi = None
+            self.cleanup_landmarker()
         except Exception as e:
             print(f"清理检测器时出错: {e}")
     
-    def process_frame(self) -> Tuple[Optional[np.ndarray], str, Any]:
-        frame = self.camera_manager.get_frame()
+    def cleanup_landmarker(self):
+        if self.landmarker is not None:
+            try:
+                self.landmarker.close()
+            except Exception:
+                pass
+            self.landmarker = None
+    
+    def cleanup_process_pool(self):
+        if self.process_pool is not None:
+            self.process_pool.stop()
+            self.process_pool = None
+    
+    def process_frame(self, wait: float = 0.0) -> Tuple[Optional[np.ndarray], str, Optional[HandFrame]]:
+        """返回 (RGB 帧, 手势, HandFrame)；RGB 帧是复用的缓冲区，检测器与预览共用
+
+        mirror_landmarks 为 True 时返回的帧未镜像，关键点已镜像，预览需自行翻转显示。
+        最多等待 wait 秒获取新帧；仍是已处理过的帧时返回 (None, "无", None)。
+        """
+        frame, seq, timestamp = self.camera_manager.get_frame_packet(timeout=wait, newer_than=self.last_frame_seq)
         if frame is None:
             return None, "无", None
-        frame = cv2.flip(frame, 1)
-        if self.use_new_api:
-            return self._process_frame_new_api(frame)
-        else:
-            return self._process_frame_old_api(frame)
+        if seq == self.last_frame_seq:
+            self.skipped_duplicates += 1
+            return None, "无", None
+        self.last_frame_seq = seq
+        self.last_frame_timestamp = timestamp
+        shared_frame = None
+        if self.process_pool is not None:
+            # 直接把 RGB 帧写进共享内存槽位，省去一次拷贝
+            shared_frame = self.process_pool.acquire_frame(frame.shape, stream_id=self.camera_manager.camera_index)
+        frame_rgb = self.prepare_frame(frame, dst=shared_frame)
+        gesture = "无"
+        hand_landmarks = self.detect(frame_rgb, seq, timestamp)
+        if hand_landmarks is not None:
+            gesture = self.gesture_recognizer.recognize_gesture(hand_landmarks)
+        elif not self.result_pending:
+            self.gesture_recognizer.hand_lost(self.result_timestamp)
+        self.frame_pool.end_frame()
+        return frame_rgb, gesture, hand_landmarks
+    
+    def prepare_frame(self, frame: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """BGR 转 RGB 写入 dst（默认为检测器自己的复用缓冲区），必要时整帧镜像"""
+        frame_rgb = dst if dst is not None else self.frame_pool.get("rgb", frame.shape, frame.dtype)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame_rgb)
+        if not self.mirror_landmarks:
+            cv2.flip(frame_rgb, 1, dst=frame_rgb)
+        return frame_rgb
+    
+    def detect(self, frame_rgb: np.ndarray, seq: int = 0, timestamp: float = 0.0) -> Optional[HandFrame]:
+        """只做关键点检测，不做手势识别；未检测到手时返回 None
+
+        返回的 HandFrame 带有其所属帧的 seq / timestamp，LIVE_STREAM 后端下可能早于本帧，
+        同样记录在 result_seq / result_timestamp 中。没有新结果时返回 None 且 result_pending 为 True。
+        """
+        timestamp = timestamp or time.perf_counter()
+        self.result_seq = seq
+        self.result_timestamp = timestamp
+        self.result_pending = False
+        hand_landmarks = None
+        if self.motion_gate is None or self.motion_gate.should_infer(frame_rgb):
+            if self.flow_tracker is not None:
+                hand_landmarks = self._detect_with_flow(frame_rgb)
+            else:
+                hand_landmarks = self._detect_backend(frame_rgb)
+            if self.motion_gate is not None and not self.result_pending:
+                self.motion_gate.report(hand_landmarks is not None)
+        if self.result_pending:
+            return None
+        if hand_landmarks is not None:
+            hand_landmarks.seq = self.result_seq
+            hand_landmarks.timestamp = self.result_timestamp
+        self.recorder.record(hand_landmarks, self.result_timestamp, self.result_seq)
+        return hand_landmarks
+    
+    def _detect_backend(self, frame_rgb: np.ndarray, live_wait: Optional[float] = None) -> Optional[HandFrame]:
+        if self.process_pool is not None:
+            return self._detect_process(frame_rgb)
+        if self.landmarker is not None:
+            return self._detect_new_api(frame_rgb, live_wait)
+        return self._detect_old_api(frame_rgb)
+    
+    def _detect_with_flow(self, frame_rgb: np.ndarray) -> Optional[HandFrame]:
+        """非关键帧用光流传播上一帧的关键点，跟丢或到达关键帧时运行推理并重新锚定"""
+        tracker = self.flow_tracker
+        height, width = frame_rgb.shape[:2]
+        gray = tracker.to_gray(frame_rgb)
+        tracker.update_interval(1.0 / max(1, self.camera_manager.fps))
+        if not tracker.needs_keyframe():
+            start = time.perf_counter()
+            points = tracker.propagate(gray)
+            if points is not None:
+                tracker.advance(gray, points, time.perf_counter() - start)
+                return self._landmarks_from_points(points, width, height)
+            tracker.mark_lost()
+        # 关键帧上先传播一次，与检测结果比较得到漂移量
+        predicted = tracker.propagate(gray) if tracker.has_points else None
+        frame_seq, frame_timestamp = self.result_seq, self.result_timestamp
+        start = time.perf_counter()
+        hand_landmarks = self._detect_backend(frame_rgb, self.keyframe_result_wait)
+        elapsed = time.perf_counter() - start
+        if self.result_pending or self.result_seq != frame_seq:
+            # LIVE_STREAM 结果属于更早的帧或尚未返回，不能锚定到本帧的灰度图，本帧按传播帧处理
+            if predicted is not None:
+                self.result_seq, self.result_timestamp = frame_seq, frame_timestamp
+                self.result_pending = False
+                tracker.advance(gray, predicted, time.perf_counter() - start)
+                return self._landmarks_from_points(predicted, width, height)
+            if tracker.has_points:
+                tracker.mark_lost()
+            # 没有可传播的轨迹：原样返回过期结果（带其所属帧的 seq），不锚定
+            return hand_landmarks
+        points = None
+        if hand_landmarks is not None:
+            # 光流在 frame_rgb 上计算，需要镜像前的像素坐标
+            points = hand_landmarks.landmarks[:, :2] * (width, height)
+            if self.mirror_landmarks:
+                points[:, 0] = width - points[:, 0]
+            self._keyframe_z = hand_landmarks.landmarks[:, 2].copy()
+            self._keyframe_handedness = hand_landmarks.handedness
+            self._keyframe_score = hand_landmarks.score
+        tracker.anchor(gray, points, elapsed, predicted)
+        return hand_landmarks
+    
+    def _landmarks_from_points(self, points: np.ndarray, width: int, height: int) -> HandFrame:
+        """传播得到的像素坐标转回归一化关键点，z 与左右手沿用最近的关键帧"""
+        landmarks = np.empty((len(points), 3), dtype=np.float32)
+        landmarks[:, 0] = points[:, 0] / width
+        landmarks[:, 1] = points[:, 1] / height
+        landmarks[:, 2] = self._keyframe_z
+        if self.mirror_landmarks:
+            landmarks[:, 0] = 1.0 - landmarks[:, 0]
+        self.handedness = self._keyframe_handedness
+        return HandFrame(landmarks, self._keyframe_handedness, self._keyframe_score)
+    
+    def _finish_detection(self, hand_landmarks: HandFrame) -> HandFrame:
+        """检测器边界的统一出口：按需镜像并记录左右手"""
+        if self.mirror_landmarks:
+            hand_landmarks.mirror()
+        self.handedness = hand_landmarks.handedness
+        return hand_landmarks
     
-    def _process_frame_old_api(self, frame: np.ndarray) -> Tuple[np.ndarray, str, Any]:
+    def _top_handedness(self, results: Any) -> Tuple[Optional[str], float]:
+        if not results.multi_handedness:
+            return None, 0.0
+        classification = results.multi_handedness[0].classification[0]
+        return classification.label, classification.score
+    
+    def _detect_old_api(self, frame_rgb: np.ndarray) -> Optional[HandFrame]:
         try:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self.handedness = None
             if not self.hands_detector:
-                return frame, "无", None
-            results = self.hands_detector.process(frame_rgb)
-            
-            gesture = "无"
+                return None
             hand_landmarks = None
-            if results.multi_hand_landmarks:
-                hand_landmarks = results.multi_hand_landmarks[0]
-                gesture = self.gesture_recognizer.recognize_gesture(hand_landmarks)
-            return frame, gesture, hand_landmarks
+            if self.roi_tracking and self._roi is not None:
+                hand_landmarks = self._detect_roi(frame_rgb)
+                if hand_landmarks is None:
+                    # 跟丢了，本帧立即回退到整帧检测
+                    self.roi_stats['fallbacks'] += 1
+                    self._roi = None
+            if hand_landmarks is None:
+                results = self.hands_detector.process(frame_rgb)
+                self.roi_stats['full_frames'] += 1
+                self.roi_stats['input_pixels'] += frame_rgb.shape[0] * frame_rgb.shape[1]
+                self.roi_stats['frame_pixels'] += frame_rgb.shape[0] * frame_rgb.shape[1]
+                if not results.multi_hand_landmarks:
+                    return None
+                handedness, score = self._top_handedness(results)
+                hand_landmarks = HandFrame.from_landmark_list(results.multi_hand_landmarks[0], handedness, score)
+            if self.roi_tracking:
+                # ROI 用镜像前的坐标计算，与 frame_rgb 一致；score 是左右手分类得分，不反映检测质量，不作为依据
+                self._roi = self._compute_roi(hand_landmarks, frame_rgb.shape) if self._roi_box_plausible(hand_landmarks, frame_rgb.shape) else None
+            return self._finish_detection(hand_landmarks)
         except Exception as e:
             print(f"帧处理出错: {e}")
-            return frame, "无", None
+            return None
+    
+    def _roi_box_plausible(self, hand_landmarks: HandFrame, shape: Tuple[int, ...]) -> bool:
+        """检测到关键点后，包围盒大部分在画面内且大小合理时才在下一帧沿用 ROI"""
+        height, width = shape[:2]
+        points = hand_landmarks.landmarks[:, :2]
+        if not np.isfinite(points).all():
+            return False
+        inside = ((points >= -0.05) & (points <= 1.05)).all(axis=1).mean()
+        if inside < 0.9:
+            return False
+        box = (points.max(axis=0) - points.min(axis=0)) * (width, height)
+        box_size = float(box.max()) / min(width, height)
+        return self.roi_min_box <= box_size <= self.roi_max_box
+    
+    def _compute_roi(self, hand_landmarks: HandFrame, shape: Tuple[int, ...]) -> Tuple[int, int, int]:
+        """以关键点包围盒为中心、四周留白的正方形区域 (x0, y0, 边长)，限制在画面内"""
+        height, width = shape[:2]
+        points = hand_landmarks.landmarks[:, :2] * (width, height)
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+        box_size = float((high - low).max())
+        side = int(box_size * (1 + 2 * self.roi_padding))
+        side = min(max(side, self.roi_min_size), width, height)
+        center_x, center_y = (low + high) / 2
+        x0 = int(min(max(center_x - side / 2, 0), width - side))
+        y0 = int(min(max(center_y - side / 2, 0), height - side))
+        return x0, y0, side
+    
+    def _detect_roi(self, frame_rgb: np.ndarray) -> Optional[HandFrame]:
+        """在裁剪区域上推理，并把关键点映射回整帧的归一化坐标"""
+        height, width = frame_rgb.shape[:2]
+        x0, y0, side = self._roi
+        if x0 + side > width or y0 + side > height:
+            return None
+        if self.roi_hands_detector is None:
+            # 独立的实例，避免整帧与裁剪区域交替输入打乱 MediaPipe 的跟踪状态
+            self.roi_hands_detector = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=1,
+                min_detection_confidence=self.detection_confidence,
+                min_tracking_confidence=self.tracking_confidence
+            )
+        size = self.roi_input_size
+        roi_input = self.frame_pool.get("roi", (size, size, 3), frame_rgb.dtype)
+        interpolation = cv2.INTER_AREA if side > size else cv2.INTER_LINEAR
+        cv2.resize(frame_rgb[y0:y0 + side, x0:x0 + side], (size, size), dst=roi_input, interpolation=interpolation)
+        results = self.roi_hands_detector.process(roi_input)
+        self.roi_stats['roi_frames'] += 1
+        self.roi_stats['total_crop_side'] += side
+        self.roi_stats['input_pixels'] += size * size
+        self.roi_stats['frame_pixels'] += width * height
+        if not results.multi_hand_landmarks:
+            return None
+        handedness, score = self._top_handedness(results)
+        hand_landmarks = HandFrame.from_landmark_list(results.multi_hand_landmarks[0], handedness, score)
+        landmarks = hand_landmarks.landmarks
+        landmarks[:, 0] = (x0 + landmarks[:, 0] * side) / width
+        landmarks[:, 1] = (y0 + landmarks[:, 1] * side) / height
+        landmarks[:, 2] *= side / width
+        return hand_landmarks
+    
+    def _reset_roi_stats(self):
+        self.roi_stats = {
+            'roi_frames': 0,
+            'full_frames': 0,
+            'fallbacks': 0,
+            'total_crop_side': 0,
+            'input_pixels': 0,
+            'frame_pixels': 0
+        }
+    
+    def get_roi_stats(self) -> dict:
+        stats = self.roi_stats
+        return {
+            'enabled': self.roi_tracking,
+            'roi_frames': stats['roi_frames'],
+            'full_frames': stats['full_frames'],
+            'fallbacks': stats['fallbacks'],
+            'fallback_rate': stats['fallbacks'] / max(1, stats['roi_frames']),
+            'avg_crop_size': stats['total_crop_side'] / max(1, stats['roi_frames']),
+            # 实际送入模型的像素数占整帧像素数的比例
+            'input_pixel_ratio': stats['input_pixels'] / max(1, stats['frame_pixels'])
+        }
+    
+    def _next_timestamp_ms(self, capture_timestamp: float) -> int:
+        # 取自帧的采集时间戳，与结果匹配用同一时钟；detect_async 要求时间戳严格递增
+        timestamp_ms = max(int(round(capture_timestamp * 1000)), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+    
+    def _on_live_stream_result(self, result: Any, output_image: Any, timestamp_ms: int):
+        """LIVE_STREAM 结果回调，在 MediaPipe 的线程中执行"""
+        points = None
+        handedness = None
+        score = 0.0
+        if result.hand_landmarks:
+            points = np.array([(p.x, p.y, p.z) for p in result.hand_landmarks[0]], dtype=np.float32)
+            if result.handedness:
+                handedness = result.handedness[0][0].category_name
+                score = result.handedness[0][0].score
+        now = time.perf_counter()
+        with self._live_condition:
+            pending = self._live_pending.pop(timestamp_ms, None)
+            # 早于本结果仍未返回的帧已被 MediaPipe 跳过
+            for stale_timestamp in [t for t in self._live_pending if t < timestamp_ms]:
+                del self._live_pending[stale_timestamp]
+                self.live_stats['skipped'] += 1
+            if pending is None:
+                # 重置之前提交的帧，无法对应到采集序号
+                return
+            submitted_at, seq, capture_timestamp = pending
+            self.live_stats['total_latency'] += now - submitted_at
+            self.live_stats['completed'] += 1
+            self._live_latest = (timestamp_ms, seq, capture_timestamp, points, handedness, score)
+            self._live_condition.notify_all()
+    
+    def _detect_new_api(self, frame_rgb: np.ndarray, wait: Optional[float] = None) -> Optional[HandFrame]:
+        """异步提交本帧，返回尚未交付过的最新结果，并把 result_seq / result_timestamp 设为该结果所属的帧
+
+        wait 为等待本帧结果的最长时间，缺省为 live_stream_wait。
+        """
+        try:
+            self.handedness = None
+            seq, capture_timestamp = self.result_seq, self.result_timestamp
+            timestamp_ms = self._next_timestamp_ms(capture_timestamp)
+            # mp.Image 会拷贝像素数据，frame_rgb 缓冲区可立即复用
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+            with self._live_condition:
+                self._live_pending[timestamp_ms] = (time.perf_counter(), seq, capture_timestamp)
+                self.live_stats['submitted'] += 1
+            self.landmarker.detect_async(mp_image, timestamp_ms)
+            with self._live_condition:
+                wait = self.live_stream_wait if wait is None else wait
+                if wait > 0:
+                    self._live_condition.wait_for(
+                        lambda: self._live_latest is not None and self._live_latest[0] >= timestamp_ms,
+                        timeout=wait
+                    )
+                latest = self._live_latest
+                if latest is None or latest[0] <= self._live_delivered_ms:
+                    # 每个结果只交付一次，不把同一组关键点重复当作新帧
+                    self.result_pending = True
+                    return None
+                self._live_delivered_ms = latest[0]
+                if latest[0] == timestamp_ms:
+                    self.live_stats['matched'] += 1
+                else:
+                    self.live_stats['stale'] += 1
+            _, self.result_seq, self.result_timestamp, points, handedness, score = latest
+            if points is None:
+                return None
+            return self._finish_detection(HandFrame(points, handedness, score))
+        except Exception as e:
+            print(f"Tasks API 处理帧出错: {e}")
+            return None
+    
+    def _detect_process(self, frame_rgb: np.ndarray) -> Optional[HandFrame]:
+        try:
+            self.handedness = None
+            result = self.process_pool.infer(frame_rgb, stream_id=self.camera_manager.camera_index)
+            if self.process_pool.failed:
+                self._fallback_to_inline()
+                return None
+            if result is None or result['landmarks'] is None:
+                return None
+            return self._finish_detection(HandFrame(result['landmarks'], result['handedness'], result['score']))
+        except Exception as e:
+            print(f"推理进程处理帧出错: {e}")
+            return None
+    
+    def _fallback_to_inline(self):
+        """推理进程意外退出后改为本进程推理，后续帧不再等待进程池超时"""
+        print("推理进程已退出，回退到本进程推理")
+        self.cleanup_process_pool()
+        if self._init_old_api_detector():
+            self.active_backend = "inline"
+        else:
+            self.active_backend = None
+    
+    def get_live_stream_stats(self) -> Optional[dict]:
+        if self.landmarker is None:
+            return None
+        with self._live_condition:
+            stats = dict(self.live_stats)
+        stats['avg_latency_ms'] = stats.pop('total_latency') / max(1, stats['completed']) * 1000
+        return stats
     
-    def _process_frame_new_api(self, frame: np.ndarray) -> Tuple[np.ndarray, str, Any]:
-        return frame, "无", None
+    def get_debug_stats(self) -> dict:
+        capture = self.camera_manager.get_capture_stats()
+        frame_period = 1.0 / capture['capture_fps'] if capture['capture_fps'] > 0 else None
+        return {
+            'backend': self.active_backend,
+            'live_stream': self.get_live_stream_stats(),
+            'roi': self.get_roi_stats(),
+            'keyframes': self.flow_tracker.get_stats() if self.flow_tracker is not None else None,
+            'motion_gate': self.motion_gate.get_stats() if self.motion_gate is not None else None,
+            'skipped_duplicates': self.skipped_duplicates,
+            'capture': capture,
+            'debounce': self.gesture_recognizer.get_debounce_delays(frame_period),
+            'click_trigger': self.gesture_recognizer.click_trigger.get_stats() if self.gesture_recognizer.edge_clicks else None,
+            'temporal': self.gesture_recognizer.temporal.get_stats() if self.gesture_recognizer.temporal_gestures else None,
+            'detector_pool': self.frame_pool.get_stats(),
+            'inference': self.process_pool.get_stats() if self.process_pool is not None else None
+        }
     
     def cleanup(self):
         try:
             self.cleanup_detector()
+            self.cleanup_process_pool()
             self.camera_manager.release()
             self.gesture_recognizer.reset_stability()
             self.is_initialized = False
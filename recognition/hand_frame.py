@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+单帧手部检测结果
+关键点保存为 float32 (21, 3) 数组 (x, y, z 归一化坐标)，每帧只在检测器边界从 MediaPipe 结果转换一次，
+下游的识别、绘制、队列和录制都直接使用数组
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+class HandFrame:
+    __slots__ = ('landmarks', 'handedness', 'score', 'timestamp', 'seq')
+
+    def __init__(self, landmarks: np.ndarray, handedness: Optional[str] = None, score: float = 0.0,
+                 timestamp: float = 0.0, seq: int = 0):
+        self.landmarks = np.asarray(landmarks, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+        self.handedness = handedness
+        self.score = score
+        self.timestamp = timestamp
+        self.seq = seq
+
+    @classmethod
+    def from_landmark_list(cls, landmark_list: Any, handedness: Optional[str] = None,
+                           score: float = 0.0) -> "HandFrame":
+        """从 MediaPipe 的 NormalizedLandmarkList 或 Tasks API 的关键点列表转换"""
+        points = getattr(landmark_list, 'landmark', landmark_list)
+        landmarks = np.array([(point.x, point.y, point.z) for point in points], dtype=np.float32)
+        return cls(landmarks, handedness, score)
+
+    def mirror(self) -> "HandFrame":
+        """原地 x → 1 − x 镜像，并交换左右手标签"""
+        self.landmarks[:, 0] = 1.0 - self.landmarks[:, 0]
+        if self.handedness == "Left":
+            self.handedness = "Right"
+        elif self.handedness == "Right":
+            self.handedness = "Left"
+        return self
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    def __getstate__(self):
+        return (self.landmarks, self.handedness, self.score, self.timestamp, self.seq)
+
+    def __setstate__(self, state):
+        self.landmarks, self.handedness, self.score, self.timestamp, self.seq = state
+
+    def __repr__(self) -> str:
+        return f"HandFrame(seq={self.seq}, handedness={self.handedness}, score={self.score:.2f})"
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+独立进程中的 MediaPipe 推理
+帧通过 multiprocessing.shared_memory 环形槽位传给工作进程，只回传紧凑的关键点数组，
+推理不再与 Tk 主循环和 pynput 监听线程争抢 GIL
+"""
+
+import multiprocessing as mp_proc
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _inference_worker_main(worker_id: int, shm_name: str, slot_bytes: int,
+                           request_queue, result_queue, options: dict):
+    """工作进程入口，必须是模块级函数才能在 spawn 模式下被子进程导入"""
+    import mediapipe as mp
+    shm = shared_memory.SharedMemory(name=shm_name)
+    hands = None
+    try:
+        try:
+            hands = _create_hands(mp, options)
+        except Exception as e:
+            result_queue.put(('error', worker_id, str(e)))
+            return
+        result_queue.put(('ready', worker_id))
+        while True:
+            request = request_queue.get()
+            if request is None:
+                break
+            if request[0] == 'configure':
+                # 调整置信度时只重建 Hands，不重启进程；新实例创建失败时沿用旧的
+                try:
+                    options.update(request[1])
+                    rebuilt = _create_hands(mp, options)
+                    hands.close()
+                    hands = rebuilt
+                except Exception as e:
+                    print(f"推理进程 {worker_id} 重建检测器失败: {e}")
+                continue
+            request_id, slot, shape = request
+            start = time.perf_counter()
+            landmarks = None
+            handedness = None
+            score = 0.0
+            frame = None
+            try:
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+                results = hands.process(frame)
+                if results.multi_hand_landmarks:
+                    points = results.multi_hand_landmarks[0].landmark
+                    landmarks = np.array([(p.x, p.y, p.z) for p in points], dtype=np.float32)
+                    if results.multi_handedness:
+                        classification = results.multi_handedness[0].classification[0]
+                        handedness = classification.label
+                        score = classification.score
+            except Exception as e:
+                # 单帧出错只让这一帧没有结果，进程继续处理后续请求
+                print(f"推理进程 {worker_id} 处理帧出错: {e}")
+                landmarks = None
+                handedness = None
+                score = 0.0
+            # 不留指向共享内存的视图，退出时 shm.close 才不会因导出的缓冲区失败
+            frame = None
+            result_queue.put((request_id, landmarks, handedness, score, time.perf_counter() - start))
+    finally:
+        if hands is not None:
+            hands.close()
+        shm.close()
+
+
+def _create_hands(mp, options: dict):
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=options.get('max_num_hands', 1),
+        min_detection_confidence=options.get('detection_confidence', 0.7),
+        min_tracking_confidence=options.get('tracking_confidence', 0.7)
+    )
+
+
+class _WorkerHandle:
+    def __init__(self, worker_id: int, slot_count: int, slot_bytes: int, context):
+        self.worker_id = worker_id
+        self.slot_count = slot_count
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_count * slot_bytes)
+        self.request_queue = context.Queue()
+        self.result_queue = context.Queue()
+        self.process = None
+        self.next_slot = 0
+        self.acquired: Optional[Tuple[int, np.ndarray]] = None
+        # 已发出、尚未收到回复的请求 → 槽位；回复到达前工作进程可能仍在读这个槽位，不能复用
+        self.in_flight: Dict[int, int] = {}
+
+    def slot_view(self, slot: int, shape: Tuple[int, ...]) -> np.ndarray:
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def next_free_slot(self) -> Optional[int]:
+        busy = set(self.in_flight.values())
+        for _ in range(self.slot_count):
+            slot = self.next_slot
+            self.next_slot = (slot + 1) % self.slot_count
+            if slot not in busy:
+                return slot
+        return None
+
+    def close(self):
+        self.acquired = None
+        self.in_flight.clear()
+        # 预览等处仍持有槽位视图时 close 会抛 BufferError，映射在视图释放后回收；unlink 总要执行，否则 /dev/shm 泄漏
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+        except Exception as e:
+            print(f"关闭共享内存出错: {e}")
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"删除共享内存出错: {e}")
+
+
+class ProcessInferencePool:
+    def __init__(self, num_workers: int = 1, slots_per_worker: int = 3,
+                 max_frame_shape: Tuple[int, int, int] = (1080, 1920, 3),
+                 detection_confidence: float = 0.7, tracking_confidence: float = 0.7,
+                 max_num_hands: int = 1, start_timeout: float = 30.0):
+        self.num_workers = max(1, num_workers)
+        self.slots_per_worker = max(2, slots_per_worker)
+        self.slot_bytes = int(np.prod(max_frame_shape))
+        self.options = {
+            'detection_confidence': detection_confidence,
+            'tracking_confidence': tracking_confidence,
+            'max_num_hands': max_num_hands
+        }
+        self.start_timeout = start_timeout
+        self.context = mp_proc.get_context("spawn")
+        self.workers: List[_WorkerHandle] = []
+        self.is_running = False
+        # 工作进程意外退出后置为 True，调用方应改用本进程推理
+        self.failed = False
+        self._request_id = 0
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.frames = 0
+        self.timeouts = 0
+        self.busy_drops = 0
+        self.frame_copies = 0
+        self.total_roundtrip = 0.0
+        self.total_inference = 0.0
+
+    def start(self) -> bool:
+        if self.is_running:
+            return True
+        try:
+            for worker_id in range(self.num_workers):
+                worker = _WorkerHandle(worker_id, self.slots_per_worker, self.slot_bytes, self.context)
+                worker.process = self.context.Process(
+                    target=_inference_worker_main,
+                    args=(worker_id, worker.shm.name, self.slot_bytes,
+                          worker.request_queue, worker.result_queue, self.options),
+                    daemon=True
+                )
+                worker.process.start()
+                self.workers.append(worker)
+            for worker in self.workers:
+                message = worker.result_queue.get(timeout=self.start_timeout)
+                if message[0] != 'ready':
+                    raise RuntimeError(f"推理进程 {worker.worker_id} 启动失败: {message[-1]}")
+            self.is_running = True
+            self.failed = False
+            self._reset_stats()
+            print(f"推理进程池已启动 ({self.num_workers} 个进程)")
+            return True
+        except Exception as e:
+            print(f"推理进程池启动失败: {e}")
+            self.stop()
+            return False
+
+    def stop(self):
+        self.is_running = False
+        for worker in self.workers:
+            try:
+                worker.request_queue.put(None)
+                if worker.process is not None:
+                    worker.process.join(timeout=2.0)
+                    if worker.process.is_alive():
+                        worker.process.terminate()
+            except Exception as e:
+                print(f"停止推理进程出错: {e}")
+            worker.close()
+        self.workers = []
+
+    def update_options(self, detection_confidence: float, tracking_confidence: float):
+        self.options['detection_confidence'] = detection_confidence
+        self.options['tracking_confidence'] = tracking_confidence
+        for worker in self.workers:
+            worker.request_queue.put(('configure', dict(self.options)))
+
+    def _worker_for(self, stream_id: int) -> _WorkerHandle:
+        # 同一路视频固定由同一个进程处理，保持 MediaPipe 的跟踪状态
+        return self.workers[stream_id % len(self.workers)]
+
+    def acquire_frame(self, shape: Tuple[int, ...], stream_id: int = 0) -> Optional[np.ndarray]:
+        """取得下一个空闲共享内存槽位的视图，调用方直接写入后交给 infer，可省去一次拷贝；没有空闲槽位时返回 None"""
+        if not self.is_running or int(np.prod(shape)) > self.slot_bytes:
+            return None
+        worker = self._worker_for(stream_id)
+        self._drain_late_replies(worker)
+        slot = worker.next_free_slot()
+        if slot is None:
+            return None
+        view = worker.slot_view(slot, tuple(shape))
+        worker.acquired = (slot, view)
+        return view
+
+    def _drain_late_replies(self, worker: _WorkerHandle):
+        """收取超时请求迟到的回复，释放它们占用的槽位"""
+        while worker.in_flight:
+            try:
+                message = worker.result_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._handle_stray_message(worker, message)
+
+    def _handle_stray_message(self, worker: _WorkerHandle, message: tuple):
+        if message[0] == 'error':
+            print(f"推理进程出错: {message[-1]}")
+        else:
+            worker.in_flight.pop(message[0], None)
+
+    def _check_worker(self, worker: _WorkerHandle):
+        if worker.process is not None and not worker.process.is_alive():
+            print(f"推理进程 {worker.worker_id} 已退出 (exitcode={worker.process.exitcode})")
+            self.is_running = False
+            self.failed = True
+
+    def infer(self, frame_rgb: np.ndarray, stream_id: int = 0,
+              timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        if not self.is_running:
+            return None
+        worker = self._worker_for(stream_id)
+        if worker.acquired is not None and worker.acquired[1] is frame_rgb:
+            slot = worker.acquired[0]
+        else:
+            if int(np.prod(frame_rgb.shape)) > self.slot_bytes:
+                print(f"帧尺寸 {frame_rgb.shape} 超出共享内存槽位大小")
+                return None
+            view = self.acquire_frame(frame_rgb.shape, stream_id)
+            if view is None:
+                # 所有槽位都在等超时请求的回复，丢弃本帧
+                self.busy_drops += 1
+                self._check_worker(worker)
+                return None
+            np.copyto(view, frame_rgb)
+            self.frame_copies += 1
+            slot = worker.acquired[0]
+        worker.acquired = None
+
+        self._request_id += 1
+        request_id = self._request_id
+        start = time.perf_counter()
+        worker.in_flight[request_id] = slot
+        worker.request_queue.put((request_id, slot, tuple(frame_rgb.shape)))
+        deadline = start + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            try:
+                # 分段等待，工作进程退出时不必等满超时
+                message = worker.result_queue.get(timeout=max(0.0, min(remaining, 0.1)))
+            except queue.Empty:
+                self._check_worker(worker)
+                if self.failed:
+                    return None
+                if deadline - time.perf_counter() > 0:
+                    continue
+                # 槽位保留在 in_flight 中，直到迟到的回复被收取
+                self.timeouts += 1
+                return None
+            if message[0] == request_id:
+                worker.in_flight.pop(request_id, None)
+                break
+            # 超时请求迟到的结果，只释放槽位
+            self._handle_stray_message(worker, message)
+        roundtrip = time.perf_counter() - start
+        _, landmarks, handedness, score, inference_time = message
+        self.frames += 1
+        self.total_roundtrip += roundtrip
+        self.total_inference += inference_time
+        return {
+            'landmarks': landmarks,
+            'handedness': handedness,
+            'score': score,
+            'inference_ms': inference_time * 1000,
+            'ipc_ms': (roundtrip - inference_time) * 1000
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        frames = max(1, self.frames)
+        return {
+            'workers': len(self.workers),
+            'frames': self.frames,
+            'timeouts': self.timeouts,
+            'busy_drops': self.busy_drops,
+            'failed': self.failed,
+            'frame_copies': self.frame_copies,
+            'avg_roundtrip_ms': self.total_roundtrip / frames * 1000,
+            'avg_inference_ms': self.total_inference / frames * 1000,
+            'avg_ipc_ms': (self.total_roundtrip - self.total_inference) / frames * 1000
+        }
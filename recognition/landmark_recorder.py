@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+关键点录制与回放
+每帧记录 HandFrame 的 (21, 3) 关键点、采集时间戳和序号，没有检测到手的帧记为 NaN，
+保存为 .npz，可交给 GestureRecognizer.recognize_batch 离线重放
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .hand_frame import HandFrame, NUM_LANDMARKS
+
+
+class LandmarkRecorder:
+    def __init__(self):
+        self.is_recording = False
+        # 整段录制的手势标注，用于训练模板分类器
+        self.label = ""
+        # 录制在检测线程，保存在界面线程
+        self._lock = threading.Lock()
+        self._landmarks: List[np.ndarray] = []
+        self._timestamps: List[float] = []
+        self._seqs: List[int] = []
+        self._handedness: List[str] = []
+        self._empty = np.full((NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+
+    def start(self, label: Optional[str] = None):
+        self.clear()
+        self.label = label or ""
+        self.is_recording = True
+
+    def stop(self):
+        self.is_recording = False
+
+    def clear(self):
+        with self._lock:
+            self._landmarks.clear()
+            self._timestamps.clear()
+            self._seqs.clear()
+            self._handedness.clear()
+
+    def record(self, hand_frame: Optional[HandFrame], timestamp: float, seq: int = 0):
+        if not self.is_recording:
+            return
+        with self._lock:
+            if hand_frame is None:
+                self._landmarks.append(self._empty)
+                self._handedness.append("")
+            else:
+                self._landmarks.append(hand_frame.landmarks.copy())
+                self._handedness.append(hand_frame.handedness or "")
+            self._timestamps.append(timestamp)
+            self._seqs.append(seq)
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def save(self, path: Optional[str] = None, directory: str = "recordings") -> str:
+        if path is None:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, time.strftime("session_%Y%m%d_%H%M%S.npz"))
+        with self._lock:
+            landmarks = np.stack(self._landmarks) if self._landmarks else np.empty((0, NUM_LANDMARKS, 3), np.float32)
+            timestamps = np.asarray(self._timestamps, dtype=np.float64)
+            seqs = np.asarray(self._seqs, dtype=np.int64)
+            handedness = np.asarray(self._handedness)
+        np.savez_compressed(path, landmarks=landmarks, timestamps=timestamps, seqs=seqs, handedness=handedness,
+                            label=np.asarray(self.label))
+        return path
+
+
+def load_recording(path: str) -> dict:
+    """读取录制文件，返回 landmarks (N, 21, 3)、timestamps (N,)、seqs (N,)、handedness (N,)、label（标注，可能为空）"""
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
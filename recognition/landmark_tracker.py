@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+关键帧推理 + 光流传播
+MediaPipe 只在关键帧上运行，中间帧用金字塔 Lucas–Kanade 光流传播 21 个关键点，
+下一个关键帧到来时重新锚定，并记录传播结果相对检测结果的漂移
+"""
+
+import math
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from utils.frame_pool import FramePool
+
+
+class LandmarkFlowTracker:
+    def __init__(self, keyframe_interval: int = 3, adaptive: bool = False, max_interval: int = 8,
+                 win_size: int = 21, max_level: int = 3, max_lost_points: int = 4,
+                 max_fb_error: float = 2.0):
+        self.keyframe_interval = max(1, keyframe_interval)
+        # adaptive 为 True 时按推理与传播耗时自动选择间隔，使平均每帧耗时不超过摄像头帧间隔
+        self.adaptive = adaptive
+        self.max_interval = max_interval
+        self.lk_params = dict(
+            winSize=(win_size, win_size),
+            maxLevel=max_level,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+        )
+        self.max_lost_points = max_lost_points
+        self.max_fb_error = max_fb_error
+        self.frame_pool = FramePool("flow")
+        self._gray_index = 0
+        self.prev_gray: Optional[np.ndarray] = None
+        self.points: Optional[np.ndarray] = None
+        self.frames_since_keyframe = 0
+        self.avg_inference_time = 0.0
+        self.avg_propagation_time = 0.0
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.keyframes = 0
+        self.propagated_frames = 0
+        self.lost_tracks = 0
+        self.drift_samples = 0
+        self.total_drift = 0.0
+        self.max_drift = 0.0
+        self.last_drift = 0.0
+
+    def reset(self):
+        self.prev_gray = None
+        self.points = None
+        self.frames_since_keyframe = 0
+
+    @property
+    def has_points(self) -> bool:
+        return self.points is not None and self.prev_gray is not None
+
+    def to_gray(self, frame_rgb: np.ndarray) -> np.ndarray:
+        """转灰度写入两块交替复用的缓冲区，上一帧的灰度图保持不变"""
+        self._gray_index ^= 1
+        gray = self.frame_pool.get(f"gray_{self._gray_index}", frame_rgb.shape[:2], np.uint8)
+        cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2GRAY, dst=gray)
+        self.frame_pool.end_frame()
+        return gray
+
+    def update_interval(self, frame_period: float):
+        """自适应模式：N 帧中 1 帧推理、N−1 帧传播，要求平均耗时不超过 frame_period"""
+        if not self.adaptive or self.avg_inference_time <= 0:
+            return
+        if self.avg_inference_time <= frame_period:
+            self.keyframe_interval = 1
+            return
+        budget = frame_period - self.avg_propagation_time
+        if budget <= 0:
+            self.keyframe_interval = self.max_interval
+            return
+        interval = math.ceil((self.avg_inference_time - self.avg_propagation_time) / budget)
+        self.keyframe_interval = int(min(max(interval, 1), self.max_interval))
+
+    def needs_keyframe(self) -> bool:
+        return not self.has_points or self.frames_since_keyframe + 1 >= self.keyframe_interval
+
+    def propagate(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """把上一帧的关键点传播到 gray 上；跟丢的点过多时返回 None"""
+        if not self.has_points:
+            return None
+        prev_points = self.points.reshape(-1, 1, 2)
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, prev_points, None, **self.lk_params)
+        if next_points is None:
+            return None
+        # 前后向一致性检查，过滤漂到背景上的点
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, next_points, None, **self.lk_params)
+        fb_error = np.linalg.norm((back_points - prev_points).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < self.max_fb_error)
+        if np.count_nonzero(~good) > self.max_lost_points:
+            return None
+        points = next_points.reshape(-1, 2)
+        if not good.all():
+            # 个别失效点沿用有效点的平均位移
+            shift = (points[good] - self.points[good]).mean(axis=0)
+            points[~good] = self.points[~good] + shift
+        return points
+
+    def advance(self, gray: np.ndarray, points: np.ndarray, elapsed: float):
+        """中间帧：接受传播结果"""
+        self.prev_gray = gray
+        self.points = points
+        self.frames_since_keyframe += 1
+        self.propagated_frames += 1
+        self.avg_propagation_time = self._ema(self.avg_propagation_time, elapsed)
+
+    def anchor(self, gray: np.ndarray, points: Optional[np.ndarray], elapsed: float,
+               predicted: Optional[np.ndarray] = None):
+        """关键帧：用检测结果重新锚定；predicted 为同一帧的传播结果，用来计算漂移"""
+        self.keyframes += 1
+        self.avg_inference_time = self._ema(self.avg_inference_time, elapsed)
+        self.frames_since_keyframe = 0
+        if points is None:
+            self.reset()
+            return
+        if predicted is not None:
+            self.last_drift = float(np.linalg.norm(predicted - points, axis=1).mean())
+            self.drift_samples += 1
+            self.total_drift += self.last_drift
+            self.max_drift = max(self.max_drift, self.last_drift)
+        self.prev_gray = gray
+        self.points = points.astype(np.float32)
+
+    def mark_lost(self):
+        self.lost_tracks += 1
+        self.reset()
+
+    @staticmethod
+    def _ema(average: float, value: float, alpha: float = 0.2) -> float:
+        return value if average <= 0 else average + alpha * (value - average)
+
+    def get_stats(self) -> dict:
+        frames = self.keyframes + self.propagated_frames
+        return {
+            'keyframe_interval': self.keyframe_interval,
+            'adaptive': self.adaptive,
+            'keyframes': self.keyframes,
+            'propagated_frames': self.propagated_frames,
+            'inference_ratio': self.keyframes / frames if frames else 0.0,
+            'lost_tracks': self.lost_tracks,
+            'avg_drift_px': self.total_drift / self.drift_samples if self.drift_samples else 0.0,
+            'max_drift_px': self.max_drift,
+            'last_drift_px': self.last_drift,
+            'avg_inference_ms': self.avg_inference_time * 1000,
+            'avg_propagation_ms': self.avg_propagation_time * 1000
+        }
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+运动门控
+在极小的灰度缩略图上做帧差，画面里没有手也没有运动时让检测器进入空闲状态，
+只按较低的探测频率推理；一旦出现运动立即恢复全速
+"""
+
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from utils.frame_pool import FramePool
+
+
+class MotionGate:
+    ACTIVE = "active"
+    IDLE = "idle"
+
+    def __init__(self, thumb_size=(32, 24), motion_threshold: float = 4.0,
+                 idle_after: float = 2.0, probe_interval: float = 0.5):
+        self.thumb_size = thumb_size
+        # 缩略图平均灰度差超过该值视为有运动
+        self.motion_threshold = motion_threshold
+        # 无手且无运动持续多久后进入空闲
+        self.idle_after = idle_after
+        # 空闲时的探测间隔
+        self.probe_interval = probe_interval
+        self.frame_pool = FramePool("motion")
+        self._thumb_index = 0
+        self._prev_thumb: Optional[np.ndarray] = None
+        self.reset()
+
+    def reset(self):
+        now = time.perf_counter()
+        self.state = self.ACTIVE
+        self.last_activity = now
+        self.last_probe = 0.0
+        self.motion_level = 0.0
+        self._prev_thumb = None
+        self.frames = 0
+        self.inferred_frames = 0
+        self.idle_time = 0.0
+        self.start_time = now
+        self._last_update = now
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        self._thumb_index ^= 1
+        width, height = self.thumb_size
+        small = self.frame_pool.get("small", (height, width) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, (width, height), dst=small, interpolation=cv2.INTER_AREA)
+        thumb = self.frame_pool.get(f"thumb_{self._thumb_index}", (height, width), np.uint8)
+        if small.ndim == 3:
+            # 只用于帧差，RGB / BGR 顺序无关紧要
+            cv2.cvtColor(small, cv2.COLOR_RGB2GRAY, dst=thumb)
+        else:
+            thumb[:] = small
+        return thumb
+
+    def should_infer(self, frame: np.ndarray) -> bool:
+        """根据本帧的运动量决定是否运行推理"""
+        now = time.perf_counter()
+        if self.state == self.IDLE:
+            self.idle_time += now - self._last_update
+        self._last_update = now
+        self.frames += 1
+
+        thumb = self._thumbnail(frame)
+        if self._prev_thumb is not None and self._prev_thumb.shape == thumb.shape:
+            diff = self.frame_pool.get("diff", thumb.shape, np.uint8)
+            cv2.absdiff(thumb, self._prev_thumb, dst=diff)
+            self.motion_level = float(diff.mean())
+        else:
+            self.motion_level = self.motion_threshold
+        self._prev_thumb = thumb
+        self.frame_pool.end_frame()
+
+        if self.motion_level >= self.motion_threshold:
+            self.last_activity = now
+            self.state = self.ACTIVE
+        elif self.state == self.ACTIVE and now - self.last_activity >= self.idle_after:
+            self.state = self.IDLE
+
+        if self.state == self.ACTIVE or now - self.last_probe >= self.probe_interval:
+            self.last_probe = now
+            self.inferred_frames += 1
+            return True
+        return False
+
+    def report(self, hand_present: bool):
+        """推理后反馈是否检测到手，有手时保持全速"""
+        if hand_present:
+            self.last_activity = time.perf_counter()
+            self.state = self.ACTIVE
+
+    def get_stats(self) -> dict:
+        elapsed = max(1e-6, time.perf_counter() - self.start_time)
+        idle_time = self.idle_time
+        if self.state == self.IDLE:
+            idle_time += time.perf_counter() - self._last_update
+        return {
+            'state': self.state,
+            'motion_level': self.motion_level,
+            'frames': self.frames,
+            'inferred_frames': self.inferred_frames,
+            'skipped_frames': self.frames - self.inferred_frames,
+            # 实际运行推理的帧占比
+            'duty_cycle': self.inferred_frames / self.frames if self.frames else 1.0,
+            'idle_ratio': idle_time / elapsed,
+            'frame_pool': self.frame_pool.get_stats()
+        }
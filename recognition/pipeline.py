@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+多级流水线识别引擎
+capture → detect → recognize → act → render，每级一个工作线程，级间用有界队列连接，
+队列满时丢弃最旧的数据，保证下游总是处理最新的帧
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.frame_pool import FramePool
+
+
+class DropOldestQueue:
+    """有界队列，满时丢弃最旧的元素"""
+
+    def __init__(self, maxsize: int = 2):
+        self.maxsize = max(1, maxsize)
+        self._items = deque()
+        self._condition = threading.Condition()
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item: Any):
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify()
+
+    def get(self, timeout: float = 0.1) -> Optional[Any]:
+        with self._condition:
+            if not self._items:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def clear(self):
+        with self._condition:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class PipelineStage:
+    def __init__(self, name: str, func: Callable[[Any], Any],
+                 input_queue: Optional[DropOldestQueue] = None,
+                 output_queue: Optional[DropOldestQueue] = None):
+        # 没有输入队列的是源级，func 不带参数；func 返回 None 表示丢弃该帧
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.thread: Optional[threading.Thread] = None
+        self.processed = 0
+        self.filtered = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.start_time = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        elapsed = max(1e-6, time.perf_counter() - self.start_time) if self.start_time else 0.0
+        return {
+            'stage': self.name,
+            'processed': self.processed,
+            'filtered': self.filtered,
+            'errors': self.errors,
+            'throughput_fps': self.processed / elapsed if elapsed else 0.0,
+            'avg_stage_ms': self.busy_time / self.processed * 1000 if self.processed else 0.0,
+            'queue_depth': len(self.input_queue) if self.input_queue is not None else 0,
+            'max_queue_depth': self.input_queue.max_depth if self.input_queue is not None else 0,
+            'queue_dropped': self.input_queue.dropped if self.input_queue is not None else 0
+        }
+
+
+class RecognitionPipeline:
+    """每个 item 是一个字典: seq, timestamp, frame, hand_landmarks (HandFrame), gesture, hand_center, events（时序手势事件）"""
+
+    def __init__(self, capture: Callable[[], Optional[dict]],
+                 detect: Callable[[dict], Optional[dict]],
+                 recognize: Callable[[dict], Optional[dict]],
+                 act: Optional[Callable[[dict], Optional[dict]]] = None,
+                 render: Optional[Callable[[dict], Optional[dict]]] = None,
+                 queue_size: int = 2):
+        self.queue_size = queue_size
+        self.is_running = False
+        self.is_paused = False
+        self.completed = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+        self.stages: List[PipelineStage] = []
+        stage_funcs = [("capture", capture), ("detect", detect), ("recognize", recognize)]
+        if act is not None:
+            stage_funcs.append(("act", act))
+        if render is not None:
+            stage_funcs.append(("render", render))
+        previous_queue = None
+        for index, (name, func) in enumerate(stage_funcs):
+            output_queue = DropOldestQueue(queue_size) if index < len(stage_funcs) - 1 else None
+            self.stages.append(PipelineStage(name, func, previous_queue, output_queue))
+            previous_queue = output_queue
+
+    @staticmethod
+    def frame_ring_size(stage_count: int, queue_size: int) -> int:
+        """流水线中同时存活的帧数上限：每级各一帧在处理，加上各队列容量，再加一帧正在采集"""
+        return stage_count + 1 + queue_size * (stage_count - 1)
+
+    @classmethod
+    def from_components(cls, hand_detector, gesture_recognizer=None, mouse_controller=None,
+                        act: Optional[Callable[[dict], Optional[dict]]] = None,
+                        render: Optional[Callable[[dict], Optional[dict]]] = None,
+                        queue_size: int = 2) -> "RecognitionPipeline":
+        """用现有的 HandDetector / GestureRecognizer / MouseController 组装流水线
+
+        act 未指定时，由 mouse_controller.handle_gesture 执行手势；两者都为空时不设 act 级，
+        render 为空时不设 render 级，可在无界面环境下运行。
+        """
+        recognizer = gesture_recognizer or hand_detector.gesture_recognizer
+        camera_manager = hand_detector.camera_manager
+        stage_count = 3 + (act is not None or mouse_controller is not None) + (render is not None)
+        ring_size = cls.frame_ring_size(stage_count, queue_size)
+        # 采集级独占的环形缓冲区，帧在流出流水线之前不会被覆盖
+        frame_pool = FramePool("pipeline")
+        state = {'last_seq': 0, 'slot': 0}
+
+        def capture_stage():
+            frame, seq, timestamp = camera_manager.get_frame_packet(timeout=0.1, newer_than=state['last_seq'])
+            if frame is None or seq == state['last_seq']:
+                return None
+            state['last_seq'] = seq
+            state['slot'] = (state['slot'] + 1) % ring_size
+            frame_rgb = frame_pool.get(f"ring_{state['slot']}", frame.shape, frame.dtype)
+            hand_detector.prepare_frame(frame, dst=frame_rgb)
+            frame_pool.end_frame()
+            return {'seq': seq, 'timestamp': timestamp, 'frame': frame_rgb,
+                    'hand_landmarks': None, 'gesture': "无", 'hand_center': None, 'events': [],
+                    'result_pending': False, 'result_timestamp': timestamp}
+
+        def detect_stage(item):
+            item['hand_landmarks'] = hand_detector.detect(item['frame'], item['seq'], item['timestamp'])
+            # LIVE_STREAM 后端的结果可能属于更早的帧；没有新结果时不当作手丢失
+            item['result_pending'] = hand_detector.result_pending
+            item['result_timestamp'] = hand_detector.result_timestamp
+            return item
+
+        def recognize_stage(item):
+            if item['hand_landmarks'] is not None:
+                item['gesture'] = recognizer.recognize_gesture(item['hand_landmarks'])
+                item['hand_center'] = recognizer.get_hand_center()
+            elif not item['result_pending']:
+                recognizer.hand_lost(item['result_timestamp'])
+            item['events'] = recognizer.pop_temporal_events()
+            return item
+
+        if act is None and mouse_controller is not None:
+            def act(item):
+                if item['result_pending']:
+                    return item
+                mouse_controller.handle_gesture(item['gesture'], item['hand_center'])
+                for event in item['events']:
+                    mouse_controller.handle_gesture(event['gesture'], item['hand_center'])
+                return item
+
+        pipeline = cls(capture_stage, detect_stage, recognize_stage, act, render, queue_size)
+        pipeline.frame_pool = frame_pool
+        return pipeline
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.completed = 0
+        self.total_latency = 0.0
+        for stage in self.stages:
+            stage.start_time = time.perf_counter()
+            stage.thread = threading.Thread(target=self._run_stage, args=(stage,), daemon=True)
+            stage.thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self.is_running = False
+        for stage in self.stages:
+            if stage.thread and stage.thread is not threading.current_thread():
+                stage.thread.join(timeout)
+            stage.thread = None
+            if stage.input_queue is not None:
+                stage.input_queue.clear()
+
+    def set_paused(self, paused: bool):
+        self.is_paused = paused
+
+    def _run_stage(self, stage: PipelineStage):
+        is_source = stage.input_queue is None
+        while self.is_running:
+            if is_source:
+                if self.is_paused:
+                    time.sleep(0.05)
+                    continue
+                item = None
+            else:
+                item = stage.input_queue.get(timeout=0.1)
+                if item is None:
+                    continue
+            start = time.perf_counter()
+            try:
+                result = stage.func() if is_source else stage.func(item)
+            except Exception as e:
+                stage.errors += 1
+                print(f"流水线 {stage.name} 级出错: {e}")
+                continue
+            if result is None:
+                if is_source:
+                    # 没有新帧，稍作等待避免空转
+                    time.sleep(0.002)
+                else:
+                    stage.filtered += 1
+                continue
+            end = time.perf_counter()
+            stage.busy_time += end - start
+            stage.processed += 1
+            if stage.output_queue is not None:
+                stage.output_queue.put(result)
+            else:
+                self.completed += 1
+                self.last_latency = end - result.get('timestamp', end)
+                self.total_latency += self.last_latency
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.is_running,
+            'completed': self.completed,
+            'last_latency_ms': self.last_latency * 1000,
+            'avg_latency_ms': self.total_latency / self.completed * 1000 if self.completed else 0.0,
+            'stages': [stage.get_stats() for stage in self.stages]
+        }
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+模板匹配手势分类
+关键点先做平移（手腕为原点）、缩放（手腕到中指根为单位长度）和旋转（手腕→中指根朝上）归一化，
+展平成 63 维 float32 向量；分类时对全部模板做向量化暴力最近邻，取前 k 个按距离顺序加权投票。
+模板来自带标注的关键点录制，离线训练后保存为 .npz，运行时只做查找。
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .hand_frame import NUM_LANDMARKS
+
+WRIST = 0
+MIDDLE_MCP = 9
+TEMPLATE_DIM = NUM_LANDMARKS * 3
+# 批量查询时每块的查询数，限制 (块, 模板数) 距离矩阵的内存
+QUERY_CHUNK = 1024
+
+
+def normalize_landmarks(landmarks: np.ndarray) -> np.ndarray:
+    """(..., 21, 3) 关键点 → (..., 63) 平移、缩放、旋转归一化后的向量"""
+    points = np.asarray(landmarks, dtype=np.float32)
+    centered = points - points[..., WRIST:WRIST + 1, :]
+    axis = centered[..., MIDDLE_MCP, :2]
+    scale = np.maximum(np.sqrt((axis ** 2).sum(axis=-1)), 1e-6)
+    # 旋转使手腕→中指根指向 (0, -1)，即图像中的正上方
+    cos = -axis[..., 1] / scale
+    sin = -axis[..., 0] / scale
+    x = centered[..., 0]
+    y = centered[..., 1]
+    normalized = np.stack([
+        cos[..., None] * x - sin[..., None] * y,
+        sin[..., None] * x + cos[..., None] * y,
+        centered[..., 2],
+    ], axis=-1) / scale[..., None, None]
+    return normalized.reshape(points.shape[:-2] + (TEMPLATE_DIM,)).astype(np.float32, copy=False)
+
+
+class TemplateClassifier:
+    def __init__(self, k: int = 5, max_distance: Optional[float] = None):
+        self.k = k
+        # 最近模板距离超过 max_distance 时拒识，输出 "无"
+        self.max_distance = max_distance
+        self.labels = np.array([], dtype=object)
+        self.templates = np.empty((0, TEMPLATE_DIM), dtype=np.float32)
+        self.codes = np.empty(0, dtype=np.int64)
+        self._template_norms = np.empty(0, dtype=np.float32)
+        self._templates_t = self.templates.T
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def fit(self, landmarks: np.ndarray, labels: Sequence[str], max_per_class: Optional[int] = None) -> "TemplateClassifier":
+        """landmarks (N, 21, 3)、labels (N,)；max_per_class 按等间隔抽样限制每类模板数"""
+        vectors = normalize_landmarks(landmarks)
+        labels = np.asarray(labels, dtype=object)
+        valid = ~np.isnan(vectors).any(axis=1)
+        vectors, labels = vectors[valid], labels[valid]
+        names = sorted(set(labels.tolist()))
+        if not names:
+            raise ValueError("没有可用的模板样本")
+        keep = []
+        for name in names:
+            indices = np.flatnonzero(labels == name)
+            if max_per_class and len(indices) > max_per_class:
+                indices = indices[np.linspace(0, len(indices) - 1, max_per_class).astype(np.int64)]
+            keep.append(indices)
+        keep = np.concatenate(keep)
+        self.labels = np.array(names, dtype=object)
+        code_of = {name: code for code, name in enumerate(names)}
+        self._set_templates(vectors[keep], np.array([code_of[name] for name in labels[keep].tolist()], dtype=np.int64))
+        return self
+
+    def _set_templates(self, templates: np.ndarray, codes: np.ndarray):
+        self.templates = np.ascontiguousarray(templates, dtype=np.float32)
+        self.codes = codes
+        self._template_norms = (self.templates ** 2).sum(axis=1)
+        self._templates_t = np.ascontiguousarray(self.templates.T)
+
+    def _vote(self, nearest: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        """nearest (N, k) 模板下标，按距离排序；返回 (N,) 标签，平票时距离更近的一方胜出"""
+        count = len(nearest)
+        k = nearest.shape[1]
+        weights = 1.0 - np.arange(k, dtype=np.float64) * 1e-3
+        votes = np.zeros((count, len(self.labels)), dtype=np.float64)
+        np.add.at(votes, (np.repeat(np.arange(count), k), self.codes[nearest].ravel()), np.tile(weights, count))
+        result = self.labels[votes.argmax(axis=1)]
+        if self.max_distance is not None:
+            result[np.sqrt(np.maximum(distances[:, 0], 0.0)) > self.max_distance] = "无"
+        return result
+
+    def predict(self, landmarks: np.ndarray) -> np.ndarray:
+        """(N, 21, 3) → (N,) 手势标签；含 NaN 的帧输出 "无"。"""
+        queries = normalize_landmarks(landmarks)
+        result = np.full(len(queries), "无", dtype=object)
+        valid = np.flatnonzero(~np.isnan(queries).any(axis=1))
+        if not len(self.templates) or not len(valid):
+            return result
+        k = min(self.k, len(self.templates))
+        for start in range(0, len(valid), QUERY_CHUNK):
+            rows = valid[start:start + QUERY_CHUNK]
+            block = queries[rows]
+            distances = (block ** 2).sum(axis=1)[:, None] + self._template_norms[None, :] - 2.0 * (block @ self._templates_t)
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1)
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+            result[rows] = self._vote(nearest, nearest_distances)
+        return result
+
+    def predict_one(self, landmarks: np.ndarray) -> str:
+        """单帧 (21, 3) → 手势标签，实时路径"""
+        if not len(self.templates):
+            return "无"
+        query = normalize_landmarks(landmarks)
+        # 排序只需 |t|² - 2 t·q，|q|² 在比较距离阈值时再加
+        partial = self._template_norms - 2.0 * (query @ self._templates_t)
+        k = min(self.k, len(partial))
+        nearest = np.argpartition(partial, k - 1)[:k]
+        nearest = nearest[np.argsort(partial[nearest])]
+        if self.max_distance is not None:
+            distance = float(partial[nearest[0]] + query @ query)
+            if distance > self.max_distance ** 2:
+                return "无"
+        votes = np.bincount(self.codes[nearest], weights=1.0 - np.arange(k) * 1e-3, minlength=len(self.labels))
+        return self.labels[int(votes.argmax())]
+
+    def nearest_same_class_distances(self) -> np.ndarray:
+        """每个模板到同类其他模板的最近距离，用于估计拒识阈值"""
+        result = np.full(len(self.templates), np.inf, dtype=np.float32)
+        for start in range(0, len(self.templates), QUERY_CHUNK):
+            block = self.templates[start:start + QUERY_CHUNK]
+            distances = (block ** 2).sum(axis=1)[:, None] + self._template_norms[None, :] - 2.0 * (block @ self._templates_t)
+            same = self.codes[start:start + QUERY_CHUNK, None] == self.codes[None, :]
+            distances[~same] = np.inf
+            distances[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+            result[start:start + len(block)] = np.sqrt(np.maximum(distances.min(axis=1), 0.0))
+        return result
+
+    def evaluate(self, landmarks: np.ndarray, labels: Sequence[str]) -> dict:
+        predicted = self.predict(landmarks)
+        labels = np.asarray(labels, dtype=object)
+        names: List[str] = sorted(set(labels.tolist()) | set(predicted.tolist()))
+        index = {name: position for position, name in enumerate(names)}
+        confusion = np.zeros((len(names), len(names)), dtype=np.int64)
+        np.add.at(confusion, ([index[name] for name in labels.tolist()], [index[name] for name in predicted.tolist()]), 1)
+        return {
+            'accuracy': float((predicted == labels).mean()) if len(labels) else 0.0,
+            'labels': names,
+            'confusion': confusion,
+            'predicted': predicted
+        }
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            templates=self.templates,
+            codes=self.codes,
+            labels=np.asarray(self.labels.tolist()),
+            k=self.k,
+            max_distance=np.nan if self.max_distance is None else self.max_distance
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TemplateClassifier":
+        with np.load(path) as data:
+            max_distance = float(data['max_distance'])
+            classifier = cls(k=int(data['k']), max_distance=None if np.isnan(max_distance) else max_distance)
+            classifier.labels = np.array(data['labels'].tolist(), dtype=object)
+            classifier._set_templates(data['templates'], data['codes'].astype(np.int64))
+        return classifier
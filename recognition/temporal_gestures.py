@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+时序手势识别
+在逐帧关键点流上运行几个小状态机，每帧 O(1)，时间全部取采样时间戳:
+    双指捏合    两次捏合的间隔不超过 double_interval
+    拖拽        捏合保持 hold_time 后开始，松开或手丢失时结束
+    左/右/上/下滑  手掌中心在 max_duration 内沿一个方向移动超过 min_distance
+每个检测器记录判定延迟：从手势起点（第一次捏合、捏合开始、开始快速移动）到发出事件的时间。
+"""
+
+import math
+from typing import List, Optional
+
+from .gesture_features import FEATURE_INDEX
+
+DOUBLE_PINCH = "双指捏合"
+DRAG_START = "拖拽开始"
+DRAG_END = "拖拽结束"
+SWIPE_LEFT = "左滑"
+SWIPE_RIGHT = "右滑"
+SWIPE_UP = "上滑"
+SWIPE_DOWN = "下滑"
+TEMPORAL_GESTURES = (DOUBLE_PINCH, DRAG_START, DRAG_END, SWIPE_LEFT, SWIPE_RIGHT, SWIPE_UP, SWIPE_DOWN)
+
+PALM_CENTER = 9
+
+
+class _LatencyStats:
+    __slots__ = ('events', 'total', 'maximum')
+
+    def __init__(self):
+        self.events = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, latency: float):
+        self.events += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+
+    def to_dict(self) -> dict:
+        return {
+            'events': self.events,
+            'avg_latency_ms': self.total / self.events * 1000 if self.events else 0.0,
+            'max_latency_ms': self.maximum * 1000
+        }
+
+
+class PinchStateMachine:
+    """捏合状态，带滞回: 原始判定为点击时进入，距离超过 enter × exit_ratio 才松开"""
+
+    def __init__(self, exit_ratio: float = 1.6):
+        self.exit_ratio = exit_ratio
+        self.pinched = False
+        self.since = 0.0
+
+    def update(self, raw_gesture: str, distance: float, enter_threshold: float, timestamp: float) -> int:
+        """返回 1 表示本帧开始捏合，-1 表示本帧松开，0 表示状态不变"""
+        if not self.pinched:
+            if raw_gesture == "鼠标点击":
+                self.pinched = True
+                self.since = timestamp
+                return 1
+        elif distance > enter_threshold * self.exit_ratio:
+            self.pinched = False
+            return -1
+        return 0
+
+    def reset(self):
+        self.pinched = False
+
+
+class DoublePinchDetector:
+    def __init__(self, double_interval: float = 0.4):
+        self.double_interval = double_interval
+        self.first_pinch: Optional[float] = None
+        self.stats = _LatencyStats()
+
+    def update(self, pinch_edge: int, timestamp: float, events: list):
+        if pinch_edge != 1:
+            return
+        if self.first_pinch is not None and timestamp - self.first_pinch <= self.double_interval:
+            latency = timestamp - self.first_pinch
+            self.stats.add(latency)
+            events.append({'gesture': DOUBLE_PINCH, 'timestamp': timestamp, 'latency': latency})
+            self.first_pinch = None
+        else:
+            self.first_pinch = timestamp
+
+    def reset(self):
+        self.first_pinch = None
+
+
+class DragDetector:
+    def __init__(self, hold_time: float = 0.35):
+        self.hold_time = hold_time
+        self.dragging = False
+        self.stats = _LatencyStats()
+
+    def update(self, pinch: PinchStateMachine, pinch_edge: int, timestamp: float, events: list):
+        if self.dragging:
+            if pinch_edge == -1:
+                self.end(timestamp, events)
+        elif pinch.pinched and timestamp - pinch.since >= self.hold_time:
+            latency = timestamp - pinch.since
+            self.dragging = True
+            self.stats.add(latency)
+            events.append({'gesture': DRAG_START, 'timestamp': timestamp, 'latency': latency})
+
+    def end(self, timestamp: float, events: list):
+        if self.dragging:
+            self.dragging = False
+            events.append({'gesture': DRAG_END, 'timestamp': timestamp, 'latency': 0.0})
+
+
+class SwipeDetector:
+    """IDLE → TRACKING（速度超过 min_speed）→ 位移达到 min_distance 时发出事件 → 冷却 refractory 秒"""
+
+    def __init__(self, min_distance: float = 0.2, max_duration: float = 0.35, min_speed: float = 0.8,
+                 axis_ratio: float = 2.0, refractory: float = 0.4):
+        self.min_distance = min_distance
+        self.max_duration = max_duration
+        self.min_speed = min_speed
+        self.axis_ratio = axis_ratio
+        self.refractory = refractory
+        self.last_point: Optional[tuple] = None
+        self.start: Optional[tuple] = None
+        self.quiet_until = 0.0
+        self.stats = _LatencyStats()
+
+    def update(self, x: float, y: float, timestamp: float, events: list):
+        last = self.last_point
+        self.last_point = (timestamp, x, y)
+        if last is None or timestamp < self.quiet_until:
+            self.start = None
+            return
+        dt = timestamp - last[0]
+        if dt <= 0:
+            return
+        speed = math.hypot(x - last[1], y - last[2]) / dt
+        if self.start is None:
+            if speed >= self.min_speed:
+                self.start = last
+            return
+        elapsed = timestamp - self.start[0]
+        if elapsed > self.max_duration or speed < self.min_speed * 0.5:
+            self.start = None
+            return
+        dx = x - self.start[1]
+        dy = y - self.start[2]
+        if max(abs(dx), abs(dy)) < self.min_distance:
+            return
+        if abs(dx) >= abs(dy) * self.axis_ratio:
+            gesture = SWIPE_RIGHT if dx > 0 else SWIPE_LEFT
+        elif abs(dy) >= abs(dx) * self.axis_ratio:
+            gesture = SWIPE_DOWN if dy > 0 else SWIPE_UP
+        else:
+            return
+        self.stats.add(elapsed)
+        events.append({'gesture': gesture, 'timestamp': timestamp, 'latency': elapsed})
+        self.start = None
+        self.quiet_until = timestamp + self.refractory
+
+    def reset(self):
+        self.last_point = None
+        self.start = None
+
+
+class TemporalGestureRecognizer:
+    def __init__(self):
+        self.pinch = PinchStateMachine()
+        self.double_pinch = DoublePinchDetector()
+        self.drag = DragDetector()
+        self.swipe = SwipeDetector()
+
+    def update(self, raw_gesture: str, features: list, palm: tuple, enter_threshold: float,
+               timestamp: float) -> List[dict]:
+        """输入本帧原始手势、特征列表和手掌中心，返回本帧产生的事件 [{'gesture', 'timestamp', 'latency'}]"""
+        events = []
+        edge = self.pinch.update(raw_gesture, features[FEATURE_INDEX['thumb_index_tip']], enter_threshold, timestamp)
+        self.double_pinch.update(edge, timestamp, events)
+        self.drag.update(self.pinch, edge, timestamp, events)
+        if self.pinch.pinched:
+            # 捏合和拖拽期间的移动不算滑动
+            self.swipe.reset()
+        else:
+            self.swipe.update(palm[0], palm[1], timestamp, events)
+        return events
+
+    def lost(self, timestamp: float) -> List[dict]:
+        """手丢失：结束拖拽，清空捏合与滑动状态"""
+        events = []
+        self.drag.end(timestamp, events)
+        self.pinch.reset()
+        self.swipe.reset()
+        return events
+
+    def reset(self):
+        self.pinch.reset()
+        self.double_pinch.reset()
+        self.drag.dragging = False
+        self.swipe.reset()
+
+    @property
+    def dragging(self) -> bool:
+        return self.drag.dragging
+
+    def get_stats(self) -> dict:
+        return {
+            'double_pinch': self.double_pinch.stats.to_dict(),
+            'drag': self.drag.stats.to_dict(),
+            'swipe': self.swipe.stats.to_dict(),
+            'dragging': self.drag.dragging
+        }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""CameraCapabilityProbe 在假采集后端上的行为，不需要真实摄像头"""
+
+import os
+import sys
+import unittest
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.camera_capabilities import CameraCapabilityProbe
+
+
+class FakeCapture:
+    """只接受 supported 中的分辨率，其余设置保持原值，与多数 UVC 驱动一致"""
+
+    def __init__(self, supported, opened=True):
+        self.supported = supported
+        self.opened = opened
+        self.props = {cv2.CAP_PROP_FRAME_WIDTH: 640.0, cv2.CAP_PROP_FRAME_HEIGHT: 480.0, cv2.CAP_PROP_FPS: 30.0}
+        self._pending_width = None
+        self.released = False
+
+    def isOpened(self):
+        return self.opened
+
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self._pending_width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT and (self._pending_width, int(value)) in self.supported:
+            self.props[cv2.CAP_PROP_FRAME_WIDTH] = float(self._pending_width)
+            self.props[cv2.CAP_PROP_FRAME_HEIGHT] = float(value)
+        return True
+
+    def release(self):
+        self.released = True
+
+
+class CameraCapabilityProbeTest(unittest.TestCase):
+    def setUp(self):
+        self.captures = []
+        self.active = set()
+
+    def _factory(self, supported, opened=True):
+        def open_capture(index):
+            capture = FakeCapture(supported, opened)
+            self.captures.append(capture)
+            return capture
+        return open_capture
+
+    def test_probes_resolutions_on_single_handle(self):
+        probe = CameraCapabilityProbe(self._factory({(640, 480), (1280, 720), (1920, 1080)}), use_v4l2=False)
+        capabilities = probe.probe(0)
+        self.assertEqual(capabilities['supported_resolutions'], [(640, 480), (1280, 720), (1920, 1080)])
+        self.assertEqual(capabilities['max_fps'], 30)
+        self.assertEqual(capabilities['source'], 'probe')
+        self.assertEqual(probe.device_opens, 1)
+        capture = self.captures[0]
+        self.assertTrue(capture.released)
+        # 探测结束后恢复原始分辨率
+        self.assertEqual(capture.get(cv2.CAP_PROP_FRAME_WIDTH), 640.0)
+        self.assertEqual(capture.get(cv2.CAP_PROP_FRAME_HEIGHT), 480.0)
+
+    def test_result_is_cached(self):
+        probe = CameraCapabilityProbe(self._factory({(640, 480)}), use_v4l2=False)
+        first = probe.probe(0)
+        self.assertIs(probe.probe(0), first)
+        self.assertEqual(probe.device_opens, 1)
+        probe.probe(0, refresh=True)
+        self.assertEqual(probe.device_opens, 2)
+
+    def test_unopened_device_is_not_cached(self):
+        probe = CameraCapabilityProbe(self._factory(set(), opened=False), use_v4l2=False)
+        self.assertEqual(probe.probe(1), {})
+        self.assertNotIn(1, probe.capability_cache)
+
+    def test_active_device_is_not_opened(self):
+        probe = CameraCapabilityProbe(self._factory({(640, 480)}), use_v4l2=False,
+                                      is_device_active=lambda index: index in self.active)
+        self.active.add(0)
+        self.assertIn('error', probe.probe(0))
+        self.assertEqual(probe.device_opens, 0)
+        self.active.clear()
+        cached = probe.probe(0)
+        self.active.add(0)
+        # 使用中的设备即使要求刷新也只返回缓存
+        self.assertIs(probe.probe(0, refresh=True), cached)
+        self.assertEqual(probe.device_opens, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
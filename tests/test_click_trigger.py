@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""PinchClickTrigger 的待命、提交、解除待命、手丢失与慢速捏合补发，逐帧检查点击出现的位置"""
+
+import os
+import sys
+import unittest
+
+try:
+    # recognition/__init__ 会导入 HandDetector
+    import mediapipe  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("需要 mediapipe")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.click_trigger import PinchClickTrigger
+
+CLICK, RIGHT, MOVE = "鼠标点击", "鼠标右键", "鼠标移动"
+ENTER = 0.05          # 退出阈值为 0.08
+FRAME = 1.0 / 30
+OPEN = 0.2
+
+
+class PinchClickTriggerTest(unittest.TestCase):
+    def setUp(self):
+        self.trigger = PinchClickTrigger()
+        self.frame = 0
+
+    def run_frames(self, distances, stable=None):
+        """逐帧送入左键通道距离，右键通道保持张开；返回每帧的提交结果"""
+        events = []
+        for index, distance in enumerate(distances):
+            raw = CLICK if distance < ENTER else MOVE
+            stable_gesture = stable[index] if stable is not None else MOVE
+            events.append(self.trigger.update(raw, {CLICK: distance, RIGHT: OPEN}, ENTER,
+                                              self.frame * FRAME, stable_gesture))
+            self.frame += 1
+        return events
+
+    def test_fast_pinch_fires_on_crossing_frame_once(self):
+        events = self.run_frames([0.10, 0.10, 0.07, 0.04, 0.03, 0.03, 0.03])
+        self.assertEqual(events, [None, None, None, CLICK, None, None, None])
+        self.assertFalse(self.trigger.get_stats()['armed'][CLICK])
+
+    def test_not_armed_until_exit_threshold(self):
+        # 起始未待命，0.06 在进入与退出阈值之间不会待命
+        events = self.run_frames([0.06, 0.04])
+        self.assertEqual(events, [None, None])
+        self.assertEqual(self.trigger.get_stats()['fired'][CLICK], 0)
+
+    def test_rearm_requires_exit_threshold(self):
+        events = self.run_frames([0.10, 0.04, 0.06, 0.04, 0.10, 0.04])
+        # 松开到 0.06 不重新待命，第二次捏合不点击；松开到 0.10 后第三次捏合点击
+        self.assertEqual(events, [None, CLICK, None, None, None, CLICK])
+
+    def test_debounced_click_after_edge_is_suppressed(self):
+        stable = [MOVE, MOVE, MOVE, CLICK, CLICK, MOVE]
+        events = self.run_frames([0.10, 0.04, 0.03, 0.03, 0.03, 0.10], stable)
+        self.assertEqual(events, [None, CLICK, None, None, None, None])
+
+    def test_slow_pinch_falls_back_to_debounced_click(self):
+        # 每帧靠近 0.002，速度 0.06/s 低于 0.2/s，边沿不提交
+        distances = [0.10 - 0.002 * index for index in range(30)]
+        crossing = next(index for index, distance in enumerate(distances) if distance < ENTER)
+        entered = crossing + 2
+        stable = [CLICK if index >= entered else MOVE for index in range(len(distances))]
+        events = self.run_frames(distances, stable)
+        expected = [None] * len(distances)
+        expected[entered] = CLICK
+        self.assertEqual(events, expected)
+        stats = self.trigger.get_stats()
+        self.assertEqual(stats['rejected_slow'], 1)
+        self.assertEqual(stats['fallback'][CLICK], 1)
+
+    def test_release_during_debounce_release_does_not_refire(self):
+        stable = [MOVE, MOVE, CLICK, CLICK, CLICK, CLICK, MOVE]
+        # 第 4 帧松开并重新待命，去抖结果仍是点击，不应补发
+        events = self.run_frames([0.10, 0.04, 0.04, 0.10, 0.10, 0.10, 0.10], stable)
+        self.assertEqual(events, [None, CLICK, None, None, None, None, None])
+
+    def test_lost_keeps_armed_but_drops_speed(self):
+        self.run_frames([0.10, 0.10])
+        self.trigger.lost()
+        # 丢失后的第一帧没有上一帧距离，不计算速度也不解除待命
+        self.assertEqual(self.run_frames([0.04]), [None])
+        self.assertTrue(self.trigger.get_stats()['armed'][CLICK])
+        self.assertEqual(self.trigger.get_stats()['rejected_slow'], 0)
+
+    def test_reset_disarms(self):
+        self.run_frames([0.10])
+        self.trigger.reset()
+        self.assertEqual(self.run_frames([0.04]), [None])
+        self.assertFalse(self.trigger.get_stats()['armed'][CLICK])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""OneEuroFilter 的收敛、去抖与随 beta 变化的阶跃滞后"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+try:
+    # recognition/__init__ 会导入 HandDetector
+    import mediapipe  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("需要 mediapipe")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.cursor_filter import OneEuroFilter
+
+RATE = 60.0
+
+
+def step_settle_frames(cursor_filter, start=0.2, end=0.6, tolerance=0.01):
+    """静止 0.5 s 后阶跃，返回输出进入 end ± tolerance 所需的帧数"""
+    frame = 0
+    for frame in range(30):
+        cursor_filter.filter(start, start, frame / RATE)
+    for step in range(1, 600):
+        x, _ = cursor_filter.filter(end, start, (frame + step) / RATE)
+        if abs(x - end) < tolerance:
+            return step
+    return None
+
+
+class OneEuroFilterTest(unittest.TestCase):
+    def test_first_sample_passes_through(self):
+        self.assertEqual(OneEuroFilter().filter(0.3, 0.4, 1.0), (0.3, 0.4))
+
+    def test_constant_input_converges(self):
+        cursor_filter = OneEuroFilter()
+        cursor_filter.filter(0.2, 0.8, 0.0)
+        for frame in range(1, 181):
+            x, y = cursor_filter.filter(0.6, 0.3, frame / RATE)
+        self.assertAlmostEqual(x, 0.6, places=4)
+        self.assertAlmostEqual(y, 0.3, places=4)
+        self.assertLess(cursor_filter.get_stats()['speed'], 1e-3)
+
+    def test_jitter_is_reduced(self):
+        rng = np.random.default_rng(0)
+        samples = 0.5 + rng.normal(0.0, 0.003, size=(300, 2))
+        cursor_filter = OneEuroFilter()
+        output = np.array([cursor_filter.filter(x, y, frame / RATE) for frame, (x, y) in enumerate(samples)])
+        self.assertLess(output[60:].std(axis=0).max(), samples[60:].std(axis=0).min() / 2)
+
+    def test_step_lag_shrinks_with_beta(self):
+        settle = [step_settle_frames(OneEuroFilter(beta=beta)) for beta in (0.0, 5.0, 20.0, 80.0)]
+        self.assertNotIn(None, settle)
+        self.assertEqual(settle, sorted(settle, reverse=True))
+        self.assertLess(settle[-1], settle[0])
+
+    def test_update_parameters_applies_live(self):
+        cursor_filter = OneEuroFilter(beta=0.0)
+        cursor_filter.update_parameters(beta=80.0)
+        self.assertEqual(step_settle_frames(cursor_filter), step_settle_frames(OneEuroFilter(beta=80.0)))
+
+    def test_restarts_after_gap(self):
+        cursor_filter = OneEuroFilter(max_gap=0.5)
+        cursor_filter.filter(0.2, 0.2, 0.0)
+        cursor_filter.filter(0.2, 0.2, 1 / RATE)
+        # 手丢失 1 s 后重新出现，直接从新位置开始
+        self.assertEqual(cursor_filter.filter(0.8, 0.7, 1.0), (0.8, 0.7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""KalmanCursorPredictor 在匀速轨迹上按延迟外推"""
+
+import os
+import sys
+import unittest
+
+try:
+    # recognition/__init__ 会导入 HandDetector
+    import mediapipe  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("需要 mediapipe")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.cursor_predictor import KalmanCursorPredictor
+
+RATE = 60.0
+VELOCITY = (0.5, -0.2)
+START = (0.2, 0.7)
+
+
+def track(predictor, seconds=1.0):
+    """送入一段匀速轨迹，返回最后一帧的时间"""
+    timestamp = 0.0
+    for frame in range(int(seconds * RATE) + 1):
+        timestamp = frame / RATE
+        predictor.update(START[0] + VELOCITY[0] * timestamp, START[1] + VELOCITY[1] * timestamp, timestamp)
+    return timestamp
+
+
+def expected(timestamp):
+    return START[0] + VELOCITY[0] * timestamp, START[1] + VELOCITY[1] * timestamp
+
+
+class KalmanCursorPredictorTest(unittest.TestCase):
+    def test_no_prediction_before_measurement(self):
+        self.assertIsNone(KalmanCursorPredictor().predict())
+
+    def test_extrapolates_by_observed_latency(self):
+        for model in ("velocity", "acceleration"):
+            with self.subTest(model=model):
+                predictor = KalmanCursorPredictor(model)
+                last = track(predictor)
+                predictor.observe_latency(0.05)
+                x, y = predictor.predict()
+                target_x, target_y = expected(last + 0.05)
+                self.assertAlmostEqual(x, target_x, delta=1e-3)
+                self.assertAlmostEqual(y, target_y, delta=1e-3)
+                self.assertAlmostEqual(predictor.get_stats()['horizon_ms'], 50.0)
+
+    def test_fixed_horizon_overrides_latency(self):
+        predictor = KalmanCursorPredictor(horizon=0.03)
+        last = track(predictor)
+        predictor.observe_latency(0.1)
+        x, y = predictor.predict()
+        target_x, target_y = expected(last + 0.03)
+        self.assertAlmostEqual(x, target_x, delta=1e-3)
+        self.assertAlmostEqual(y, target_y, delta=1e-3)
+
+    def test_horizon_is_clamped(self):
+        predictor = KalmanCursorPredictor(max_horizon=0.15)
+        last = track(predictor)
+        x, _ = predictor.predict(horizon=1.0)
+        self.assertAlmostEqual(x, expected(last + 0.15)[0], delta=1e-3)
+
+    def test_zero_horizon_tracks_measurement(self):
+        predictor = KalmanCursorPredictor()
+        last = track(predictor)
+        x, y = predictor.predict(horizon=0.0)
+        self.assertAlmostEqual(x, expected(last)[0], delta=1e-4)
+        self.assertAlmostEqual(y, expected(last)[1], delta=1e-4)
+
+    def test_restarts_after_gap(self):
+        predictor = KalmanCursorPredictor(max_gap=0.5)
+        last = track(predictor)
+        predictor.update(0.9, 0.1, last + 1.0)
+        self.assertEqual(predictor.predict(horizon=0.1), (0.9, 0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""GestureDebouncer 环形缓冲区与进入/退出滞回，逐帧检查输出切换的位置"""
+
+import os
+import sys
+import unittest
+
+try:
+    # recognition/__init__ 会导入 HandDetector
+    import mediapipe  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("需要 mediapipe")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.gesture_debouncer import GestureDebouncer
+
+MOVE, CLICK, FIST = "鼠标移动", "鼠标点击", "握拳"
+
+
+def feed(debouncer, gestures):
+    return [debouncer.update(gesture) for gesture in gestures]
+
+
+class GestureDebouncerTest(unittest.TestCase):
+    def plain(self, window_size=4):
+        """所有手势共用进入 3/4、退出 2/4"""
+        return GestureDebouncer(window_size, enter_fractions={}, exit_fractions={},
+                                default_enter=0.75, default_exit=0.5)
+
+    def test_passthrough_until_window_full(self):
+        self.assertEqual(feed(self.plain(), [MOVE, CLICK, "无"]), [MOVE, CLICK, "无"])
+
+    def test_enter_and_exit_hysteresis(self):
+        debouncer = self.plain()
+        outputs = feed(debouncer, [MOVE] * 4 + ["A"] * 3 + [MOVE] * 3)
+        # 第 3 个 A 才达到 3/4 进入；回到 MOVE 时 2:2 平票保持 A，第 3 个 MOVE 才切回
+        self.assertEqual(outputs, [MOVE] * 6 + ["A", "A", "A", MOVE])
+
+    def test_release_to_none_without_successor(self):
+        debouncer = self.plain()
+        outputs = feed(debouncer, [MOVE] * 4 + ["A", "B", "C"])
+        # MOVE 票数降到 1/4 低于退出比例，而没有手势达到进入比例
+        self.assertEqual(outputs, [MOVE] * 4 + [MOVE, MOVE, "无"])
+
+    def test_ring_buffer_evicts_oldest(self):
+        debouncer = self.plain()
+        feed(debouncer, [MOVE, MOVE, "A", "A", "A", "B"])
+        self.assertEqual(debouncer.counts, {MOVE: 0, "A": 3, "B": 1})
+
+    def test_click_enters_on_configured_frame(self):
+        debouncer = GestureDebouncer(window_size=8)
+        delays = debouncer.get_delays()
+        self.assertEqual(delays[CLICK]['enter_frames'], 3)
+        self.assertEqual(delays[FIST]['enter_frames'], 2)
+        outputs = feed(debouncer, [MOVE] * 8 + [CLICK] * 3)
+        self.assertEqual(outputs[-3:], [MOVE, MOVE, CLICK])
+        debouncer.reset()
+        outputs = feed(debouncer, [MOVE] * 8 + [FIST] * 2)
+        self.assertEqual(outputs[-2:], [MOVE, FIST])
+
+    def test_click_releases_on_configured_frame(self):
+        debouncer = GestureDebouncer(window_size=8)
+        release_frames = debouncer.get_delays()[CLICK]['release_frames']
+        feed(debouncer, [CLICK] * 8)
+        # 用互不相同的手势填充，避免其他手势抢先进入
+        outputs = feed(debouncer, [f"X{index}" for index in range(release_frames)])
+        self.assertEqual(outputs, [CLICK] * (release_frames - 1) + ["无"])
+
+    def test_reset_clears_window(self):
+        debouncer = self.plain()
+        feed(debouncer, ["A"] * 4)
+        debouncer.reset()
+        self.assertEqual(debouncer.active, "无")
+        self.assertEqual(feed(debouncer, [MOVE]), [MOVE])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""JSON 规则集与离线重放在合成关键点上的行为，不需要摄像头"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+try:
+    # recognition/__init__ 会导入 HandDetector
+    import mediapipe  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("需要 mediapipe")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognition.gesture_features import FEATURE_INDEX, TIP_WRIST_SLICE, extract_features
+from recognition.gesture_recognizer import GestureRecognizer
+from recognition.gesture_rules import DEFAULT_RULES_PATH, load_gesture_rules
+from recognition.hand_frame import HandFrame
+
+# 手掌朝向镜头、五指伸直，图像坐标 y 向下
+OPEN_HAND = np.array([
+    (0.50, 0.80, 0.0),
+    (0.44, 0.76, 0.0), (0.40, 0.72, 0.0), (0.37, 0.68, 0.0), (0.34, 0.64, 0.0),
+    (0.45, 0.65, 0.0), (0.45, 0.58, 0.0), (0.45, 0.52, 0.0), (0.45, 0.46, 0.0),
+    (0.50, 0.64, 0.0), (0.50, 0.57, 0.0), (0.50, 0.50, 0.0), (0.50, 0.44, 0.0),
+    (0.55, 0.65, 0.0), (0.55, 0.59, 0.0), (0.55, 0.53, 0.0), (0.55, 0.47, 0.0),
+    (0.60, 0.67, 0.0), (0.60, 0.62, 0.0), (0.60, 0.57, 0.0), (0.60, 0.52, 0.0),
+], dtype=np.float32)
+
+
+def make_pose(**points):
+    """在张开手的基础上移动若干关键点，如 make_pose(p4=(0.43, 0.51))"""
+    landmarks = OPEN_HAND.copy()
+    for name, (x, y) in points.items():
+        landmarks[int(name[1:])] = (x, y, 0.0)
+    return landmarks
+
+
+POSES = {
+    "鼠标点击": make_pose(p8=(0.42, 0.50), p4=(0.43, 0.51)),
+    "鼠标右键": make_pose(p4=(0.51, 0.45)),
+    "握拳": make_pose(p4=(0.44, 0.70), p8=(0.46, 0.72), p12=(0.50, 0.71), p16=(0.54, 0.72), p20=(0.58, 0.73)),
+    "上滚轮": make_pose(p4=(0.44, 0.65)),
+    "下滚轮": make_pose(p4=(0.44, 0.58)),
+}
+
+
+def legacy_classify(features, thresholds):
+    """规则改为 JSON 之前 _classify_row 的静态判定，没有命中返回 None"""
+    tip = features[FEATURE_INDEX['thumb_index_tip']]
+    middle = features[FEATURE_INDEX['thumb_middle_tip']]
+    mcp = features[FEATURE_INDEX['thumb_index_mcp']]
+    pip = features[FEATURE_INDEX['thumb_index_pip']]
+    bent_fingers = sum(1 for distance in features[TIP_WRIST_SLICE] if distance < thresholds['fist'])
+    if bent_fingers >= 3:
+        return "握拳"
+    if tip < thresholds['click_contact']:
+        return "鼠标点击"
+    elif middle < thresholds['click_contact']:
+        return "鼠标右键"
+    elif pip < thresholds['wheel_down_threshold'] and bent_fingers < 2:
+        if mcp >= thresholds['wheel_up_threshold'] or pip <= mcp:
+            return "下滚轮"
+        return "上滚轮"
+    elif mcp < thresholds['wheel_up_threshold'] and bent_fingers < 2:
+        if pip >= thresholds['wheel_down_threshold'] or mcp <= pip:
+            return "上滚轮"
+        return "下滚轮"
+    return None
+
+
+def jittered_poses(count, scale, seed=0):
+    """在各标准姿势上加高斯抖动，覆盖阈值附近的帧"""
+    rng = np.random.default_rng(seed)
+    bases = np.stack([OPEN_HAND] + list(POSES.values()))
+    picks = rng.integers(0, len(bases), size=count)
+    noise = rng.normal(0.0, scale, size=(count, 21, 3)).astype(np.float32)
+    noise[..., 2] = 0.0
+    return bases[picks] + noise
+
+
+class GestureRuleSetTest(unittest.TestCase):
+    def setUp(self):
+        self.rule_set = load_gesture_rules(DEFAULT_RULES_PATH)
+        self.thresholds = GestureRecognizer().get_thresholds()
+
+    def test_canonical_poses(self):
+        for expected, landmarks in POSES.items():
+            with self.subTest(gesture=expected):
+                features = extract_features(landmarks).tolist()
+                self.assertEqual(self.rule_set.classify_row(features, self.thresholds), expected)
+        self.assertIsNone(self.rule_set.classify_row(extract_features(OPEN_HAND).tolist(), self.thresholds))
+
+    def test_matches_legacy_classifier(self):
+        features = extract_features(jittered_poses(2000, 0.02))
+        rows = features.tolist()
+        scalar = [self.rule_set.classify_row(row, self.thresholds) for row in rows]
+        legacy = [legacy_classify(row, self.thresholds) for row in rows]
+        self.assertEqual(scalar, legacy)
+        # 所有分支都应被抖动样本覆盖到
+        self.assertEqual(set(legacy), set(POSES) | {None})
+
+    def test_vector_matches_scalar(self):
+        features = extract_features(jittered_poses(2000, 0.02, seed=1))
+        codes = self.rule_set.evaluate(features, self.thresholds)
+        vector = [None if code == 0 else self.rule_set.labels[code] for code in codes.tolist()]
+        scalar = [self.rule_set.classify_row(row, self.thresholds) for row in features.tolist()]
+        self.assertEqual(vector, scalar)
+
+
+class RecognizeBatchTest(unittest.TestCase):
+    def make_session(self, seed=0):
+        """姿势片段 + 手在画面中平移 + 偶尔丢手（NaN 帧），30 fps"""
+        rng = np.random.default_rng(seed)
+        frames = []
+        for gesture in ["鼠标移动", "鼠标点击", "鼠标移动", "鼠标右键", "握拳", "上滚轮", "鼠标移动", "下滚轮"]:
+            base = OPEN_HAND if gesture == "鼠标移动" else POSES[gesture]
+            for step in range(int(rng.integers(6, 15))):
+                offset = np.array([0.02 * step, 0.0, 0.0], dtype=np.float32) if gesture == "鼠标移动" else 0.0
+                frames.append(base + offset + rng.normal(0.0, 0.003, size=(21, 3)).astype(np.float32))
+        landmarks = np.stack(frames)
+        landmarks[rng.choice(len(landmarks), size=5, replace=False)] = np.nan
+        timestamps = np.arange(len(landmarks)) / 30.0
+        return landmarks, timestamps
+
+    def replay_live(self, recognizer, landmarks, timestamps):
+        """与实时识别循环相同的逐帧调用"""
+        gestures, events = [], []
+        for index, (frame, timestamp) in enumerate(zip(landmarks, timestamps)):
+            if np.isnan(frame).any():
+                recognizer.hand_lost(float(timestamp))
+                gestures.append("无")
+            else:
+                hand = HandFrame(frame, timestamp=float(timestamp), seq=index + 1)
+                gestures.append(recognizer.recognize_gesture(hand))
+            events.extend(recognizer.pop_temporal_events())
+        return gestures, events
+
+    def check_batch_matches_live(self, edge_clicks, temporal_gestures):
+        landmarks, timestamps = self.make_session()
+        live = GestureRecognizer()
+        batch = GestureRecognizer()
+        for recognizer in (live, batch):
+            recognizer.edge_clicks = edge_clicks
+            recognizer.temporal_gestures = temporal_gestures
+        gestures, events = self.replay_live(live, landmarks, timestamps)
+        result = batch.recognize_batch(landmarks, timestamps)
+        self.assertEqual(result['gestures'], gestures)
+        self.assertEqual([event['gesture'] for event in result['events']], [event['gesture'] for event in events])
+        # 合成序列里每种姿势都应出现
+        self.assertTrue(set(POSES) <= set(result['raw']))
+
+    def test_batch_matches_live_debounced(self):
+        self.check_batch_matches_live(edge_clicks=False, temporal_gestures=False)
+
+    def test_batch_matches_live_edge_clicks(self):
+        self.check_batch_matches_live(edge_clicks=True, temporal_gestures=False)
+
+    def test_batch_matches_live_temporal(self):
+        self.check_batch_matches_live(edge_clicks=True, temporal_gestures=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
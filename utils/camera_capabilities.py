@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import cv2
+import os
+import platform
+import struct
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# V4L2 ioctl 请求码与结构体布局 (linux/videodev2.h)
+VIDIOC_ENUM_FMT = 0xC0405602
+VIDIOC_ENUM_FRAMESIZES = 0xC02C564A
+VIDIOC_ENUM_FRAMEINTERVALS = 0xC034564B
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_FRMSIZE_TYPE_DISCRETE = 1
+V4L2_FRMIVAL_TYPE_DISCRETE = 1
+_FMTDESC = struct.Struct('III32sII3I')
+_FRMSIZEENUM = struct.Struct('III6I2I')
+_FRMIVALENUM = struct.Struct('IIIII6I2I')
+
+
+class CameraCapabilityProbe:
+    TEST_RESOLUTIONS = [
+        (640, 480), (800, 600), (1024, 768),
+        (1280, 720), (1280, 1024), (1920, 1080),
+        (2560, 1440), (3840, 2160)
+    ]
+
+    def __init__(self, capture_factory: Optional[Callable[[int], Any]] = None,
+                 use_v4l2: bool = True, is_device_active: Optional[Callable[[int], bool]] = None):
+        # capture_factory 可替换为假的采集后端，便于脱离真实设备测试
+        self.capture_factory = capture_factory or cv2.VideoCapture
+        # 正在采集的设备不探测（切换分辨率会打断采集），只返回缓存
+        self.is_device_active = is_device_active
+        self.use_v4l2 = use_v4l2 and platform.system().lower() == "linux" and fcntl is not None
+        self.capability_cache: Dict[int, dict] = {}
+        self.device_opens = 0
+        self._lock = threading.Lock()
+
+    def probe(self, camera_index: int, refresh: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            cached = self.capability_cache.get(camera_index)
+        if cached is not None and not refresh:
+            return cached
+        if self.is_device_active is not None and self.is_device_active(camera_index):
+            return cached if cached is not None else {'error': f"摄像头 {camera_index} 正在使用，跳过探测"}
+        capabilities = self._probe_device(camera_index)
+        if capabilities and 'error' not in capabilities:
+            with self._lock:
+                self.capability_cache[camera_index] = capabilities
+        return capabilities
+
+    def probe_async(self, camera_index: int, callback: Callable[[Dict[str, Any]], None],
+                    refresh: bool = False) -> threading.Thread:
+        """在后台线程中探测，完成后以结果调用 callback（GUI 中需自行切回主线程）"""
+        def run():
+            callback(self.probe(camera_index, refresh))
+        probe_thread = threading.Thread(target=run, daemon=True)
+        probe_thread.start()
+        return probe_thread
+
+    def invalidate(self, camera_index: Optional[int] = None):
+        with self._lock:
+            if camera_index is None:
+                self.capability_cache.clear()
+            else:
+                self.capability_cache.pop(camera_index, None)
+
+    def _probe_device(self, camera_index: int) -> Dict[str, Any]:
+        """每次探测只打开设备一次：Linux 下 V4L2 能枚举出模式时只用 ioctl，否则在一个采集句柄上逐个尝试分辨率"""
+        if self.use_v4l2:
+            modes = self._enumerate_v4l2_modes(camera_index)
+            if modes:
+                mode_fps = [fps for mode in modes for fps in mode['fps']]
+                return {
+                    'index': camera_index,
+                    'supported_resolutions': sorted({(mode['width'], mode['height']) for mode in modes}),
+                    'max_fps': int(max(mode_fps)) if mode_fps else 0,
+                    'modes': modes,
+                    'source': 'v4l2'
+                }
+        cap = None
+        try:
+            cap = self.capture_factory(camera_index)
+            self.device_opens += 1
+            if not cap.isOpened():
+                return {}
+            return {
+                'index': camera_index,
+                'supported_resolutions': self._probe_resolutions_on_handle(cap),
+                'max_fps': int(cap.get(cv2.CAP_PROP_FPS)),
+                'brightness': cap.get(cv2.CAP_PROP_BRIGHTNESS),
+                'contrast': cap.get(cv2.CAP_PROP_CONTRAST),
+                'saturation': cap.get(cv2.CAP_PROP_SATURATION),
+                'modes': [],
+                'source': 'probe'
+            }
+        except Exception as e:
+            return {'error': str(e)}
+        finally:
+            if cap is not None:
+                try:
+                    cap.release()
+                except Exception:
+                    pass
+
+    def _probe_resolutions_on_handle(self, cap: Any) -> List[Tuple[int, int]]:
+        """在同一个句柄上依次尝试各分辨率，结束后恢复原始分辨率"""
+        original_width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        original_height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        supported = []
+        for width, height in self.TEST_RESOLUTIONS:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if actual_width == width and actual_height == height:
+                supported.append((width, height))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, original_width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, original_height)
+        return supported
+
+    def _enumerate_v4l2_modes(self, camera_index: int) -> List[dict]:
+        device = f"/dev/video{camera_index}"
+        if not os.path.exists(device):
+            return []
+        modes = []
+        fd = None
+        try:
+            fd = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+            self.device_opens += 1
+            for pixel_format, format_name in self._v4l2_formats(fd):
+                for width, height in self._v4l2_frame_sizes(fd, pixel_format):
+                    modes.append({
+                        'format': format_name,
+                        'width': width,
+                        'height': height,
+                        'fps': self._v4l2_frame_rates(fd, pixel_format, width, height)
+                    })
+        except OSError:
+            return []
+        finally:
+            if fd is not None:
+                os.close(fd)
+        return modes
+
+    def _v4l2_formats(self, fd: int) -> List[Tuple[int, str]]:
+        formats = []
+        index = 0
+        while True:
+            buf = bytearray(_FMTDESC.pack(index, V4L2_BUF_TYPE_VIDEO_CAPTURE, 0, b'', 0, 0, 0, 0, 0))
+            try:
+                fcntl.ioctl(fd, VIDIOC_ENUM_FMT, buf, True)
+            except OSError:
+                break
+            fields = _FMTDESC.unpack(buf)
+            pixel_format = fields[4]
+            formats.append((pixel_format, struct.pack('<I', pixel_format).decode('ascii', 'replace')))
+            index += 1
+        return formats
+
+    def _v4l2_frame_sizes(self, fd: int, pixel_format: int) -> List[Tuple[int, int]]:
+        sizes = []
+        index = 0
+        while True:
+            buf = bytearray(_FRMSIZEENUM.pack(index, pixel_format, 0, *([0] * 8)))
+            try:
+                fcntl.ioctl(fd, VIDIOC_ENUM_FRAMESIZES, buf, True)
+            except OSError:
+                break
+            fields = _FRMSIZEENUM.unpack(buf)
+            if fields[2] == V4L2_FRMSIZE_TYPE_DISCRETE:
+                sizes.append((fields[3], fields[4]))
+                index += 1
+                continue
+            # 连续/步进模式只有一条记录，取落在范围内的常用分辨率
+            min_w, max_w, step_w, min_h, max_h, step_h = fields[3:9]
+            for width, height in self.TEST_RESOLUTIONS:
+                if (min_w <= width <= max_w and min_h <= height <= max_h
+                        and (width - min_w) % max(1, step_w) == 0
+                        and (height - min_h) % max(1, step_h) == 0):
+                    sizes.append((width, height))
+            break
+        return sizes
+
+    def _v4l2_frame_rates(self, fd: int, pixel_format: int, width: int, height: int) -> List[float]:
+        rates = []
+        index = 0
+        while True:
+            buf = bytearray(_FRMIVALENUM.pack(index, pixel_format, width, height, 0, *([0] * 8)))
+            try:
+                fcntl.ioctl(fd, VIDIOC_ENUM_FRAMEINTERVALS, buf, True)
+            except OSError:
+                break
+            fields = _FRMIVALENUM.unpack(buf)
+            numerator, denominator = fields[5], fields[6]
+            if numerator:
+                rates.append(round(denominator / numerator, 2))
+            if fields[4] != V4L2_FRMIVAL_TYPE_DISCRETE:
+                # 连续/步进模式记录的是最小间隔，即最高帧率
+                break
+            index += 1
+        return rates
@@ -2,10 +2,22 @@
 # -*- coding: utf-8 -*-
 import cv2
 import numpy as np
+import threading
+import time
 from typing import Optional, Tuple
+from .frame_pool import FramePool
 
 
 class CameraManager:    
+    # 正在采集的摄像头编号，能力探测据此跳过使用中的设备
+    _active_devices = set()
+    _active_lock = threading.Lock()
+    
+    @classmethod
+    def is_device_active(cls, camera_index: int) -> bool:
+        with cls._active_lock:
+            return camera_index in cls._active_devices
+    
     def __init__(self):
         self.cap: Optional[cv2.VideoCapture] = None
         self.is_initialized = False
@@ -13,14 +25,44 @@ class CameraManager:
         self.width = 1920
         self.height = 1080
         self.fps = 30
+        # threaded capture: latest-frame mailbox
+        self.threaded = False
+        self.capture_thread: Optional[threading.Thread] = None
+        self._capture_running = False
+        self._frame_condition = threading.Condition()
+        self._latest_seq = 0
+        self._consumed_seq = 0
+        # 三缓冲: 采集线程写 back，ready 为最新完成帧，front 归消费者所有
+        self.frame_pool = FramePool("capture")
+        self._slot_keys = ("slot_0", "slot_1", "slot_2")
+        self._reset_slots()
+        self._reset_capture_stats()
+    
+    def _reset_slots(self):
+        self._back, self._ready, self._front = 0, 1, 2
+        self._slot_seq = [0, 0, 0]
+        self._slot_timestamp = [0.0, 0.0, 0.0]
+        self._latest_seq = 0
+        self._consumed_seq = 0
+        self._last_pos_msec = -1.0
+        self._last_timestamp = 0.0
+    
+    def _reset_capture_stats(self):
+        self.captured_frames = 0
+        self.delivered_frames = 0
+        self.dropped_frames = 0
+        self.read_failures = 0
+        self.repeated_frames = 0
+        self._stats_start_time = time.perf_counter()
     
     def initialize(self, camera_index: int = 0, width: int = 1920, 
-                   height: int = 1080, fps: int = 30) -> bool:
+                   height: int = 1080, fps: int = 30, threaded: bool = False) -> bool:
         try:
             self.camera_index = camera_index
             self.width = width
             self.height = height
             self.fps = fps
+            self.threaded = threaded
             self.cap = cv2.VideoCapture(camera_index)
             
             if not self.cap.isOpened():
@@ -31,30 +73,111 @@ class CameraManager:
             self.cap.set(cv2.CAP_PROP_FPS, fps)
             
             self.is_initialized = True
-            print(f"摄像头 {camera_index} 初始化成功 ({width}x{height} @ {fps}fps)")
+            with CameraManager._active_lock:
+                CameraManager._active_devices.add(camera_index)
+            if threaded:
+                # 驱动内部缓冲越小，邮箱里的帧越新
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                self._start_capture_thread()
+            mode = "线程采集" if threaded else "同步采集"
+            print(f"摄像头 {camera_index} 初始化成功 ({width}x{height} @ {fps}fps, {mode})")
             return True
             
         except Exception as e:
             print(f"摄像头初始化失败: {e}")
             return False
     
+    def _start_capture_thread(self):
+        with self._frame_condition:
+            self._reset_slots()
+        self._reset_capture_stats()
+        self._capture_running = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+    
+    def _stop_capture_thread(self):
+        self._capture_running = False
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+        if self.capture_thread and self.capture_thread is not threading.current_thread():
+            self.capture_thread.join(timeout=1.0)
+        self.capture_thread = None
+    
+    def _read_into(self, key: str) -> Tuple[bool, Optional[np.ndarray]]:
+        """读取到池中的预分配缓冲区，尺寸不符时 OpenCV 会重新分配，由池接管"""
+        buffer = self.frame_pool.peek(key)
+        if buffer is not None:
+            ret, frame = self.cap.read(buffer)
+        else:
+            ret, frame = self.cap.read()
+        if ret:
+            self.frame_pool.adopt(key, frame)
+            self.frame_pool.end_frame()
+        return ret, frame
+    
+    def _is_repeated_frame(self) -> bool:
+        """驱动提供 CAP_PROP_POS_MSEC 时，时间戳未变化说明 read 返回的是同一帧"""
+        try:
+            pos_msec = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        except Exception:
+            return False
+        if pos_msec <= 0:
+            return False
+        if pos_msec == self._last_pos_msec:
+            self.repeated_frames += 1
+            return True
+        self._last_pos_msec = pos_msec
+        return False
+    
+    def _capture_loop(self):
+        while self._capture_running:
+            if self.cap is None:
+                break
+            try:
+                # back 槽只有采集线程会写入
+                ret, frame = self._read_into(self._slot_keys[self._back])
+            except Exception as e:
+                print(f"采集线程读取帧出错: {e}")
+                ret, frame = False, None
+            if not ret:
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+            if self._is_repeated_frame():
+                continue
+            timestamp = time.perf_counter()
+            with self._frame_condition:
+                # 上一帧还没被取走就被覆盖，记为过期丢弃
+                if self._latest_seq > self._consumed_seq:
+                    self.dropped_frames += 1
+                self._latest_seq += 1
+                self._slot_seq[self._back] = self._latest_seq
+                self._slot_timestamp[self._back] = timestamp
+                self._back, self._ready = self._ready, self._back
+                self.captured_frames += 1
+                self._frame_condition.notify_all()
+    
     def reinitialize_with_config(self, config_manager) -> bool:
         settings = config_manager.get_settings()
         camera_index = settings.camera_index.get() if hasattr(settings.camera_index, 'get') else settings.camera_index
         width = settings.camera_width.get() if hasattr(settings.camera_width, 'get') else settings.camera_width
         height = settings.camera_height.get() if hasattr(settings.camera_height, 'get') else settings.camera_height
         fps = settings.camera_fps.get() if hasattr(settings.camera_fps, 'get') else settings.camera_fps
+        threaded = settings.threaded_capture.get() if hasattr(settings.threaded_capture, 'get') else settings.threaded_capture
 
         self.release()
         
-        return self.initialize(camera_index, width, height, fps)
+        return self.initialize(camera_index, width, height, fps, threaded)
     
     def get_frame(self) -> Optional[np.ndarray]:
         if not self.is_initialized or not self.cap:
             return None
+        if self.threaded:
+            frame, _, _ = self.get_frame_packet()
+            return frame
         
         try:
-            ret, frame = self.cap.read()
+            ret, frame = self._read_into(self._slot_keys[0])
             if ret:
                 return frame
             else:
@@ -63,6 +186,55 @@ class CameraManager:
             print(f"获取帧时出错: {e}")
             return None
     
+    def get_frame_packet(self, timeout: float = 0.0,
+                         newer_than: int = 0) -> Tuple[Optional[np.ndarray], int, float]:
+        """返回 (帧, 序号, 采集时间戳)，线程模式下立即返回邮箱中最新的一帧
+
+        newer_than 大于 0 时最多等待 timeout 秒，直到出现序号更大的帧。
+        返回的帧是复用的缓冲区，在下一次取帧前有效。
+        """
+        if not self.is_initialized or not self.cap:
+            return None, 0, 0.0
+        if not self.threaded:
+            frame = self.get_frame()
+            if frame is None:
+                return None, 0, 0.0
+            if self._is_repeated_frame():
+                return frame, self._latest_seq, self._last_timestamp
+            self._latest_seq += 1
+            self._last_timestamp = time.perf_counter()
+            self.captured_frames += 1
+            self.delivered_frames += 1
+            return frame, self._latest_seq, self._last_timestamp
+        
+        with self._frame_condition:
+            if self._latest_seq <= newer_than and timeout > 0:
+                self._frame_condition.wait_for(
+                    lambda: self._latest_seq > newer_than or not self._capture_running, timeout
+                )
+            if self._latest_seq == 0:
+                return None, 0, 0.0
+            if self._latest_seq > self._consumed_seq:
+                self._front, self._ready = self._ready, self._front
+                self._consumed_seq = self._latest_seq
+                self.delivered_frames += 1
+            frame = self.frame_pool.peek(self._slot_keys[self._front])
+            return frame, self._slot_seq[self._front], self._slot_timestamp[self._front]
+    
+    def get_capture_stats(self) -> dict:
+        elapsed = max(1e-6, time.perf_counter() - self._stats_start_time)
+        return {
+            'threaded': self.threaded,
+            'captured_frames': self.captured_frames,
+            'delivered_frames': self.delivered_frames,
+            'dropped_frames': self.dropped_frames,
+            'read_failures': self.read_failures,
+            'repeated_frames': self.repeated_frames,
+            'capture_fps': self.captured_frames / elapsed,
+            'drop_rate': self.dropped_frames / self.captured_frames if self.captured_frames else 0.0,
+            'frame_pool': self.frame_pool.get_stats()
+        }
+    
     def get_frame_with_status(self) -> Tuple[bool, Optional[np.ndarray]]:
         frame = self.get_frame()
         return frame is not None, frame
@@ -111,9 +283,16 @@ class CameraManager:
     
     def release(self):
         try:
+            self._stop_capture_thread()
             if self.cap:
+                if self.threaded and self.captured_frames:
+                    stats = self.get_capture_stats()
+                    print(f"采集统计: 共采集 {stats['captured_frames']} 帧, "
+                          f"丢弃过期帧 {stats['dropped_frames']} ({stats['drop_rate']:.1%})")
                 self.cap.release()
                 self.cap = None
+                with CameraManager._active_lock:
+                    CameraManager._active_devices.discard(self.camera_index)
             self.is_initialized = False
             print("摄像头资源已释放")
         except Exception as e:
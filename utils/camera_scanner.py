@@ -1,8 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import cv2
-from typing import List, Tuple, Dict
+import json
+import os
+import queue
+import threading
+import time
+from typing import List, Tuple, Dict, Optional
 import platform
+from .camera_capabilities import CameraCapabilityProbe
+from .camera_manager import CameraManager
 
 class CameraScanner:    
     COMMON_RESOLUTIONS = {
@@ -15,33 +22,178 @@ class CameraScanner:
         "SXGA": (1280, 1024),
         "UXGA": (1600, 1200)
     }
-    def __init__(self):
+    def __init__(self, cache_file: str = "camera_cache.json",
+                 max_workers: int = 4, probe_timeout: float = 3.0):
         self.available_cameras: List[Tuple[int, str]] = []
         self.system = platform.system().lower()
-    
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self.probe_timeout = probe_timeout
+        self.timed_out_ports: List[int] = []
+        self._cache_lock = threading.Lock()
+        self.camera_cache: Dict[int, dict] = self.load_cache()
+        self.capability_probe = CameraCapabilityProbe(
+            capture_factory=self._open_capture,
+            is_device_active=CameraManager.is_device_active
+        )
+
+    def _open_capture(self, port: int) -> cv2.VideoCapture:
+        if self.system == "windows":
+            return cv2.VideoCapture(port, cv2.CAP_DSHOW)
+        return cv2.VideoCapture(port)
+
+    def _device_path(self, port: int) -> str:
+        if self.system == "windows":
+            return f"dshow:{port}"
+        elif self.system == "darwin":
+            return f"avfoundation:{port}"
+        return f"/dev/video{port}"
+
+    def _describe_camera(self, port: int, width: int, height: int, fps: int) -> str:
+        if self.system == "darwin":
+            name = "内置摄像头" if port == 0 else f"外部摄像头 {port}"
+        elif self.system == "windows":
+            name = f"摄像头 {port}"
+        else:
+            name = f"摄像头 {port} {self._device_path(port)}"
+        return f"{name} ({width}x{height} @ {fps}fps)"
+
+    def probe_port(self, port: int) -> Optional[dict]:
+        cap = None
+        try:
+            cap = self._open_capture(port)
+            if not cap.isOpened():
+                return None
+            ret, frame = cap.read()
+            if not ret:
+                return None
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = int(cap.get(cv2.CAP_PROP_FPS))
+            return {
+                'port': port,
+                'device': self._device_path(port),
+                'width': width,
+                'height': height,
+                'fps': fps,
+                'description': self._describe_camera(port, width, height, fps),
+                'last_seen': time.time()
+            }
+        except Exception:
+            return None
+        finally:
+            if cap is not None:
+                try:
+                    cap.release()
+                except Exception:
+                    pass
+
+    def _probe_ports(self, ports: List[int]) -> Dict[int, Optional[dict]]:
+        """并发探测端口，每个端口从开始探测起最多等待 probe_timeout 秒"""
+        pending = queue.Queue()
+        for port in ports:
+            pending.put(port)
+        results: Dict[int, Optional[dict]] = {}
+        started: Dict[int, float] = {}
+        lock = threading.Lock()
+        self.timed_out_ports = []
+
+        def worker():
+            while True:
+                try:
+                    port = pending.get_nowait()
+                except queue.Empty:
+                    return
+                with lock:
+                    started[port] = time.perf_counter()
+                entry = self.probe_port(port)
+                with lock:
+                    # 已超时的端口结果作废
+                    if port not in results:
+                        results[port] = entry
+
+        def spawn_worker():
+            threading.Thread(target=worker, daemon=True).start()
+
+        for _ in range(min(self.max_workers, len(ports))):
+            spawn_worker()
+
+        while True:
+            stalled = 0
+            with lock:
+                now = time.perf_counter()
+                for port, start_time in started.items():
+                    if port not in results and now - start_time > self.probe_timeout:
+                        results[port] = None
+                        self.timed_out_ports.append(port)
+                        stalled += 1
+                finished = len(results) == len(ports)
+            if finished:
+                break
+            # 卡死的工作线程被放弃，补充新线程保持并发度
+            for _ in range(stalled):
+                spawn_worker()
+            time.sleep(0.01)
+
+        if self.timed_out_ports:
+            print(f"摄像头端口探测超时: {self.timed_out_ports}")
+        return results
+
     def scan_cameras(self, max_ports: int = 10) -> List[Tuple[int, str]]:
-        self.available_cameras = []
-        
-        for port in range(max_ports):
-            try:
-                cap = cv2.VideoCapture(port)
-                if cap.isOpened():
-                    ret, frame = cap.read()
-                    if ret:
-                        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                        fps = int(cap.get(cv2.CAP_PROP_FPS))
-                        
-                        description = f"摄像头 {port} ({width}x{height} @ {fps}fps)"
-                        self.available_cameras.append((port, description))
-                
-                cap.release()
-                
-            except Exception as e:
-                continue
-        
+        results = self._probe_ports(list(range(max_ports)))
+        with self._cache_lock:
+            self.camera_cache = {port: entry for port, entry in results.items() if entry}
+        self.save_cache()
+        self.available_cameras = self.get_cached_cameras()
         return self.available_cameras
-    
+
+    def get_cached_cameras(self) -> List[Tuple[int, str]]:
+        with self._cache_lock:
+            return [(port, self.camera_cache[port]['description'])
+                    for port in sorted(self.camera_cache)]
+
+    def revalidate_cached(self) -> List[Tuple[int, str]]:
+        """只重新探测缓存中的端口，适合在后台线程中调用"""
+        with self._cache_lock:
+            ports = sorted(self.camera_cache)
+        if not ports:
+            return []
+        results = self._probe_ports(ports)
+        with self._cache_lock:
+            for port, entry in results.items():
+                if entry:
+                    self.camera_cache[port] = entry
+                else:
+                    self.camera_cache.pop(port, None)
+        self.save_cache()
+        self.available_cameras = self.get_cached_cameras()
+        return self.available_cameras
+
+    def load_cache(self) -> Dict[int, dict]:
+        try:
+            if not os.path.exists(self.cache_file):
+                return {}
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {int(port): entry for port, entry in data.get('cameras', {}).items()}
+        except Exception as e:
+            print(f"加载摄像头缓存失败: {e}")
+            return {}
+
+    def save_cache(self) -> bool:
+        try:
+            with self._cache_lock:
+                data = {
+                    'system': self.system,
+                    'cameras': {str(port): entry for port, entry in self.camera_cache.items()}
+                }
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"保存摄像头缓存失败: {e}")
+            return False
+
     def get_common_resolutions(self) -> Dict[str, Tuple[int, int]]:
         return self.COMMON_RESOLUTIONS.copy()
     def get_resolution_presets(self) -> List[str]:
@@ -63,31 +215,5 @@ class CameraScanner:
         except Exception:
             return False
     
-    def get_camera_capabilities(self, camera_index: int) -> Dict[str, any]:
-        try:
-            cap = cv2.VideoCapture(camera_index)
-            if not cap.isOpened():
-                return {}
-            
-            capabilities = {
-                'index': camera_index,
-                'supported_resolutions': [],
-                'max_fps': int(cap.get(cv2.CAP_PROP_FPS)),
-                'brightness': cap.get(cv2.CAP_PROP_BRIGHTNESS),
-                'contrast': cap.get(cv2.CAP_PROP_CONTRAST),
-                'saturation': cap.get(cv2.CAP_PROP_SATURATION)
-            }
-            test_resolutions = [
-                (640, 480), (800, 600), (1024, 768), 
-                (1280, 720), (1280, 1024), (1920, 1080),
-                (2560, 1440), (3840, 2160)
-            ]
-            for width, height in test_resolutions:
-                if self.test_camera_resolution(camera_index, width, height):
-                    capabilities['supported_resolutions'].append((width, height))
-            
-            cap.release()
-            return capabilities
-            
-        except Exception as e:
-            return {'error': str(e)}
\ No newline at end of file
+    def get_camera_capabilities(self, camera_index: int, refresh: bool = False) -> Dict[str, any]:
+        return self.capability_probe.probe(camera_index, refresh)
\ No newline at end of file
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import numpy as np
+from typing import Dict, Tuple
+
+
+class FramePool:
+    """按名称复用预分配的帧缓冲区，并统计每帧新分配的次数
+
+    每个池只应由一个线程使用；稳定运行时 last_frame_allocations 应为 0。
+    """
+
+    def __init__(self, name: str = "frames"):
+        self.name = name
+        self._buffers: Dict[str, np.ndarray] = {}
+        self.total_allocations = 0
+        self.frames = 0
+        self.last_frame_allocations = 0
+        self.max_frame_allocations = 0
+        self._frame_allocations = 0
+
+    def get(self, key: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buffer
+            self._count_allocation()
+        return buffer
+
+    def peek(self, key: str):
+        return self._buffers.get(key)
+
+    def adopt(self, key: str, array: np.ndarray) -> np.ndarray:
+        """接管 OpenCV 未能写入 dst 而新分配的数组，下一帧起复用它"""
+        if self._buffers.get(key) is not array:
+            self._buffers[key] = array
+            self._count_allocation()
+        return array
+
+    def _count_allocation(self):
+        self.total_allocations += 1
+        self._frame_allocations += 1
+
+    def end_frame(self):
+        self.frames += 1
+        self.last_frame_allocations = self._frame_allocations
+        if self.frames > 1:
+            # 首帧的预热分配不计入峰值
+            self.max_frame_allocations = max(self.max_frame_allocations, self._frame_allocations)
+        self._frame_allocations = 0
+
+    def get_stats(self) -> dict:
+        return {
+            'pool': self.name,
+            'buffers': len(self._buffers),
+            'buffer_bytes': sum(buffer.nbytes for buffer in self._buffers.values()),
+            'frames': self.frames,
+            'total_allocations': self.total_allocations,
+            'last_frame_allocations': self.last_frame_allocations,
+            'max_steady_frame_allocations': self.max_frame_allocations
+        }